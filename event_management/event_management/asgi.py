@@ -3,6 +3,12 @@ ASGI config for event_management project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Served by the Procfile's ``asgi`` process (gunicorn with uvicorn workers,
+configured by gunicorn.conf.py) alongside the WSGI ``web`` process. The
+read-heavy pages (dashboard, event_list, event_summary, registration_list)
+are async views and the middleware stack is async-capable, so under ASGI
+they run without a thread per request; the other views run in a thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
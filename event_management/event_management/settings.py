@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,7 +47,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # WhiteNoise for static files
+    'stud.static.WhiteNoiseMiddleware',  # WhiteNoise for static files (async-capable)
+    'stud.timing.ServerTimingMiddleware',  # Server-Timing header + per-view timing log
+    'stud.routers.ReplicaRoutingMiddleware',  # GET reads -> replicas, sticky primary after writes
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware', 
     'django.middleware.common.CommonMiddleware',
@@ -60,7 +63,7 @@ ROOT_URLCONF = 'event_management.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'stud.timing.TimedDjangoTemplates',  # DjangoTemplates + render timing
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -104,6 +107,59 @@ else:
         },
     }
 
+# Read replicas: comma-separated URLs, exposed as aliases replica1, replica2, ...
+# Reads are routed by stud.routers.PrimaryReplicaRouter; tests mirror 'default'.
+REPLICA_DATABASE_URLS = config('REPLICA_DATABASE_URLS', default='', cast=lambda v: [u.strip() for u in v.split(',') if u.strip()])
+REPLICA_DATABASES = []
+if REPLICA_DATABASE_URLS:
+    import dj_database_url
+    for number, url in enumerate(REPLICA_DATABASE_URLS, start=1):
+        alias = f'replica{number}'
+        DATABASES[alias] = dj_database_url.parse(url, conn_max_age=600, conn_health_checks=True)
+        DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+        REPLICA_DATABASES.append(alias)
+DATABASE_ROUTERS = ['stud.routers.PrimaryReplicaRouter']
+# How long a client that wrote reads from the primary; keep above replication lag.
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+
+# Connection pooling (stud/pooling.py): PostgreSQL and MySQL databases use the
+# pooled backends in stud/backends. Pools are per process, i.e. per gunicorn
+# worker; a request holds one connection, so a worker needs one per thread
+# (GUNICORN_THREADS). The default keeps a few more for the threaded runserver
+# and in-process loadtest. DB_MAX_CONNECTIONS, when set, caps the pool so
+# WEB_CONCURRENCY workers stay within the server's connection limit.
+# Besides the requests' own connections, gather_queries (stud/concurrency.py)
+# runs the dashboard's reads on a separate executor of DB_QUERY_THREADS
+# threads, one connection each, so the default pool makes room for those too.
+# Under ASGI there is no thread limit: every in-flight request that touches
+# the database holds a connection on its own thread, so a busy worker's
+# requests beyond the pool size wait up to DB_POOL_TIMEOUT for one.
+DB_POOL = config('DB_POOL', default=True, cast=bool)
+GUNICORN_THREADS = config('GUNICORN_THREADS', default=1, cast=int)
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+DB_QUERY_THREADS = config('DB_QUERY_THREADS', default=4, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=max(GUNICORN_THREADS, 4) + DB_QUERY_THREADS, cast=int)
+DB_MAX_CONNECTIONS = config('DB_MAX_CONNECTIONS', default=0, cast=int)
+if DB_MAX_CONNECTIONS:
+    DB_POOL_MAX_SIZE = max(1, min(DB_POOL_MAX_SIZE, DB_MAX_CONNECTIONS // WEB_CONCURRENCY))
+DB_POOL_OPTIONS = {
+    'min_size': min(config('DB_POOL_MIN_SIZE', default=1, cast=int), DB_POOL_MAX_SIZE),
+    'max_size': DB_POOL_MAX_SIZE,
+    'timeout': config('DB_POOL_TIMEOUT', default=10.0, cast=float),  # seconds to wait for a checkout
+    'max_idle': 600.0,
+    'max_lifetime': 1800.0,
+}
+if DB_POOL:
+    for database in DATABASES.values():
+        vendor = database['ENGINE'].rsplit('.', 1)[-1]
+        if vendor in ('postgresql', 'mysql'):
+            database['ENGINE'] = f'stud.backends.{vendor}'
+            database.setdefault('OPTIONS', {})['pool'] = dict(DB_POOL_OPTIONS)
+            # Connections go back to the pool when a request ends instead of
+            # staying open per thread; the pool health-checks them on checkout.
+            database['CONN_MAX_AGE'] = 0
+            database['CONN_HEALTH_CHECKS'] = True
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -147,6 +203,12 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Django REST Framework
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'stud.pagination.APICursorPagination',
+    'PAGE_SIZE': 50,
+}
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -161,3 +223,53 @@ CSRF_TRUSTED_ORIGINS = [
 
 # WhiteNoise caching headers
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+# Caches. 'pages' holds rendered list pages keyed by model generations
+# (stud/pagecache.py): LocMem evicts least recently used entries past
+# MAX_ENTRIES. The file backend (shared by all workers) is size-bounded but
+# not LRU: past MAX_ENTRIES it deletes an arbitrary third of its files, hot
+# pages included.
+# Generations live in a file cache so every worker process sees a bump.
+PAGE_CACHE_DIR = Path(config('PAGE_CACHE_DIR', default=os.path.join(tempfile.gettempdir(), 'event_management_cache')))
+PAGE_CACHE_BACKEND = config('PAGE_CACHE_BACKEND', default='locmem')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pages': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache' if PAGE_CACHE_BACKEND == 'file'
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': str(PAGE_CACHE_DIR / 'pages') if PAGE_CACHE_BACKEND == 'file' else 'pages',
+        'TIMEOUT': 24 * 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': config('PAGE_CACHE_MAX_ENTRIES', default=500, cast=int), 'CULL_FREQUENCY': 3},
+    },
+    'page_generations': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(PAGE_CACHE_DIR / 'generations'),
+        'TIMEOUT': None,
+    },
+}
+
+# Prometheus /metrics; when set, scrapers must send "Authorization: Bearer <token>"
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Per-request timing log (stud.timing.ServerTimingMiddleware)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'timing': {'format': '%(asctime)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'timing_console': {'class': 'logging.StreamHandler', 'formatter': 'timing'},
+    },
+    'loggers': {
+        'stud.timing': {
+            'handlers': ['timing_console'],
+            'level': config('TIMING_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
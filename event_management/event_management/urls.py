@@ -3,5 +3,6 @@ from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/', include('stud.api_urls')),
     path('', include('stud.urls')),  # Changed from 'api/'
 ]
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration (loaded automatically from this directory by the
+Procfile's ``gunicorn event_management.wsgi:application``).
+
+Prometheus multiprocess mode: every worker writes its metric samples to
+PROMETHEUS_MULTIPROC_DIR and /metrics merges them. The directory is emptied
+when the master starts so counters from a previous run are not resurrected,
+and a dead worker's live gauges are discarded when it exits.
+
+Database connection pools (stud/pooling.py) are created lazily in each
+worker, after the fork, so no connection is ever shared between processes.
+Workers come from WEB_CONCURRENCY (read by gunicorn itself) and threads
+from GUNICORN_THREADS; settings.py sizes the per-worker pools from both.
+"""
+
+import os
+import shutil
+import tempfile
+
+multiproc_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'stud-prometheus')
+)
+
+# More than one thread switches to the gthread worker (WSGI process only;
+# uvicorn workers run sync code on their event loop's thread pool).
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+
+def on_starting(server):
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -3,6 +3,7 @@ from .models import (
     Role, Department, User, Venue, Category, 
     Event, Registration, Attendance, Resource, EventResource
 )
+from .search import search
 
 @admin.register(Role)
 class RoleAdmin(admin.ModelAdmin):
@@ -38,6 +39,12 @@ class EventAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description']
     date_hierarchy = 'start_datetime'
 
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text index instead of icontains on every search field
+        if not search_term.strip():
+            return queryset, False
+        return search(queryset, search_term), False
+
 @admin.register(Registration)
 class RegistrationAdmin(admin.ModelAdmin):
     list_display = ['reg_id', 'event', 'user', 'registered_at', 'status']
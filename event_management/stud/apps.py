@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class StudConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'stud'
+
+    def ready(self):
+        from . import signals, timing  # noqa: F401
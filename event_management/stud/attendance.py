@@ -0,0 +1,81 @@
+"""
+Attendance services.
+
+Attendance is written with a single batched upsert on the ``(event, user)``
+unique key (``INSERT ... ON CONFLICT/ON DUPLICATE KEY UPDATE``), so marking a
+whole roster costs one statement per chunk instead of one procedure call per
+student.
+"""
+
+from django.db import connection, transaction
+from django.db.models import Count, F, FilteredRelation, Q
+from django.utils import timezone
+
+from .models import Attendance, Registration
+from .pagecache import bump
+
+UPSERT_CHUNK_SIZE = 500
+
+
+def upsert_attendance(rows, chunk_size=UPSERT_CHUNK_SIZE):
+    """
+    Insert or update Attendance rows in bulk. ``rows`` is an iterable of
+    unsaved Attendance instances; existing (event, user) pairs get their
+    ``present`` and ``checked_at`` overwritten.
+    """
+    rows = list(rows)
+    kwargs = {'update_conflicts': True, 'update_fields': ['present', 'checked_at', 'updated_at']}
+    if connection.features.supports_update_conflicts_with_target:
+        kwargs['unique_fields'] = ['event', 'user']
+    with transaction.atomic():
+        for start in range(0, len(rows), chunk_size):
+            Attendance.objects.bulk_create(rows[start:start + chunk_size], **kwargs)
+        bump(Attendance)
+    return len(rows)
+
+
+def mark_attendance(event_id, changes, checked_at=None):
+    """
+    Apply ``{user_id: present}`` for ``event_id`` in one batched upsert.
+    Users who are not registered for the event are ignored. Returns the number
+    of rows written.
+    """
+    if not changes:
+        return 0
+    checked_at = checked_at or timezone.now()
+    registered = set(
+        Registration.objects.filter(event_id=event_id, user_id__in=list(changes))
+        .values_list('user_id', flat=True)
+    )
+    return upsert_attendance(
+        Attendance(event_id=event_id, user_id=user_id, present=present, checked_at=checked_at)
+        for user_id, present in changes.items()
+        if user_id in registered
+    )
+
+
+def attendance_counts(event_id):
+    """Present/absent totals for an event from one conditional aggregate."""
+    return Attendance.objects.filter(event_id=event_id).aggregate(
+        present_count=Count('attendance_id', filter=Q(present=True)),
+        absent_count=Count('attendance_id', filter=Q(present=False)),
+    )
+
+
+def roster_queryset(event_id):
+    """
+    Every registrant of ``event_id`` with their attendance state, as one
+    LEFT JOIN: ``present`` and ``checked_at`` are None when not yet marked.
+    """
+    return (
+        Registration.objects.filter(event_id=event_id)
+        .select_related('user')
+        .only('reg_id', 'event_id', 'user__user_id', 'user__name', 'user__roll_no')
+        .annotate(
+            event_attendance=FilteredRelation(
+                'user__attendance', condition=Q(user__attendance__event_id=event_id)
+            ),
+            present=F('event_attendance__present'),
+            checked_at=F('event_attendance__checked_at'),
+        )
+    )
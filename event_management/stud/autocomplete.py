@@ -0,0 +1,100 @@
+"""
+Typeahead lookups for the create forms.
+
+Forms no longer render every user and event into a <select>. A widget asks
+these endpoints for at most ``MAX_LIMIT`` matches as the user types:
+
+* users: case-insensitive prefix of roll_no, name or email;
+* events: case-insensitive prefix of the title, upcoming events first
+  (soonest first), then past and undated ones (most recent first).
+
+The prefix lookups are index-backed on PostgreSQL (pg_trgm GIN indexes on
+``UPPER(col::text)``, the expression Django's ``istartswith`` compiles to)
+and on MySQL (B-tree indexes, case-insensitive collation). SQLite scans.
+
+Each (kind, query, limit) result is cached for ``CACHE_SECONDS`` so a burst
+of keystrokes from many forms costs one query per distinct prefix. New users
+and events can take that long to show up.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Event, User
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+CACHE_SECONDS = 30
+MAX_QUERY_LENGTH = 100
+
+
+def _cached(kind, query, limit, compute):
+    # Hashed: raw input may contain characters memcached keys cannot.
+    digest = hashlib.md5(query.lower().encode()).hexdigest()
+    key = f'autocomplete:{kind}:{limit}:{digest}'
+    results = cache.get(key)
+    if results is None:
+        results = compute()
+        cache.set(key, results, CACHE_SECONDS)
+    return results
+
+
+def parse_limit(value):
+    """?limit= -> int in [1, MAX_LIMIT]; raises ValueError."""
+    if value in (None, ''):
+        return DEFAULT_LIMIT
+    return min(max(int(value), 1), MAX_LIMIT)
+
+
+def suggest_users(query, limit=DEFAULT_LIMIT):
+    """``[{id, label, roll_no, email}, ...]`` for users matching ``query``."""
+    query = query.strip()[:MAX_QUERY_LENGTH]
+    if not query:
+        return []
+
+    def compute():
+        users = (
+            User.objects.filter(
+                Q(roll_no__istartswith=query) | Q(name__istartswith=query) | Q(email__istartswith=query)
+            )
+            .order_by('name', 'user_id')
+            .values('user_id', 'name', 'roll_no', 'email')[:limit]
+        )
+        return [
+            {'id': u['user_id'], 'label': f"{u['name']} ({u['roll_no'] or 'No Roll'})",
+             'roll_no': u['roll_no'], 'email': u['email']}
+            for u in users
+        ]
+
+    return _cached('users', query, limit, compute)
+
+
+def suggest_events(query, limit=DEFAULT_LIMIT):
+    """
+    ``[{id, label, start_datetime, status, capacity}, ...]`` for events whose
+    title starts with ``query``; a blank query lists the next upcoming events.
+    """
+    query = query.strip()[:MAX_QUERY_LENGTH]
+
+    def compute():
+        events = Event.objects.only('event_id', 'title', 'start_datetime', 'status', 'capacity')
+        if query:
+            events = events.filter(title__istartswith=query)
+        now = timezone.now()
+        rows = list(events.filter(start_datetime__gte=now).order_by('start_datetime', 'event_id')[:limit])
+        if len(rows) < limit:
+            rows += events.exclude(start_datetime__gte=now).order_by(
+                F('start_datetime').desc(nulls_last=True), '-event_id'
+            )[:limit - len(rows)]
+        return [
+            {'id': e.event_id,
+             'label': f"{e.title} ({e.start_datetime:%b %d, %Y})" if e.start_datetime else e.title,
+             'start_datetime': e.start_datetime.isoformat() if e.start_datetime else None,
+             'status': e.status, 'capacity': e.capacity}
+            for e in rows
+        ]
+
+    return _cached('events', query, limit, compute)
@@ -0,0 +1,161 @@
+"""
+Time-aware resource availability.
+
+A Resource has ``total_quantity`` units. An EventResource holds
+``quantity_required`` units for its event's ``[start_datetime,
+end_datetime)`` window. The number of units in use at any moment is the sum
+over the allocations whose windows contain it, and a resource is
+over-allocated when that peak exceeds ``total_quantity``.
+
+Peaks are computed with a sweep line: each window contributes ``+q`` at its
+start and ``-q`` at its end, and the running sum over the sorted points is
+the usage timeline. Only allocations overlapping the window in question are
+fetched, one query for all resources; ``events_window_idx`` keeps that
+query a range scan on ``end_datetime`` however many past events exist.
+
+Events without both times cannot be placed on the timeline: they do not
+count against anyone else, and allocating to them only checks the total.
+Cancelled events release their resources.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Event, EventResource, Resource
+
+
+class AllocationError(Exception):
+    """Base class for allocation failures that should be shown to the user."""
+
+
+class OverAllocated(AllocationError):
+    pass
+
+
+def parse_window(start, end):
+    """ISO datetime strings -> aware (start, end); raises ValueError."""
+    bounds = []
+    for name, value in (('start', start), ('end', end)):
+        parsed = parse_datetime(value or '')
+        if parsed is None:
+            raise ValueError(f'{name} must be an ISO datetime, e.g. 2026-03-06T14:00')
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        bounds.append(parsed)
+    if not bounds[0] < bounds[1]:
+        raise ValueError('start must be before end')
+    return tuple(bounds)
+
+
+def usage_timeline(intervals):
+    """
+    ``[(start, end, quantity), ...]`` -> ``[(time, in_use), ...]``: the usage
+    level from each change point until the next. Windows are half-open, so
+    one ending exactly when another starts does not overlap it.
+    """
+    points = []
+    for start, end, quantity in intervals:
+        if start < end:
+            points.append((start, quantity))
+            points.append((end, -quantity))
+    # At equal times negative deltas sort first, so ends apply before starts.
+    points.sort()
+    timeline, in_use = [], 0
+    for time, delta in points:
+        in_use += delta
+        if timeline and timeline[-1][0] == time:
+            timeline[-1] = (time, in_use)
+        else:
+            timeline.append((time, in_use))
+    return timeline
+
+
+def peak_usage(intervals, start=None, end=None):
+    """Highest concurrent quantity, optionally only within ``[start, end)``."""
+    if start is not None and end is not None:
+        intervals = [(max(s, start), min(e, end), q) for s, e, q in intervals]
+    return max((in_use for _, in_use in usage_timeline(intervals)), default=0)
+
+
+def overlapping_allocations(start, end, resource_ids=None, exclude_event_ids=None):
+    """resource_id -> [(start, end, quantity)] for allocations overlapping [start, end)."""
+    rows = EventResource.objects.filter(
+        event__end_datetime__gt=start, event__start_datetime__lt=end,
+    ).exclude(event__status=Event.Status.CANCELLED)
+    if resource_ids is not None:
+        rows = rows.filter(resource_id__in=resource_ids)
+    if exclude_event_ids:
+        rows = rows.exclude(event_id__in=exclude_event_ids)
+    by_resource = defaultdict(list)
+    for resource_id, quantity, s, e in rows.values_list(
+        'resource_id', 'quantity_required', 'event__start_datetime', 'event__end_datetime'
+    ):
+        by_resource[resource_id].append((s, e, quantity))
+    return by_resource
+
+
+def availability(start, end, resource_ids=None):
+    """
+    Free units of each resource throughout ``[start, end)``: ``[{resource_id,
+    resource_name, total_quantity, peak_in_use, available}, ...]``.
+    """
+    if not start < end:
+        raise ValueError('start must be before end')
+    resources = Resource.objects.order_by('resource_name')
+    if resource_ids is not None:
+        resources = resources.filter(resource_id__in=resource_ids)
+    usage = overlapping_allocations(start, end, resource_ids)
+    result = []
+    for resource in resources:
+        peak = peak_usage(usage.get(resource.resource_id, []), start, end)
+        result.append({
+            'resource_id': resource.resource_id,
+            'resource_name': resource.resource_name,
+            'total_quantity': resource.total_quantity,
+            'peak_in_use': peak,
+            'available': max(resource.total_quantity - peak, 0),
+        })
+    return result
+
+
+def allocate(event_id, resource_id, quantity):
+    """
+    Create an EventResource if the resource has ``quantity`` units free for
+    the whole event window. The resource row is locked so concurrent
+    allocations of the same resource are checked one after another.
+
+    Raises AllocationError (or OverAllocated) with a user-facing message.
+    """
+    try:
+        event_id, resource_id = int(event_id), int(resource_id)
+    except (TypeError, ValueError):
+        raise AllocationError('Choose an event and a resource')
+    try:
+        quantity = int(quantity)
+    except (TypeError, ValueError):
+        raise AllocationError('Quantity must be a whole number')
+    if quantity < 1:
+        raise AllocationError('Quantity must be at least 1')
+
+    with transaction.atomic():
+        resource = Resource.objects.select_for_update().filter(resource_id=resource_id).first()
+        if resource is None:
+            raise AllocationError(f'Resource {resource_id} does not exist')
+        event = Event.objects.filter(event_id=event_id).only('start_datetime', 'end_datetime', 'status').first()
+        if event is None:
+            raise AllocationError(f'Event {event_id} does not exist')
+
+        in_use = 0
+        if event.start_datetime and event.end_datetime and event.status != Event.Status.CANCELLED:
+            usage = overlapping_allocations(event.start_datetime, event.end_datetime, [resource.resource_id])
+            in_use = peak_usage(usage.get(resource.resource_id, []), event.start_datetime, event.end_datetime)
+        free = resource.total_quantity - in_use
+        if quantity > free:
+            raise OverAllocated(
+                f'Only {max(free, 0)} of {resource.total_quantity} {resource.resource_name} free '
+                f'during this event ({in_use} allocated to overlapping events)'
+            )
+        return EventResource.objects.create(event=event, resource=resource, quantity_required=quantity)
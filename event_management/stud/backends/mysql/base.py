@@ -0,0 +1,71 @@
+"""
+MySQL backend with a per-process connection pool (stud.pooling.ConnectionPool),
+configured like Django's PostgreSQL pool through ``OPTIONS['pool']``:
+``True`` or a dict of ``min_size``, ``max_size``, ``timeout``, ``max_idle``
+and ``max_lifetime``.
+"""
+
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.mysql import base
+
+from stud.pooling import ConnectionPool
+
+
+def _ping(connection):
+    connection.ping()
+
+
+def _rollback(connection):
+    # Nothing a request left uncommitted may leak into the next one.
+    connection.rollback()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    _connection_pools = {}
+    _pools_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        options = self.settings_dict['OPTIONS'].get('pool')
+        if not options:
+            return None
+        with self._pools_lock:
+            if self.alias not in self._connection_pools:
+                if self.settings_dict.get('CONN_MAX_AGE', 0) != 0:
+                    raise ImproperlyConfigured("Pooling doesn't support persistent connections.")
+                self._connection_pools[self.alias] = ConnectionPool(
+                    self.alias, self._connect_for_pool, check=_ping, reset=_rollback,
+                    **({} if options is True else options),
+                )
+            return self._connection_pools[self.alias]
+
+    def _connect_for_pool(self):
+        return super().get_new_connection(self.get_connection_params())
+
+    def close_pool(self):
+        with self._pools_lock:
+            pool = self._connection_pools.pop(self.alias, None)
+        if pool is not None:
+            pool.close()
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        return pool.getconn()
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
+            # The connection now belongs to the pool.
+            self.connection = None
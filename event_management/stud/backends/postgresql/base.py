@@ -0,0 +1,32 @@
+"""
+PostgreSQL backend using Django's psycopg 3 connection pool, with checkout
+wait times and pool occupancy exported to Prometheus (see stud.pooling).
+"""
+
+import time
+
+from django.db.backends.postgresql import base
+
+from stud.metrics import observe_pool_checkout, set_pool_connections
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if not pool:
+            return super().get_new_connection(conn_params)
+        from psycopg_pool import PoolTimeout
+
+        started = time.monotonic()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except PoolTimeout:
+            observe_pool_checkout(self.alias, time.monotonic() - started, 'timeout')
+            raise
+        except Exception:
+            observe_pool_checkout(self.alias, time.monotonic() - started, 'error')
+            raise
+        observe_pool_checkout(self.alias, time.monotonic() - started, 'ok')
+        stats = pool.get_stats()
+        set_pool_connections(self.alias, stats['pool_size'], stats['pool_available'])
+        return connection
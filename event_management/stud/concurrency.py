@@ -0,0 +1,90 @@
+"""
+Running independent ORM reads of one async view concurrently.
+
+Django's async ORM (``aget``, ``acount``, ``async for``) hands every query
+of a request to the same thread, so ``asyncio.gather`` over async ORM calls
+still runs them one after another. ``gather_queries`` instead runs plain
+sync callables on a dedicated executor of ``DB_QUERY_THREADS`` threads, so
+however many requests fan out at once, they use at most that many extra
+connections per process (and never the whole pool, which the requests'
+own threads need as well). Each thread has its own database connection: a
+pooled one when DB_POOL is on (see stud/pooling.py), otherwise one kept for
+CONN_MAX_AGE. Connections are health-checked and released around every
+call, as request_started/request_finished do for a request. Starting a
+fresh thread per call instead would pay for a new thread and connection
+every time, which on a fast local database costs more than it saves.
+
+Inside a transaction, for example in a TestCase, the callables run one
+after another on the caller's connection, because another connection would
+not see the transaction's uncommitted rows.
+
+``aiterate`` feeds a sync iterator that queries as it goes (the streamed
+exports) to an ASGI StreamingHttpResponse batch by batch. Given a sync
+iterator, Django would build the whole body with ``list()`` before sending
+the first byte.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+_query_threads = settings.DB_QUERY_THREADS
+if any('pool' in database.get('OPTIONS', {}) for database in settings.DATABASES.values()):
+    _query_threads = min(_query_threads, settings.DB_POOL_MAX_SIZE - 1)
+_query_executor = ThreadPoolExecutor(max_workers=max(_query_threads, 1), thread_name_prefix='stud-query')
+
+
+async def alist(queryset):
+    """Evaluate ``queryset`` with the async ORM."""
+    return [obj async for obj in queryset]
+
+
+async def aiterate(iterable, batch_size):
+    """
+    Yield the items of ``iterable``, advancing it ``batch_size`` items at a
+    time on the request's thread, so its database connection stays the same.
+    """
+    iterator = iter(iterable)
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch_size)))
+    try:
+        while batch := await next_batch():
+            for item in batch:
+                yield item
+    finally:
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close)()
+
+
+def _in_transaction():
+    return any(conn.in_atomic_block for conn in connections.all(initialized_only=True))
+
+
+def _on_own_connection(call):
+    def run():
+        close_old_connections()
+        try:
+            return call()
+        finally:
+            close_old_connections()
+    return run
+
+
+def _sequentially(calls):
+    return [call() for call in calls]
+
+
+async def gather_queries(*calls):
+    """
+    Run ``calls`` (zero-argument callables doing read-only queries)
+    concurrently and return their results in order.
+    """
+    if await sync_to_async(_in_transaction)():
+        return await sync_to_async(_sequentially)(calls)
+    return await asyncio.gather(*(
+        sync_to_async(_on_own_connection(call), thread_sensitive=False, executor=_query_executor)()
+        for call in calls
+    ))
@@ -0,0 +1,103 @@
+"""
+Incrementally maintained row counts.
+
+Dashboard totals: every create/delete of a counted model adjusts its row in the ``counters``
+table with an ``UPDATE ... SET value = value + n`` inside the same
+transaction, so the dashboard reads the totals from a single small table
+instead of running one ``COUNT(*)`` per table. ``bulk_create`` and
+``QuerySet.update`` skip signals, so code using them must call
+:func:`increment` itself.
+
+Per-event registration counts: ``Event.registration_count`` is adjusted the
+same way whenever a Registration is created or deleted, replacing the
+``GROUP BY`` over all registrations in ``vw_event_registration_summary``.
+The registrations total is the SUM of those per-event counts rather than a
+counter row: one global row updated by every registration would serialize
+registrations for all events behind its lock. The SUM is cached under the
+Event page-cache generation (stud/pagecache.py), which every change to a
+``registration_count`` replaces, so it is recomputed once per change rather
+than on every dashboard hit.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, Now
+
+from .models import Counter, Event, User, Venue
+from .pagecache import bump, generations, replica_may_lag
+
+COUNTED_MODELS = {
+    'events': Event,
+    'users': User,
+    'venues': Venue,
+}
+
+
+def increment(name, delta=1):
+    """Add ``delta`` to counter ``name``, creating it from a full count if missing."""
+    if not delta:
+        return
+    updated = Counter.objects.filter(name=name).update(value=F('value') + delta)
+    if not updated:
+        # First use: seed from the table. The count already includes the rows
+        # that triggered this call since we run inside their transaction.
+        with transaction.atomic():
+            Counter.objects.get_or_create(
+                name=name, defaults={'value': COUNTED_MODELS[name].objects.count()}
+            )
+
+
+def registration_total():
+    current = generations([Event])
+    key = f'registration-total:{current[0][0]}'
+    total = cache.get(key)
+    if total is None:
+        total = Event.objects.aggregate(total=Coalesce(Sum('registration_count'), 0))['total']
+        # As for pages: a lagging replica's sum must not be stored under the new generation.
+        if not replica_may_lag(current):
+            cache.set(key, total)
+    return total
+
+
+def get_totals():
+    """Return ``{name: value}`` for every counted model, plus ``registrations``."""
+    totals = dict(Counter.objects.filter(name__in=COUNTED_MODELS).values_list('name', 'value'))
+    missing = [name for name in COUNTED_MODELS if name not in totals]
+    if missing:
+        totals.update(rebuild(missing))
+    totals['registrations'] = registration_total()
+    return totals
+
+
+def rebuild(names=None):
+    """Recount ``names`` (default: all counters) from scratch and store the result."""
+    totals = {}
+    with transaction.atomic():
+        for name in names or COUNTED_MODELS:
+            value = COUNTED_MODELS[name].objects.count()
+            Counter.objects.update_or_create(name=name, defaults={'value': value})
+            totals[name] = value
+    return totals
+
+
+def adjust_registration_count(event_id, delta):
+    # QuerySet.update() skips auto_now, so stamp updated_at explicitly here and below.
+    Event.objects.filter(event_id=event_id).update(registration_count=F('registration_count') + delta, updated_at=Now())
+
+
+def find_registration_count_drift():
+    """Return events whose stored registration_count differs from the real count."""
+    return (
+        Event.objects.annotate(actual=Count('registrations'))
+        .filter(~Q(registration_count=F('actual')))
+        .values_list('event_id', 'registration_count', 'actual')
+        .order_by('event_id')
+    )
+
+
+def repair_registration_counts(event_ids):
+    with transaction.atomic():
+        for event in Event.objects.filter(event_id__in=event_ids).annotate(actual=Count('registrations')):
+            Event.objects.filter(event_id=event.event_id).update(registration_count=event.actual, updated_at=Now())
+        bump(Event)
@@ -0,0 +1,135 @@
+"""
+Streaming CSV / NDJSON exports of registrations and attendance.
+
+Rows are produced lazily and written straight into a StreamingHttpResponse,
+so memory stays flat regardless of export size. PostgreSQL streams through a
+server-side cursor (``.iterator(chunk_size=...)``). MySQL's client library
+buffers whole result sets, so other backends walk the primary key in
+fixed-size keyset batches instead. Under ASGI the view hands the rows to the
+response through ``stud.concurrency.aiterate``, one batch at a time.
+"""
+
+import csv
+import datetime
+import json
+
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Registration, Attendance
+
+EXPORT_CHUNK_SIZE = 2000
+
+REGISTRATION_COLUMNS = [
+    ('reg_id', 'reg_id'),
+    ('user_id', 'user_id'),
+    ('roll_no', 'user__roll_no'),
+    ('user_name', 'user__name'),
+    ('email', 'user__email'),
+    ('dept_code', 'user__dept__dept_code'),
+    ('event_id', 'event_id'),
+    ('event_title', 'event__title'),
+    ('registered_at', 'registered_at'),
+    ('status', 'status'),
+]
+
+ATTENDANCE_COLUMNS = [
+    ('attendance_id', 'attendance_id'),
+    ('user_id', 'user_id'),
+    ('roll_no', 'user__roll_no'),
+    ('user_name', 'user__name'),
+    ('dept_code', 'user__dept__dept_code'),
+    ('event_id', 'event_id'),
+    ('event_title', 'event__title'),
+    ('present', 'present'),
+    ('checked_at', 'checked_at'),
+]
+
+
+class _Echo:
+    """File-like object whose write() just hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _day_bounds(start, end):
+    """Turn 'YYYY-MM-DD' strings into an aware [start, end + 1 day) range."""
+    def at_midnight(value):
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid date: {value!r} (expected YYYY-MM-DD)')
+        return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+    lower = at_midnight(start) if start else None
+    upper = at_midnight(end) + datetime.timedelta(days=1) if end else None
+    return lower, upper
+
+
+def export_queryset(model, columns, date_field, event_id=None, date_from=None, date_to=None, dept_id=None):
+    """Filtered ``values_list`` for an export; raises ValueError on bad filters."""
+    qs = model.objects.all()
+    if event_id:
+        qs = qs.filter(event_id=int(event_id))
+    if dept_id:
+        qs = qs.filter(user__dept_id=int(dept_id))
+    lower, upper = _day_bounds(date_from, date_to)
+    if lower:
+        qs = qs.filter(**{f'{date_field}__gte': lower})
+    if upper:
+        qs = qs.filter(**{f'{date_field}__lt': upper})
+    # Pin the database routed to now: the streamed body is read after the
+    # view, and the replica routing middleware, have returned.
+    return qs.values_list(*[path for _, path in columns]).using(qs.db)
+
+
+def iterate_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield rows of a ``values_list`` queryset without loading them all."""
+    pk_name = queryset.model._meta.pk.name
+    if connections[queryset.db].vendor == 'postgresql':
+        yield from queryset.order_by(pk_name).iterator(chunk_size=chunk_size)
+        return
+
+    # Keyset batches on the primary key: each batch is an index range scan.
+    pk_index = list(queryset.query.values_select).index(pk_name)
+    last = None
+    while True:
+        batch = queryset.order_by(pk_name)
+        if last is not None:
+            batch = batch.filter(**{f'{pk_name}__gt': last})
+        rows = list(batch[:chunk_size])
+        if not rows:
+            return
+        yield from rows
+        last = rows[-1][pk_index]
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in columns])
+    for row in rows:
+        yield writer.writerow([_jsonable(value) for value in row])
+
+
+def stream_ndjson(columns, rows):
+    names = [name for name, _ in columns]
+    for row in rows:
+        yield json.dumps(dict(zip(names, map(_jsonable, row)))) + '\n'
+
+
+EXPORTS = {
+    'registrations': (Registration, REGISTRATION_COLUMNS, 'registered_at'),
+    'attendance': (Attendance, ATTENDANCE_COLUMNS, 'checked_at'),
+}
+
+FORMATS = {
+    'csv': (stream_csv, 'text/csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+}
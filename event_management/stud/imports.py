@@ -0,0 +1,290 @@
+"""
+Bulk CSV import of users, events and registrations.
+
+The CSV is read as a stream and handled ``chunk_size`` rows at a time. Rows
+are validated, and foreign keys (``dept_code``, ``role_name``, category and
+venue names, organizer roll numbers) are resolved from lookup tables loaded
+into memory once. Valid rows are then inserted with one COPY (PostgreSQL) or
+one ``bulk_create`` per chunk. Invalid rows are skipped and reported with
+their line number.
+
+Registrations go through ``bulk_register`` one event at a time, so capacity
+limits, duplicate detection and the stored counts behave exactly as for
+bulk enrollment.
+
+A dry run performs the whole import inside a transaction and rolls it back,
+so its report is exactly what a real run would produce.
+"""
+
+import csv
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .counters import increment
+from .models import Role, Department, User, Venue, Category, Event
+from .pagecache import bump
+from .registrations import OUTCOME_REGISTERED, bulk_register
+from .search import refresh_search_tags
+
+IMPORT_CHUNK_SIZE = 2000
+
+
+class ImportReport:
+    def __init__(self, kind, dry_run):
+        self.kind = kind
+        self.dry_run = dry_run
+        self.rows = 0
+        self.created = 0
+        self.errors = []  # (line number, message)
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'dry_run': self.dry_run,
+            'rows': self.rows,
+            'created': self.created,
+            'errors': [{'line': line, 'message': message} for line, message in self.errors],
+        }
+
+
+def _chunked_rows(reader, chunk_size):
+    """Yield lists of (line_number, row dict); line 1 is the header."""
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _clean(row, name):
+    value = row.get(name)
+    value = value.strip() if value else ''
+    return value or None
+
+
+def copy_columns(model, objects):
+    """
+    Fields a COPY of ``objects`` must write: every concrete field, so
+    NOT NULL columns with only a Python-side default (Django drops the
+    database default after AddField) still get a value. The primary key is
+    left to its sequence unless the objects set it.
+    """
+    pk = model._meta.pk
+    return [
+        f for f in model._meta.concrete_fields
+        if f is not pk or objects[0].pk is not None
+    ]
+
+
+def copy_or_bulk_create(model, objects):
+    """Insert unsaved ``objects``; PostgreSQL uses COPY, others bulk_create."""
+    if not objects:
+        return
+    if connection.vendor == 'postgresql':
+        fields = copy_columns(model, objects)
+        sql = 'COPY {} ({}) FROM STDIN'.format(
+            connection.ops.quote_name(model._meta.db_table),
+            ', '.join(connection.ops.quote_name(f.column) for f in fields),
+        )
+        with connection.cursor() as cursor, cursor.copy(sql) as copy:
+            for obj in objects:
+                # pre_save() returns the value bulk_create would write, auto_now stamps included.
+                copy.write_row([f.pre_save(obj, True) for f in fields])
+    else:
+        model.objects.bulk_create(objects, batch_size=1000)
+
+
+def _parse_when(value):
+    if value is None:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f'invalid datetime {value!r}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _import_users(reader, report, chunk_size):
+    depts = dict(Department.objects.values_list('dept_code', 'dept_id'))
+    roles = dict(Role.objects.values_list('role_name', 'role_id'))
+    seen_roll_nos = set()
+    now = timezone.now()
+
+    for chunk in _chunked_rows(reader, chunk_size):
+        roll_nos = [_clean(row, 'roll_no') for _, row in chunk]
+        existing = set(
+            User.objects.filter(roll_no__in=[r for r in roll_nos if r]).values_list('roll_no', flat=True)
+        )
+        users = []
+        for line, row in chunk:
+            report.rows += 1
+            roll_no, name, email = _clean(row, 'roll_no'), _clean(row, 'name'), _clean(row, 'email')
+            dept_code, role_name = _clean(row, 'dept_code'), _clean(row, 'role_name')
+            if not name:
+                report.error(line, 'name is required')
+                continue
+            if roll_no and (roll_no in existing or roll_no in seen_roll_nos):
+                report.error(line, f'duplicate roll_no {roll_no}')
+                continue
+            if dept_code and dept_code not in depts:
+                report.error(line, f'unknown dept_code {dept_code}')
+                continue
+            if role_name and role_name not in roles:
+                report.error(line, f'unknown role_name {role_name}')
+                continue
+            if email:
+                try:
+                    validate_email(email)
+                except ValidationError:
+                    report.error(line, f'invalid email {email}')
+                    continue
+            if roll_no:
+                seen_roll_nos.add(roll_no)
+            users.append(User(
+                roll_no=roll_no, name=name, email=email, phone=_clean(row, 'phone'),
+                role_id=roles.get(role_name), dept_id=depts.get(dept_code), created_at=now,
+            ))
+        copy_or_bulk_create(User, users)
+        bump(User)
+        report.created += len(users)
+    increment('users', report.created)
+
+
+def _unique_lookup(pairs):
+    """name -> id, with names that occur more than once mapped to None."""
+    lookup = {}
+    for name, pk in pairs:
+        lookup[name] = None if name in lookup else pk
+    return lookup
+
+
+def _import_events(reader, report, chunk_size):
+    categories = dict(Category.objects.values_list('name', 'category_id'))
+    venues = _unique_lookup(Venue.objects.values_list('name', 'venue_id'))
+    last_event_id = Event.objects.aggregate(m=Max('event_id'))['m'] or 0
+    now = timezone.now()
+
+    for chunk in _chunked_rows(reader, chunk_size):
+        organizers = dict(
+            User.objects.filter(roll_no__in={_clean(row, 'organizer_roll_no') for _, row in chunk} - {None})
+            .values_list('roll_no', 'user_id')
+        )
+        events = []
+        for line, row in chunk:
+            report.rows += 1
+            title = _clean(row, 'title')
+            category, venue = _clean(row, 'category'), _clean(row, 'venue')
+            organizer = _clean(row, 'organizer_roll_no')
+            try:
+                if not title:
+                    raise ValueError('title is required')
+                if category and category not in categories:
+                    raise ValueError(f'unknown category {category}')
+                if venue and venues.get(venue) is None:
+                    raise ValueError(f'unknown or ambiguous venue {venue}')
+                if organizer and organizer not in organizers:
+                    raise ValueError(f'unknown organizer_roll_no {organizer}')
+                start, end = _parse_when(_clean(row, 'start_datetime')), _parse_when(_clean(row, 'end_datetime'))
+                if start and end and end <= start:
+                    raise ValueError('end_datetime must be after start_datetime')
+                capacity = _clean(row, 'capacity')
+                capacity = int(capacity) if capacity else None
+                if capacity is not None and capacity < 0:
+                    raise ValueError('capacity must not be negative')
+                status = _clean(row, 'status') or Event.Status.SCHEDULED
+                if status not in Event.Status.values:
+                    raise ValueError(f'unknown status {status}')
+            except ValueError as e:
+                report.error(line, str(e))
+                continue
+            events.append(Event(
+                title=title, description=_clean(row, 'description'),
+                category_id=categories.get(category), venue_id=venues.get(venue),
+                organizer_id=organizers.get(organizer), start_datetime=start, end_datetime=end,
+                capacity=capacity, status=status,
+                created_at=now, registration_count=0,
+            ))
+        copy_or_bulk_create(Event, events)
+        report.created += len(events)
+    increment('events', report.created)
+    # Bulk inserts skip the pre_save signal that fills search_tags.
+    refresh_search_tags(Event.objects.filter(event_id__gt=last_event_id))
+    bump(Event)
+
+
+def _import_registrations(reader, report, chunk_size):
+    event_ids = set(Event.objects.values_list('event_id', flat=True))
+
+    for chunk in _chunked_rows(reader, chunk_size):
+        by_event = defaultdict(list)  # event_id -> [(line, roll_no)]
+        for line, row in chunk:
+            report.rows += 1
+            roll_no = _clean(row, 'roll_no')
+            try:
+                event_id = int(_clean(row, 'event_id') or '')
+            except ValueError:
+                report.error(line, 'event_id must be an integer')
+                continue
+            if event_id not in event_ids:
+                report.error(line, f'unknown event_id {event_id}')
+            elif not roll_no:
+                report.error(line, 'roll_no is required')
+            else:
+                by_event[event_id].append((line, roll_no))
+
+        for event_id, entries in by_event.items():
+            lines = {}
+            for line, roll_no in entries:
+                lines.setdefault(roll_no, line)
+            result = bulk_register(event_id, roll_nos=[roll_no for _, roll_no in entries], chunk_size=chunk_size)
+            report.created += result['registered']
+            for outcome in result['results']:
+                if outcome['status'] != OUTCOME_REGISTERED:
+                    report.error(lines.get(outcome['roll_no']), f"{outcome['roll_no']}: {outcome['status']}")
+
+
+IMPORTERS = {
+    'users': _import_users,
+    'events': _import_events,
+    'registrations': _import_registrations,
+}
+
+REQUIRED_COLUMNS = {
+    'users': {'name'},
+    'events': {'title'},
+    'registrations': {'event_id', 'roll_no'},
+}
+
+
+def import_csv(kind, stream, dry_run=False, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import CSV rows of ``kind`` ('users', 'events' or 'registrations') from a
+    text ``stream`` and return an ImportReport. Raises ValueError when the
+    kind is unknown or required header columns are missing.
+    """
+    if kind not in IMPORTERS:
+        raise ValueError(f"Unknown import kind {kind!r}; expected one of {', '.join(IMPORTERS)}")
+    reader = csv.DictReader(stream)
+    missing = REQUIRED_COLUMNS[kind] - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"Missing CSV column(s): {', '.join(sorted(missing))}")
+
+    report = ImportReport(kind, dry_run)
+    with transaction.atomic():
+        IMPORTERS[kind](reader, report, chunk_size)
+        if dry_run:
+            transaction.set_rollback(True)
+    return report
@@ -0,0 +1,166 @@
+"""
+Offline check-in kiosk sync.
+
+A kiosk downloads a compact roster snapshot for an event once, then polls for
+versioned deltas while it has connectivity. Every registration add/remove is
+appended to ``roster_changes`` (by the signals in stud/signals.py and by bulk
+enrollment) with the next value of ``Event.roster_version``. That counter is
+bumped with an UPDATE of the event row, which holds the row lock until
+commit, so versions of one event commit in order: once a kiosk has seen
+version N, every change below N is already visible. (The auto-increment
+``change_id`` is not: ids are handed out at insert time but become visible
+at commit, so a poll could skip a slower transaction's lower id.)
+Check-ins recorded offline are uploaded in batches and merged into
+Attendance with last-writer-wins on ``checked_at`` per (event, user).
+"""
+
+import datetime
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .attendance import upsert_attendance
+from .models import Attendance, Event, Registration, RosterChange, User
+
+DELTA_LIMIT = 5000
+
+
+def log_roster_changes(event_id, user_ids, action):
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    with transaction.atomic():
+        # Registration already updates (and so locks) this row in the same
+        # transaction, so bumping the version here adds no new contention.
+        bumped = Event.objects.filter(event_id=event_id).update(roster_version=F('roster_version') + len(user_ids))
+        if not bumped:
+            return  # event deleted; its log is purged with it
+        last = Event.objects.filter(event_id=event_id).values_list('roster_version', flat=True).get()
+        first = last - len(user_ids) + 1
+        RosterChange.objects.bulk_create(
+            [
+                RosterChange(event_id=event_id, user_id=user_id, action=action, version=first + i)
+                for i, user_id in enumerate(user_ids)
+            ],
+            batch_size=1000,
+        )
+
+
+def current_version(event_id):
+    return Event.objects.filter(event_id=event_id).values_list('roster_version', flat=True).first() or 0
+
+
+def roster_snapshot(event_id):
+    """
+    ``{'event_id', 'version', 'users': [[user_id, roll_no, name], ...]}``.
+    The version is read before the rows, so a change racing the snapshot is
+    at worst replayed by the next delta; kiosks apply deltas idempotently.
+    """
+    version = current_version(event_id)
+    users = (
+        Registration.objects.filter(event_id=event_id)
+        .order_by('user_id')
+        .values_list('user_id', 'user__roll_no', 'user__name')
+    )
+    return {'event_id': event_id, 'version': version, 'users': [list(row) for row in users.iterator(chunk_size=2000)]}
+
+
+def roster_delta(event_id, since, limit=DELTA_LIMIT):
+    """
+    Changes after version ``since``: ``{'version', 'more', 'changes':
+    [[version, action, user_id, roll_no, name], ...]}``. When ``more`` is
+    true the kiosk should ask again from the returned version.
+    """
+    changes = list(
+        RosterChange.objects.filter(event_id=event_id, version__gt=since)
+        .order_by('version')
+        .values_list('version', 'action', 'user_id')[:limit + 1]
+    )
+    more = len(changes) > limit
+    changes = changes[:limit]
+    added = {user_id for _, action, user_id in changes if action == RosterChange.ADD}
+    names = {
+        user_id: (roll_no, name)
+        for user_id, roll_no, name in User.objects.filter(user_id__in=added).values_list('user_id', 'roll_no', 'name')
+    }
+    return {
+        'event_id': event_id,
+        'version': changes[-1][0] if changes else since,
+        'more': more,
+        'changes': [
+            [version, action, user_id, *names.get(user_id, (None, None))]
+            for version, action, user_id in changes
+        ],
+    }
+
+
+def _parse_present(value):
+    """``present`` from a kiosk: a JSON boolean, 0/1 or "true"/"false"/"0"/"1"."""
+    if value in (True, 1, 'true', '1'):
+        return True
+    if value in (False, 0, 'false', '0'):
+        return False
+    raise ValueError(f'present must be true or false, not {value!r}')
+
+
+def apply_checkins(event_id, checkins):
+    """
+    Merge uploaded check-ins (dicts with ``user_id``, ``checked_at`` ISO
+    timestamp and optional ``present``, default True) into Attendance.
+
+    Within the batch and against stored rows the latest ``checked_at`` wins;
+    older check-ins are reported as stale. Users not registered for the event
+    and malformed entries are rejected. Returns a summary dict. Raises
+    ValueError, before writing anything, if a ``present`` value is not a
+    boolean: guessing would mark absent students present.
+    """
+    latest = {}
+    rejected = []
+    for item in checkins:
+        present = _parse_present(item.get('present', True)) if isinstance(item, dict) else None
+        try:
+            user_id = int(item['user_id'])
+            checked_at = parse_datetime(item['checked_at'])
+            if checked_at is None:
+                raise ValueError
+            if timezone.is_naive(checked_at):
+                checked_at = timezone.make_aware(checked_at, datetime.timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            rejected.append(item.get('user_id') if isinstance(item, dict) else None)
+            continue
+        if user_id not in latest or checked_at > latest[user_id][1]:
+            latest[user_id] = (present, checked_at)
+
+    stale = 0
+    with transaction.atomic():
+        # Uploads for one event merge one at a time. Locking only the stored
+        # Attendance rows is not enough: when two uploads first-insert the
+        # same (event, user) neither sees a row, and the upsert would let the
+        # older check-in win.
+        list(Event.objects.select_for_update().filter(event_id=event_id).values_list('event_id', flat=True))
+        registered = set(
+            Registration.objects.filter(event_id=event_id, user_id__in=list(latest))
+            .values_list('user_id', flat=True)
+        )
+        for user_id in set(latest) - registered:
+            rejected.append(user_id)
+            del latest[user_id]
+
+        # Also lock the rows we may overwrite against manual roster marking.
+        stored = dict(
+            Attendance.objects.select_for_update()
+            .filter(event_id=event_id, user_id__in=list(latest))
+            .values_list('user_id', 'checked_at')
+        )
+        rows = []
+        for user_id, (present, checked_at) in latest.items():
+            previous = stored.get(user_id)
+            if previous is not None and previous >= checked_at:
+                stale += 1
+                continue
+            rows.append(Attendance(event_id=event_id, user_id=user_id, present=present, checked_at=checked_at))
+        upsert_attendance(rows)
+
+    return {'event_id': event_id, 'accepted': len(rows), 'stale': stale, 'rejected': rejected}
@@ -0,0 +1,280 @@
+"""
+HTTP load-test harness for the event_management pages.
+
+Worker threads replay a weighted mix of scenarios against a running server
+(or one started in-process by the ``loadtest`` command) using only the
+standard library. Every request is tagged with the URL name of the view it
+hits, so results line up with the Server-Timing log and /metrics.
+
+Scenarios:
+    dashboard  GET dashboard
+    browse     GET event_list, event_summary, registration_list
+    register   a burst of registration_create POSTs for distinct users
+    checkin    one attendance_create POST
+
+POSTs carry a client-generated CSRF cookie and matching X-CSRFToken header,
+which CsrfViewMiddleware accepts over plain HTTP. Redirects are not
+followed: a successful POST is timed up to its 302.
+"""
+
+import json
+import math
+import random
+import secrets
+import string
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.urls import reverse
+
+DEFAULT_MIX = {'dashboard': 2, 'browse': 4, 'register': 2, 'checkin': 2}
+REGISTER_BURST = 5
+REQUEST_TIMEOUT = 30
+
+
+def parse_mix(value):
+    """'dashboard=2,browse=4' -> {'dashboard': 2, 'browse': 4}; raises ValueError."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; expected one of {', '.join(SCENARIOS)}")
+        mix[name] = int(weight or 1)
+        if mix[name] < 0:
+            raise ValueError('Scenario weights must not be negative')
+    if not any(mix.values()):
+        raise ValueError('At least one scenario needs a positive weight')
+    return mix
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve_in_background(host='127.0.0.1', port=0):
+    """Start this project on a threaded WSGI server; returns (base_url, server)."""
+    server = ThreadedWSGIServer((host, port), _QuietHandler, allow_reuse_address=False)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://{host}:{server.server_address[1]}', server
+
+
+class Fixtures:
+    """Event and user ids to drive POSTs with; hands out (event, user) pairs."""
+
+    def __init__(self, event_ids, user_ids, seed=0):
+        self.event_ids = list(event_ids)
+        self.user_ids = list(user_ids)
+        pairs = [(e, u) for e in self.event_ids for u in self.user_ids]
+        random.Random(seed).shuffle(pairs)
+        self._pairs = iter(pairs)
+        self._lock = threading.Lock()
+
+    def next_registration(self, rng):
+        # Fresh pairs first so registrations mostly succeed, then repeats.
+        with self._lock:
+            pair = next(self._pairs, None)
+        return pair or (rng.choice(self.event_ids), rng.choice(self.user_ids))
+
+    def random_pair(self, rng):
+        return rng.choice(self.event_ids), rng.choice(self.user_ids)
+
+
+class Client:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.csrf = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(32))
+        self.opener = urllib.request.build_opener(_NoRedirect)
+
+    def request(self, method, path, data=None):
+        """Return (status, seconds); status 0 means a connection error."""
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        req.add_header('Cookie', f'csrftoken={self.csrf}')
+        if method == 'POST':
+            req.add_header('X-CSRFToken', self.csrf)
+            req.add_header('Content-Type', 'application/x-www-form-urlencoded')
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=REQUEST_TIMEOUT) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code
+        except (urllib.error.URLError, OSError):
+            status = 0
+        return status, time.perf_counter() - started
+
+
+def _dashboard(client, fixtures, rng):
+    yield 'dashboard', 'GET', reverse('dashboard'), None
+
+
+def _browse(client, fixtures, rng):
+    for name in ('event_list', 'event_summary', 'registration_list'):
+        yield name, 'GET', reverse(name), None
+
+
+def _register(client, fixtures, rng):
+    for _ in range(REGISTER_BURST):
+        event_id, user_id = fixtures.next_registration(rng)
+        yield 'registration_create', 'POST', reverse('registration_create'), {'event': event_id, 'user': user_id}
+
+
+def _checkin(client, fixtures, rng):
+    event_id, user_id = fixtures.random_pair(rng)
+    data = {'event': event_id, 'user': user_id}
+    if rng.random() < 0.9:
+        data['present'] = 'on'
+    yield 'attendance_create', 'POST', reverse('attendance_create'), data
+
+
+SCENARIOS = {
+    'dashboard': _dashboard,
+    'browse': _browse,
+    'register': _register,
+    'checkin': _checkin,
+}
+
+
+def run_load(base_url, fixtures, mix=None, concurrency=8, duration=30.0, warmup=2.0, seed=0):
+    """
+    Drive the scenario mix from ``concurrency`` threads for ``warmup`` +
+    ``duration`` seconds. Returns (samples, elapsed) where samples are
+    (url name, status, seconds) recorded after the warm-up.
+    """
+    mix = mix or DEFAULT_MIX
+    names = [name for name in mix if mix[name]]
+    weights = [mix[name] for name in names]
+    samples = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(concurrency + 1)
+    measure_from = deadline = 0.0
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        client = Client(base_url)
+        local = []
+        start_gate.wait()
+        while time.perf_counter() < deadline:
+            scenario = SCENARIOS[rng.choices(names, weights)[0]]
+            for name, method, path, data in scenario(client, fixtures, rng):
+                started = time.perf_counter()
+                status, seconds = client.request(method, path, data)
+                if started >= measure_from:
+                    local.append((name, status, seconds))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+    start_gate.wait()
+    for t in threads:
+        t.join()
+    # In-flight requests finish after the deadline; count them in the window.
+    return samples, time.perf_counter() - measure_from
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _stats(rows, elapsed):
+    latencies = sorted(seconds * 1000 for _, status, seconds in rows)
+    statuses = defaultdict(int)
+    for _, status, _ in rows:
+        statuses[str(status)] += 1
+    return {
+        'count': len(rows),
+        'errors': sum(1 for _, status, _ in rows if status == 0 or status >= 500),
+        'rps': round(len(rows) / elapsed, 2) if elapsed else None,
+        'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else None,
+        'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+        'max_ms': round(latencies[-1], 2) if latencies else None,
+        'statuses': dict(sorted(statuses.items())),
+    }
+
+
+def summarize(samples, elapsed, meta):
+    by_name = defaultdict(list)
+    for row in samples:
+        by_name[row[0]].append(row)
+    return {
+        'meta': meta,
+        'overall': _stats(samples, elapsed),
+        'views': {name: _stats(rows, elapsed) for name, rows in sorted(by_name.items())},
+    }
+
+
+def _change(old, new):
+    if old in (None, 0) or new is None:
+        return None
+    return round((new - old) / old * 100, 1)
+
+
+def _error_pct(stats):
+    return round(100 * stats['errors'] / stats['count'], 2) if stats['count'] else 0
+
+
+def compare(baseline, current, threshold=10.0, error_threshold=1.0):
+    """
+    Per-view comparison of two ``summarize`` results. A view regresses when
+    its p95 latency grows or its throughput drops by more than ``threshold``
+    percent, or its error rate rises by more than ``error_threshold``
+    percentage points. Returns a list of row dicts, the overall row last.
+    """
+    rows = []
+    views = dict(baseline['views'], **{'(overall)': baseline['overall']})
+    current_views = dict(current['views'], **{'(overall)': current['overall']})
+    for name in sorted(set(views) | set(current_views), key=lambda n: (n == '(overall)', n)):
+        old, new = views.get(name), current_views.get(name)
+        if old is None or new is None:
+            rows.append({'view': name, 'missing': 'baseline' if old is None else 'current'})
+            continue
+        row = {'view': name}
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'rps'):
+            row[key] = (old[key], new[key], _change(old[key], new[key]))
+        old_errors, new_errors = _error_pct(old), _error_pct(new)
+        row['error_pct'] = (old_errors, new_errors, round(new_errors - old_errors, 2))
+        p95_change, rps_change = row['p95_ms'][2], row['rps'][2]
+        row['regression'] = bool(
+            (p95_change is not None and p95_change > threshold)
+            or (rps_change is not None and rps_change < -threshold)
+            or new_errors - old_errors > error_threshold
+        )
+        rows.append(row)
+    return rows
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_results(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+
+from stud.concurrency import gather_queries
+from stud.loadtest import percentile
+from stud.views import dashboard_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the dashboard's reads. 'sequential' runs them one after "
+        "another on one connection, as the sync view did (and as async ORM "
+        "calls do). 'concurrent' runs them with gather_queries, as the "
+        "async dashboard view does. A local database answers in microseconds, "
+        "so --latency-ms adds a simulated network round trip to every query. "
+        "For end-to-end numbers, run loadtest --mix dashboard=1 --url against "
+        "the WSGI and the ASGI server and compare the results with loadtest_compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured iterations per mode')
+        parser.add_argument('--latency-ms', type=float, default=0.0,
+                            help='Simulated round trip added to every query')
+
+    def handle(self, *args, **options):
+        iterations, warmup, latency = options['iterations'], options['warmup'], options['latency_ms'] / 1000
+        if iterations < 1 or warmup < 0 or latency < 0:
+            raise CommandError('--iterations must be positive, --warmup and --latency-ms not negative')
+
+        def delay(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def add_latency(sender, connection, **kwargs):
+            connection.execute_wrappers.append(delay)
+
+        if latency:
+            connection_created.connect(add_latency, dispatch_uid='bench_dashboard.add_latency')
+            # Reconnect so existing connections pick the delay up as well.
+            connections.close_all()
+        try:
+            results = asyncio.run(self.run(iterations, warmup))
+        finally:
+            connection_created.disconnect(dispatch_uid='bench_dashboard.add_latency')
+            connections.close_all()
+
+        self.stdout.write(
+            f'backend: {connection.vendor}, {len(dashboard_queries())} reads, {iterations} iterations, '
+            f"{options['latency_ms']:g} ms added per query"
+        )
+        self.stdout.write(f'{"mode":<12}{"p50 ms":>10}{"p95 ms":>10}{"mean ms":>10}')
+        for mode, samples in results.items():
+            samples.sort()
+            self.stdout.write(
+                f'{mode:<12}{percentile(samples, 50):>10.2f}{percentile(samples, 95):>10.2f}'
+                f'{sum(samples) / len(samples):>10.2f}'
+            )
+        gain = percentile(results['sequential'], 50) / percentile(results['concurrent'], 50)
+        style = self.style.SUCCESS if gain > 1 else self.style.WARNING
+        self.stdout.write(style(f'concurrent dashboard reads: {gain:.2f}x faster at p50'))
+
+    async def run(self, iterations, warmup):
+        async def sequential():
+            return await sync_to_async(lambda: [call() for call in dashboard_queries()])()
+
+        async def concurrent():
+            return await gather_queries(*dashboard_queries())
+
+        results = {}
+        for mode, fetch in (('sequential', sequential), ('concurrent', concurrent)):
+            samples = []
+            for i in range(warmup + iterations):
+                started = time.perf_counter()
+                await fetch()
+                if i >= warmup:
+                    samples.append((time.perf_counter() - started) * 1000)
+            results[mode] = samples
+        return results
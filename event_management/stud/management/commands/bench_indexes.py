@@ -0,0 +1,175 @@
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from stud.attendance import attendance_counts
+from stud.counters import rebuild
+from stud.models import UPCOMING_EVENTS_INDEX, Event, User, Registration, Attendance, RosterChange
+
+
+def _index(model, name):
+    # events_upcoming_idx lives outside Meta.indexes (see stud/models.py).
+    return next(index for index in [*model._meta.indexes, UPCOMING_EVENTS_INDEX] if index.name == name)
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the hot queries with and without their indexes. Each index is '
+        'dropped, its query re-timed, and the index recreated, so run this '
+        'against a development or staging copy only. --seed adds synthetic '
+        'events, users, registrations and attendance first and removes them '
+        'afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true', help='Insert synthetic rows for the run')
+        parser.add_argument('--events', type=int, default=2000)
+        parser.add_argument('--users', type=int, default=20000)
+        parser.add_argument('--per-event', type=int, default=25, help='Registrations per seeded event')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query (median reported)')
+        parser.add_argument('--only', nargs='+', metavar='INDEX', help='Benchmark only these indexes')
+        parser.add_argument('--explain', action='store_true', help='Print the query plan in both states')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows')
+        parser.add_argument('--force', action='store_true', help='Run even when DEBUG is off')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('This drops and recreates indexes; pass --force to run with DEBUG off.')
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be positive')
+
+        tag = f'idx-{uuid.uuid4().hex[:8]}'
+        if options['seed']:
+            self.seed(tag, options['events'], options['users'], options['per_event'])
+        try:
+            self.run(self.cases(), options)
+        finally:
+            if options['seed'] and not options['keep']:
+                self.cleanup(tag)
+
+    def cases(self):
+        """(index name, model, queryset factory); factories run the query to completion."""
+        now = timezone.now()
+        sample_user = User.objects.exclude(roll_no=None).exclude(email=None).order_by('-user_id').first()
+        busiest = Attendance.objects.values_list('event_id', flat=True).order_by('-event_id').first()
+        roll_no = sample_user.roll_no if sample_user else ''
+        email = sample_user.email if sample_user else ''
+        return [
+            ('events_start_idx', Event,
+             lambda: Event.objects.order_by('-start_datetime', '-event_id')[:50]),
+            ('events_status_start_idx', Event,
+             lambda: Event.objects.filter(status=Event.Status.COMPLETED).order_by('start_datetime')[:50]),
+            ('events_upcoming_idx', Event,
+             lambda: Event.objects.filter(status=Event.Status.SCHEDULED, start_datetime__gte=now)
+             .order_by('start_datetime')[:5]),
+            ('registrations_recent_idx', Registration,
+             lambda: Registration.objects.order_by('-registered_at', '-reg_id')[:50]),
+            ('registrations_status_idx', Registration,
+             lambda: Registration.objects.filter(status=Registration.Status.CANCELLED).values('event_id')[:200]),
+            ('users_roll_no_idx', User, lambda: User.objects.filter(roll_no=roll_no)),
+            ('users_email_idx', User, lambda: User.objects.filter(email=email)),
+            ('attendance_event_present_idx', Attendance, lambda: attendance_counts(busiest)),
+            ('attendance_checked_at_idx', Attendance,
+             lambda: Attendance.objects.filter(checked_at__gte=now - timedelta(days=1)).values('attendance_id')[:500]),
+        ]
+
+    def time_query(self, factory, repeat):
+        samples = []
+        for _ in range(repeat + 1):  # the first run warms caches and is discarded
+            started = time.perf_counter()
+            result = factory()
+            if not isinstance(result, dict):
+                list(result)
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples[1:])
+
+    def explain(self, factory):
+        result = factory()
+        if hasattr(result, 'explain'):
+            for line in result.explain().splitlines():
+                self.stdout.write(f'    {line}')
+
+    def run(self, cases, options):
+        only = set(options['only'] or [])
+        self.stdout.write(f'backend: {connection.vendor}, {options["repeat"]} runs per query (median)')
+        self.stdout.write(f'{"index":<32}{"with":>10}{"without":>12}{"speedup":>10}')
+        for name, model, factory in cases:
+            if only and name not in only:
+                continue
+            index = _index(model, name)
+            if index.condition is not None and not connection.features.supports_partial_indexes:
+                self.stdout.write(f'{name:<32}{"skipped (no partial indexes)":>32}')
+                continue
+
+            if options['explain']:
+                self.stdout.write(f'{name} with index:')
+                self.explain(factory)
+            with_index = self.time_query(factory, options['repeat'])
+            with connection.schema_editor() as editor:
+                editor.remove_index(model, index)
+            try:
+                if options['explain']:
+                    self.stdout.write(f'{name} without index:')
+                    self.explain(factory)
+                without_index = self.time_query(factory, options['repeat'])
+            finally:
+                with connection.schema_editor() as editor:
+                    editor.add_index(model, index)
+
+            speedup = without_index / with_index if with_index else float('inf')
+            self.stdout.write(f'{name:<32}{with_index:>8.2f}ms{without_index:>10.2f}ms{speedup:>9.1f}x')
+
+    def seed(self, tag, n_events, n_users, per_event):
+        rng = random.Random(tag)
+        now = timezone.now()
+        self.stdout.write(f'seeding {n_events} events, {n_users} users ({tag})...')
+        User.objects.bulk_create(
+            [User(name=f'{tag}-{i}', roll_no=f'{tag}-{i}', email=f'{tag}-{i}@example.com', created_at=now)
+             for i in range(n_users)],
+            batch_size=1000,
+        )
+        statuses = Event.Status.values
+        per_event = min(per_event, n_users)
+        Event.objects.bulk_create(
+            [Event(title=f'{tag}-{i}', start_datetime=now + timedelta(hours=rng.randint(-24 * 365, 24 * 365)),
+                   status=rng.choice(statuses), capacity=per_event, registration_count=per_event, created_at=now)
+             for i in range(n_events)],
+            batch_size=1000,
+        )
+        user_ids = list(User.objects.filter(name__startswith=f'{tag}-').values_list('user_id', flat=True))
+        event_ids = list(Event.objects.filter(title__startswith=f'{tag}-').values_list('event_id', flat=True))
+
+        registrations, attendance = [], []
+        reg_statuses = Registration.Status.values
+        for event_id in event_ids:
+            for user_id in rng.sample(user_ids, per_event):
+                when = now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+                registrations.append(Registration(event_id=event_id, user_id=user_id, registered_at=when,
+                                                  status=rng.choices(reg_statuses, weights=(90, 5, 5))[0]))
+                attendance.append(Attendance(event_id=event_id, user_id=user_id,
+                                             present=rng.random() < 0.8, checked_at=when))
+        Registration.objects.bulk_create(registrations, batch_size=1000)
+        Attendance.objects.bulk_create(attendance, batch_size=1000)
+        rebuild()
+
+    def cleanup(self, tag):
+        events = Event.objects.filter(title__startswith=f'{tag}-')
+        users = User.objects.filter(name__startswith=f'{tag}-')
+        # Raw deletes: the registration signals would otherwise run once per row.
+        for qs in (
+            Attendance.objects.filter(event__in=events),
+            Registration.objects.filter(event__in=events),
+            RosterChange.objects.filter(event_id__in=events.values('event_id')),
+        ):
+            qs._raw_delete(qs.db)
+        events._raw_delete(events.db)
+        users._raw_delete(users.db)
+        rebuild()
+        self.stdout.write(f'removed seeded rows ({tag})')
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import Counter as Tally
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from stud.loadtest import percentile
+from stud.models import EventRegistrationSummaryView
+
+PAGE_SIZE = 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark database connection pooling. Threads repeat what a request '
+        'does with the database (connect, read a page of the event summary view, '
+        'close) twice: once opening a new connection per request, once through '
+        'the pool. Reports requests/sec and connect/checkout latency for each. '
+        'PostgreSQL or MySQL only. For end-to-end numbers run loadtest with '
+        'DB_POOL=0 --output nopool.json, then with DB_POOL=1 --baseline nopool.json.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=2000, help='Total requests per mode')
+        parser.add_argument('--pool-size', type=int, default=settings.DB_POOL_MAX_SIZE,
+                            help='Pool max_size (default: DB_POOL_MAX_SIZE, the per-worker size)')
+
+    def handle(self, *args, **options):
+        threads, requests, pool_size = options['threads'], options['requests'], options['pool_size']
+        if min(threads, requests, pool_size) < 1:
+            raise CommandError('--threads, --requests and --pool-size must be positive')
+        if options['database'] not in connections.settings:
+            raise CommandError(f"Unknown database {options['database']!r}")
+        source = connections.settings[options['database']]
+        vendor = connections[options['database']].vendor
+        if vendor not in ('postgresql', 'mysql'):
+            raise CommandError(f'Connection pooling needs PostgreSQL or MySQL, not {vendor}.')
+
+        pool = {**settings.DB_POOL_OPTIONS, 'max_size': pool_size,
+                'min_size': min(settings.DB_POOL_OPTIONS['min_size'], pool_size)}
+        self.stdout.write(f'backend: {vendor}, {threads} threads, {requests} requests per mode, pool max_size {pool_size}')
+        self.stdout.write(f'{"mode":<8}{"ok":>7}{"errors":>8}{"req/s":>9}{"connect p50":>13}{"p95 ms":>9}'
+                          f'{"request p50":>13}{"p95 ms":>9}')
+        rates = {}
+        for mode, pool_options in (('direct', None), ('pooled', pool)):
+            alias = f'bench_pool_{mode}'
+            db_options = {k: v for k, v in source['OPTIONS'].items() if k != 'pool'}
+            if pool_options:
+                db_options['pool'] = pool_options
+            connections.settings[alias] = {
+                **source, 'ENGINE': f'stud.backends.{vendor}', 'OPTIONS': db_options,
+                'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': bool(pool_options),
+            }
+            try:
+                result = self.run(alias, threads, requests)
+            finally:
+                if pool_options:
+                    connections[alias].close_pool()
+                del connections[alias]
+                del connections.settings[alias]
+            rates[mode] = result['rps']
+            errors = ' '.join(f'{name}:{n}' for name, n in result['errors'].items())
+            self.stdout.write(
+                f"{mode:<8}{result['ok']:>7}{sum(result['errors'].values()):>8}{result['rps']:>9.0f}"
+                f"{result['connect_p50']:>13.2f}{result['connect_p95']:>9.2f}"
+                f"{result['request_p50']:>13.2f}{result['request_p95']:>9.2f}  {errors}"
+            )
+        if rates['direct']:
+            self.stdout.write(self.style.SUCCESS(f"pooled/direct throughput: {rates['pooled'] / rates['direct']:.2f}x"))
+
+    def run(self, alias, threads, requests):
+        connect_ms, request_ms, errors = [], [], Tally()
+        lock = threading.Lock()
+        start_gate = threading.Barrier(threads)
+
+        def worker(count):
+            conn = connections[alias]
+            local_connect, local_request, local_errors = [], [], Tally()
+            try:
+                start_gate.wait()
+                for _ in range(count):
+                    started = time.perf_counter()
+                    try:
+                        conn.ensure_connection()
+                        connected = time.perf_counter()
+                        list(EventRegistrationSummaryView.objects.using(alias).order_by('event_id')[:PAGE_SIZE])
+                    except Exception as e:  # pool timeouts are part of the result
+                        local_errors[type(e).__name__] += 1
+                    else:
+                        finished = time.perf_counter()
+                        local_connect.append((connected - started) * 1000)
+                        local_request.append((finished - started) * 1000)
+                    finally:
+                        # What request_finished does: close, or return to the pool.
+                        conn.close()
+            finally:
+                with lock:
+                    connect_ms.extend(local_connect)
+                    request_ms.extend(local_request)
+                    errors.update(local_errors)
+
+        workers = [
+            threading.Thread(target=worker, args=(requests // threads + (i < requests % threads),))
+            for i in range(threads)
+        ]
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        connect_ms.sort()
+        request_ms.sort()
+        return {
+            'ok': len(request_ms),
+            'errors': errors,
+            'rps': len(request_ms) / elapsed if elapsed else 0.0,
+            'connect_p50': percentile(connect_ms, 50) or 0.0,
+            'connect_p95': percentile(connect_ms, 95) or 0.0,
+            'request_p50': percentile(request_ms, 50) or 0.0,
+            'request_p95': percentile(request_ms, 95) or 0.0,
+        }
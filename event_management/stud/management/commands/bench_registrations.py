@@ -0,0 +1,97 @@
+import threading
+import time
+import uuid
+from collections import Counter as Tally
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from stud.counters import increment
+from stud.models import Event, User, Registration
+from stud.registrations import RegistrationError, register_user
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the seat reservation engine: many threads register distinct '
+        'users for one event at once. Reports registrations/sec and verifies '
+        'that the event is never overbooked. Use PostgreSQL or MySQL; SQLite '
+        'serialises all writers and will mostly measure lock timeouts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--capacity', type=int, default=500)
+        parser.add_argument('--attempts', type=int, default=2000,
+                            help='Number of registration attempts (distinct users)')
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--keep', action='store_true', help='Keep the benchmark event and users')
+
+    def handle(self, *args, **options):
+        capacity, attempts, threads = options['capacity'], options['attempts'], options['threads']
+        if min(capacity, attempts, threads) < 1:
+            raise CommandError('--capacity, --attempts and --threads must be positive')
+
+        tag = f'bench-{uuid.uuid4().hex[:8]}'
+        event = Event.objects.create(title=tag, capacity=capacity, status='scheduled')
+        users = User.objects.bulk_create(
+            [User(name=f'{tag}-{i}') for i in range(attempts)], batch_size=1000
+        )
+        increment('users', len(users))
+        user_ids = [u.user_id for u in users]
+        if user_ids[0] is None:
+            # Backends without RETURNING on bulk inserts (MySQL)
+            user_ids = list(User.objects.filter(name__startswith=f'{tag}-').values_list('user_id', flat=True))
+
+        outcomes = Tally()
+        lock = threading.Lock()
+        start_gate = threading.Barrier(threads)
+
+        def worker(ids):
+            local = Tally()
+            try:
+                start_gate.wait()
+                for user_id in ids:
+                    try:
+                        register_user(event.event_id, user_id)
+                        local['registered'] += 1
+                    except RegistrationError as e:
+                        local[type(e).__name__] += 1
+                    except Exception as e:  # lock timeouts etc. are part of the result
+                        local[f'error:{type(e).__name__}'] += 1
+            finally:
+                connections.close_all()
+                with lock:
+                    outcomes.update(local)
+
+        workers = [
+            threading.Thread(target=worker, args=(user_ids[i::threads],))
+            for i in range(threads)
+        ]
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        event.refresh_from_db()
+        stored = event.registration_count
+        actual = Registration.objects.filter(event_id=event.event_id).count()
+
+        self.stdout.write(f'backend:        {connection.vendor}')
+        self.stdout.write(f'threads:        {threads}')
+        self.stdout.write(f'attempts:       {attempts} in {elapsed:.2f}s ({attempts / elapsed:.0f} attempts/sec)')
+        self.stdout.write(f"registered:     {outcomes['registered']} ({outcomes['registered'] / elapsed:.0f} registrations/sec)")
+        for name, count in sorted(outcomes.items()):
+            if name != 'registered':
+                self.stdout.write(f'{name + ":":<16}{count}')
+        self.stdout.write(f'capacity:       {capacity}, stored count {stored}, actual rows {actual}')
+
+        overbooked = actual > capacity or stored != actual
+        if not options['keep']:
+            event.delete()
+            User.objects.filter(name__startswith=f'{tag}-').delete()
+
+        if overbooked:
+            raise CommandError('Overbooking detected!')
+        self.stdout.write(self.style.SUCCESS('No overbooking.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from stud.counters import find_registration_count_drift, repair_registration_counts
+
+
+class Command(BaseCommand):
+    help = 'Compare Event.registration_count with the registrations table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Overwrite drifted counts with the real value')
+
+    def handle(self, *args, **options):
+        drift = list(find_registration_count_drift())
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('All registration counts are consistent.'))
+            return
+
+        for event_id, stored, actual in drift:
+            self.stdout.write(f'event {event_id}: stored={stored} actual={actual}')
+
+        if options['fix']:
+            repair_registration_counts([event_id for event_id, _, _ in drift])
+            self.stdout.write(self.style.SUCCESS(f'Repaired {len(drift)} event(s).'))
+        else:
+            raise CommandError(f'{len(drift)} event(s) have drifted; rerun with --fix to repair.')
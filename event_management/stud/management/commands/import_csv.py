@@ -0,0 +1,51 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from stud.imports import IMPORT_CHUNK_SIZE, IMPORTERS, import_csv
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk import users, events or registrations from a CSV file. '
+        'users: roll_no,name,email,phone,dept_code,role_name; '
+        'events: title,description,category,venue,organizer_roll_no,start_datetime,end_datetime,capacity,status; '
+        'registrations: event_id,roll_no'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path', help='CSV file with a header row')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Run the full import in a transaction and roll it back')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument('--error-report', metavar='PATH',
+                            help='Write rejected rows (line, message) to this CSV file')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as stream:
+                report = import_csv(options['kind'], stream, dry_run=options['dry_run'],
+                                    chunk_size=options['chunk_size'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        if options['error_report']:
+            with open(options['error_report'], 'w', newline='') as out:
+                writer = csv.writer(out)
+                writer.writerow(['line', 'message'])
+                writer.writerows(report.errors)
+        else:
+            for line, message in report.errors[:50]:
+                self.stdout.write(f'line {line}: {message}')
+            if len(report.errors) > 50:
+                self.stdout.write(f'... {len(report.errors) - 50} more (use --error-report)')
+
+        prefix = '[dry run] ' if report.dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}{report.kind}: {report.created} created, {len(report.errors)} rejected, '
+            f'{report.rows} rows in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,134 @@
+import logging
+import platform
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from stud.counters import increment
+from stud.loadtest import (
+    DEFAULT_MIX, Fixtures, compare, load_results, parse_mix, run_load, save_results, serve_in_background, summarize,
+)
+from stud.models import Event, User
+
+from .loadtest_compare import print_comparison
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the site with a weighted scenario mix (dashboard, browse, '
+        'register, checkin) and report p50/p95/p99 latency and throughput per '
+        'URL name. Without --url the project is served in-process; with --url '
+        'the target server must use the same database, since fixtures are '
+        'seeded here. Results are written as JSON and can be compared against '
+        'a --baseline run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server (default: serve in-process)')
+        parser.add_argument('--duration', type=float, default=30.0, help='Measured seconds')
+        parser.add_argument('--warmup', type=float, default=2.0, help='Unmeasured seconds before the run')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--mix', default=','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items()),
+                            help='Scenario weights, e.g. dashboard=2,browse=4,register=2,checkin=2')
+        parser.add_argument('--users', type=int, default=500, help='Seeded users')
+        parser.add_argument('--events', type=int, default=4, help='Seeded events')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the scenario mix')
+        parser.add_argument('--output', help='Results file (default: loadtest-<timestamp>.json)')
+        parser.add_argument('--baseline', help='Compare against this earlier results file')
+        parser.add_argument('--threshold', type=float, default=10.0,
+                            help='Percent change in p95 or throughput counted as a regression')
+        parser.add_argument('--error-threshold', type=float, default=1.0,
+                            help='Rise in error rate, in percentage points, counted as a regression')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded events and users')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['concurrency'] < 1 or options['duration'] <= 0 or min(options['users'], options['events']) < 1:
+            raise CommandError('--concurrency, --duration, --users and --events must be positive')
+        baseline = load_results(options['baseline']) if options['baseline'] else None
+
+        tag = f'load-{uuid.uuid4().hex[:8]}'
+        fixtures = self.seed(tag, options['users'], options['events'], options['seed'])
+        server = None
+        try:
+            base_url = options['url']
+            if not base_url:
+                base_url, server = serve_in_background()
+                # One log line per request would drown the report (set after
+                # serve_in_background, whose django.setup() reapplies LOGGING).
+                if options['verbosity'] < 2:
+                    logging.getLogger('stud.timing').setLevel(logging.WARNING)
+            self.stdout.write(
+                f"{base_url}: {options['concurrency']} workers, {options['warmup']:g}s warm-up, "
+                f"{options['duration']:g}s measured, mix {mix}"
+            )
+            samples, elapsed = run_load(
+                base_url, fixtures, mix, options['concurrency'], options['duration'], options['warmup'], options['seed'],
+            )
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+            if not options['keep']:
+                self.cleanup(tag)
+
+        results = summarize(samples, elapsed, {
+            'started_at': timezone.now().isoformat(),
+            'url': options['url'] or 'in-process',
+            'backend': connection.vendor,
+            'python': platform.python_version(),
+            'concurrency': options['concurrency'],
+            'duration': options['duration'],
+            'mix': mix,
+            'users': options['users'],
+            'events': options['events'],
+        })
+        self.print_results(results)
+        output = options['output'] or f"loadtest-{timezone.now():%Y%m%d-%H%M%S}.json"
+        save_results(results, output)
+        self.stdout.write(f'results written to {output}')
+
+        if baseline is not None:
+            rows = compare(baseline, results, options['threshold'], options['error_threshold'])
+            if print_comparison(self, rows, options['threshold'], options['error_threshold']):
+                raise CommandError('Regression against baseline.')
+
+    def seed(self, tag, n_users, n_events, seed):
+        now = timezone.now()
+        User.objects.bulk_create(
+            [User(name=f'{tag}-{i}', roll_no=f'{tag}-{i}', created_at=now) for i in range(n_users)], batch_size=1000
+        )
+        Event.objects.bulk_create(
+            [Event(title=f'{tag}-{i}', capacity=n_users, start_datetime=now, created_at=now) for i in range(n_events)]
+        )
+        increment('users', n_users)
+        increment('events', n_events)
+        return Fixtures(
+            Event.objects.filter(title__startswith=f'{tag}-').values_list('event_id', flat=True),
+            User.objects.filter(name__startswith=f'{tag}-').values_list('user_id', flat=True),
+            seed,
+        )
+
+    def cleanup(self, tag):
+        # Deleted through the ORM so counters and the roster log stay consistent.
+        Event.objects.filter(title__startswith=f'{tag}-').delete()
+        User.objects.filter(name__startswith=f'{tag}-').delete()
+
+    def print_results(self, results):
+        self.stdout.write(
+            f'{"view":<22}{"count":>8}{"rps":>9}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"errors":>8}  statuses'
+        )
+        rows = list(results['views'].items()) + [('(overall)', results['overall'])]
+        for name, s in rows:
+            if not s['count']:
+                continue
+            statuses = ' '.join(f'{code}:{n}' for code, n in s['statuses'].items())
+            self.stdout.write(
+                f"{name:<22}{s['count']:>8}{s['rps']:>9.1f}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+                f"{s['p99_ms']:>10.1f}{s['errors']:>8}  {statuses}"
+            )
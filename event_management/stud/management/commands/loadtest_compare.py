@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from stud.loadtest import compare, load_results
+
+
+def _fmt(value, unit=''):
+    return '-' if value is None else f'{value:.1f}{unit}'
+
+
+def print_comparison(command, rows, threshold, error_threshold):
+    """Write a comparison table; returns True when any view regressed."""
+    command.stdout.write(
+        f'{"view":<22}{"p50 ms":>26}{"p95 ms":>26}{"p99 ms":>26}{"rps":>26}{"errors %":>26}'
+    )
+    regressed = False
+    for row in rows:
+        if 'missing' in row:
+            command.stdout.write(f"{row['view']:<22}(missing in {row['missing']} run)")
+            continue
+        cells = ''.join(
+            f"{_fmt(old) + ' -> ' + _fmt(new) + ' (' + _fmt(change, '%') + ')':>26}"
+            for old, new, change in (row['p50_ms'], row['p95_ms'], row['p99_ms'], row['rps'])
+        )
+        old, new, change = row['error_pct']
+        cells += f"{f'{old:.2f} -> {new:.2f} ({change:+.2f})':>26}"
+        line = f"{row['view']:<22}{cells}"
+        if row['regression']:
+            regressed = True
+            command.stdout.write(command.style.ERROR(line + '  REGRESSION'))
+        else:
+            command.stdout.write(line)
+    if not regressed:
+        command.stdout.write(command.style.SUCCESS(
+            f'No regressions beyond {threshold:g}% (errors: {error_threshold:g} points).'
+        ))
+    return regressed
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare two loadtest result files. Exits with an error when any view '
+        'got slower at p95 or lost throughput by more than --threshold percent, '
+        'or its error rate rose by more than --error-threshold percentage points.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('baseline')
+        parser.add_argument('current')
+        parser.add_argument('--threshold', type=float, default=10.0)
+        parser.add_argument('--error-threshold', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        try:
+            baseline, current = load_results(options['baseline']), load_results(options['current'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read results: {e}')
+        rows = compare(baseline, current, options['threshold'], options['error_threshold'])
+        if print_comparison(self, rows, options['threshold'], options['error_threshold']):
+            raise CommandError('Regression against baseline.')
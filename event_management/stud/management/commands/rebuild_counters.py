@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from stud.counters import COUNTED_MODELS, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard counters from the underlying tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*',
+                            help=f"Counters to rebuild (default: all of {', '.join(COUNTED_MODELS)})")
+
+    def handle(self, *args, **options):
+        unknown = set(options['names']) - set(COUNTED_MODELS)
+        if unknown:
+            raise CommandError(f"Unknown counter(s): {', '.join(sorted(unknown))}")
+        totals = rebuild(options['names'] or None)
+        for name, value in sorted(totals.items()):
+            self.stdout.write(f'{name}: {value}')
+        self.stdout.write(self.style.SUCCESS('Counters rebuilt.'))
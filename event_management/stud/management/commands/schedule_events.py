@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from stud.scheduler import parse_options, schedule
+
+
+class Command(BaseCommand):
+    help = (
+        'Assign venues and start times to events that have no venue. An '
+        "event's start/end are its preferred window; --window-start/--window-end "
+        'cover events without times. Respects venue capacity, existing bookings '
+        'and resource allocations, and writes everything in one transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', dest='event_ids', help='Comma-separated event ids (default: all unvenued)')
+        parser.add_argument('--window-start', help='Default window start (ISO datetime)')
+        parser.add_argument('--window-end', help='Default window end (ISO datetime)')
+        parser.add_argument('--duration', dest='duration_minutes', type=int,
+                            help="Minutes per event (default: the length of the event's own window)")
+        parser.add_argument('--step', dest='step_minutes', type=int, default=30,
+                            help='Start-time granularity in minutes')
+        parser.add_argument('--day-start', help='Earliest start each day, HH:MM')
+        parser.add_argument('--day-end', help='Latest end each day, HH:MM')
+        parser.add_argument('--dry-run', action='store_true', help='Report the plan without saving it')
+
+    def handle(self, *args, **options):
+        try:
+            kwargs = parse_options(options)
+        except ValueError as e:
+            raise CommandError(str(e))
+        started = time.perf_counter()
+        report = schedule(**kwargs)
+        elapsed = time.perf_counter() - started
+
+        if options['verbosity'] >= 2:
+            for row in report['placed']:
+                self.stdout.write(
+                    f"  #{row['event_id']} {row['title']}: {row['venue']} "
+                    f"{row['start_datetime']:%Y-%m-%d %H:%M}-{row['end_datetime']:%H:%M}"
+                )
+        for row in report['unplaced']:
+            self.stdout.write(self.style.WARNING(f"  not placed #{row['event_id']} {row['title']}: {row['reason']}"))
+        prefix = 'Dry run: ' if report['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{len(report['placed'])} placed, {len(report['unplaced'])} not placed in {elapsed:.2f}s"
+        ))
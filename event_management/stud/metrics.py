@@ -0,0 +1,93 @@
+"""
+Prometheus metrics.
+
+Request metrics are observed by ``stud.timing.ServerTimingMiddleware``, which
+already measures total and SQL time per request; they are labelled by URL
+name (``registration_list``, ``event-list`` for API routes) so cardinality
+stays bounded.
+
+Under gunicorn every worker is a separate process. When the
+``PROMETHEUS_MULTIPROC_DIR`` environment variable is set (gunicorn.conf.py
+sets it before forking), prometheus_client writes each worker's samples to
+memory-mapped files in that directory and ``render`` merges them, so
+``/metrics`` returns the same totals whichever worker serves it.
+
+Connection pool metrics (stud.pooling) are labelled by database alias; the
+pool gauges are summed over live workers.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess,
+)
+
+UNRESOLVED = '<unresolved>'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUEST_LATENCY = Histogram(
+    'stud_http_request_duration_seconds', 'Request latency by view',
+    ['view', 'method', 'status'], buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    'stud_http_request_db_seconds', 'Time spent in SQL per request',
+    ['view'], buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    'stud_http_response_size_bytes', 'Response body size (non-streaming responses)',
+    ['view'], buckets=SIZE_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'stud_http_requests_in_progress', 'Requests currently being handled',
+    ['method'], multiprocess_mode='livesum',
+)
+PROCEDURE_CALLS = Counter(
+    'stud_procedure_calls_total', 'Outcomes of call_register_user_for_event / call_mark_attendance',
+    ['procedure', 'outcome'],
+)
+POOL_WAIT = Histogram(
+    'stud_db_pool_wait_seconds', 'Time to check a connection out of the pool (includes connecting when it grows)',
+    ['database'], buckets=(0.0005, 0.001, 0.0025) + LATENCY_BUCKETS,
+)
+POOL_CHECKOUTS = Counter(
+    'stud_db_pool_checkouts_total', 'Connection checkouts by outcome (ok, timeout, error)',
+    ['database', 'outcome'],
+)
+POOL_CONNECTIONS = Gauge(
+    'stud_db_pool_connections', 'Open pooled connections by state (idle, in_use)',
+    ['database', 'state'], multiprocess_mode='livesum',
+)
+
+
+def observe_request(view, method, status, duration, db_time, size=None):
+    view = view or UNRESOLVED
+    REQUEST_LATENCY.labels(view, method, str(status)).observe(duration)
+    REQUEST_DB_TIME.labels(view).observe(db_time)
+    if size is not None:
+        RESPONSE_SIZE.labels(view).observe(size)
+
+
+def count_procedure_call(procedure, outcome):
+    PROCEDURE_CALLS.labels(procedure, outcome).inc()
+
+
+def observe_pool_checkout(database, wait, outcome):
+    POOL_WAIT.labels(database).observe(wait)
+    POOL_CHECKOUTS.labels(database, outcome).inc()
+
+
+def set_pool_connections(database, size, idle):
+    POOL_CONNECTIONS.labels(database, 'idle').set(idle)
+    POOL_CONNECTIONS.labels(database, 'in_use').set(size - idle)
+
+
+def render():
+    """Return (body, content type) for the exposition endpoint."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 01:52
+
+from django.db import migrations, models
+
+
+COUNTED_MODELS = {
+    'events': 'Event',
+    'users': 'User',
+    'venues': 'Venue',
+    'registrations': 'Registration',
+}
+
+
+def seed_counters(apps, schema_editor):
+    db = schema_editor.connection.alias
+    Counter = apps.get_model('stud', 'Counter')
+    for name, model_name in COUNTED_MODELS.items():
+        model = apps.get_model('stud', model_name)
+        Counter.objects.using(db).update_or_create(name=name, defaults={'value': model.objects.using(db).count()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0002_create_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Counter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'counters',
+                'managed': True,
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_registration_count(apps, schema_editor):
+    Event = apps.get_model('stud', 'Event')
+    Registration = apps.get_model('stud', 'Registration')
+    db = schema_editor.connection.alias
+    counts = (
+        Registration.objects.using(db).filter(event_id=OuterRef('event_id'))
+        .order_by().values('event_id').annotate(n=Count('reg_id')).values('n')
+    )
+    Event.objects.using(db).update(registration_count=Coalesce(Subquery(counts), 0))
+
+
+DROP_VIEWS = """
+    DROP VIEW IF EXISTS vw_event_details;
+    DROP VIEW IF EXISTS vw_user_registrations;
+    DROP VIEW IF EXISTS vw_event_registration_summary;
+"""
+
+CREATE_DETAIL_VIEWS = """
+    CREATE VIEW vw_event_details AS
+    SELECT
+        e.event_id,
+        e.title,
+        e.description,
+        e.start_datetime,
+        e.end_datetime,
+        e.status,
+        e.capacity,
+        c.name AS category_name,
+        v.name AS venue_name,
+        v.location AS venue_location,
+        u.name AS organizer_name,
+        d.dept_name AS organizer_department
+    FROM events e
+    LEFT JOIN categories c ON e.category_id = c.category_id
+    LEFT JOIN venues v ON e.venue_id = v.venue_id
+    LEFT JOIN users u ON e.organizer_id = u.user_id
+    LEFT JOIN departments d ON u.dept_id = d.dept_id;
+
+    CREATE VIEW vw_user_registrations AS
+    SELECT
+        r.reg_id,
+        u.user_id,
+        u.name AS user_name,
+        u.roll_no,
+        u.email,
+        e.event_id,
+        e.title AS event_title,
+        e.start_datetime,
+        e.end_datetime,
+        r.status AS registration_status,
+        r.registered_at
+    FROM registrations r
+    JOIN users u ON r.user_id = u.user_id
+    JOIN events e ON r.event_id = e.event_id;
+"""
+
+# Served from the stored count instead of a GROUP BY over every registration.
+CREATE_SUMMARY_VIEW = """
+    CREATE VIEW vw_event_registration_summary AS
+    SELECT
+        e.event_id,
+        e.title,
+        e.capacity,
+        e.registration_count AS total_registrations,
+        COALESCE(e.capacity - e.registration_count, 0) AS remaining_seats
+    FROM events e;
+"""
+
+CREATE_LEGACY_SUMMARY_VIEW = """
+    CREATE VIEW vw_event_registration_summary AS
+    SELECT
+        e.event_id,
+        e.title,
+        e.capacity,
+        COUNT(r.reg_id) AS total_registrations,
+        COALESCE(e.capacity - COUNT(r.reg_id), 0) AS remaining_seats
+    FROM events e
+    LEFT JOIN registrations r ON e.event_id = r.event_id
+    GROUP BY e.event_id, e.title, e.capacity;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0003_counter'),
+    ]
+
+    operations = [
+        # Views are dropped around the ALTER so backends that rebuild the
+        # table (SQLite) do not trip over dependent views.
+        migrations.RunSQL(DROP_VIEWS, CREATE_DETAIL_VIEWS + CREATE_LEGACY_SUMMARY_VIEW),
+        migrations.AddField(
+            model_name='event',
+            name='registration_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_registration_count, migrations.RunPython.noop),
+        migrations.RunSQL(CREATE_DETAIL_VIEWS + CREATE_SUMMARY_VIEW, DROP_VIEWS),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 01:56
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0004_event_registration_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RosterChange',
+            fields=[
+                ('change_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('event_id', models.IntegerField()),
+                ('user_id', models.IntegerField()),
+                ('action', models.CharField(choices=[('add', 'Add'), ('remove', 'Remove')], max_length=10)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'roster_changes',
+                'managed': True,
+                'indexes': [models.Index(fields=['event_id', 'change_id'], name='roster_changes_event_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:02
+
+import importlib
+
+from django.db import migrations, models
+
+# SQLite rebuilds a table to alter a column, which fails while views reference it.
+views = importlib.import_module('stud.migrations.0004_event_registration_count')
+
+EVENT_STATUSES = ['scheduled', 'ongoing', 'completed', 'cancelled']
+REGISTRATION_STATUSES = ['confirmed', 'waitlisted', 'cancelled']
+
+
+def normalize_statuses(apps, schema_editor):
+    """Map NULL/legacy values onto the choices before the NOT NULL + CHECK."""
+    Event = apps.get_model('stud', 'Event')
+    Registration = apps.get_model('stud', 'Registration')
+    db = schema_editor.connection.alias
+    Event.objects.using(db).exclude(status__in=EVENT_STATUSES).update(status='scheduled')
+    Event.objects.using(db).filter(status__isnull=True).update(status='scheduled')
+    Registration.objects.using(db).exclude(status__in=REGISTRATION_STATUSES).update(status='confirmed')
+    Registration.objects.using(db).filter(status__isnull=True).update(status='confirmed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0005_roster_change'),
+    ]
+
+    operations = [
+        migrations.RunSQL(views.DROP_VIEWS, views.CREATE_DETAIL_VIEWS + views.CREATE_SUMMARY_VIEW),
+        migrations.RunPython(normalize_statuses, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='event',
+            name='status',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('ongoing', 'Ongoing'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='scheduled', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='registration',
+            name='status',
+            field=models.CharField(choices=[('confirmed', 'Confirmed'), ('waitlisted', 'Waitlisted'), ('cancelled', 'Cancelled')], default='confirmed', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['event', 'present'], name='attendance_event_present_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['checked_at'], name='attendance_checked_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_datetime', 'event_id'], name='events_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'start_datetime'], name='events_status_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status', 'scheduled')), fields=['start_datetime'], name='events_upcoming_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['registered_at', 'reg_id'], name='registrations_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['status', 'event'], name='registrations_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['roll_no'], name='users_roll_no_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email'], name='users_email_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.CheckConstraint(condition=models.Q(('status__in', ['scheduled', 'ongoing', 'completed', 'cancelled'])), name='events_status_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='registration',
+            constraint=models.CheckConstraint(condition=models.Q(('status__in', ['confirmed', 'waitlisted', 'cancelled'])), name='registrations_status_valid'),
+        ),
+        migrations.RunSQL(views.CREATE_DETAIL_VIEWS + views.CREATE_SUMMARY_VIEW, views.DROP_VIEWS),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0006_indexes_and_status_choices'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['end_datetime', 'start_datetime'], name='events_window_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0007_event_window_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['venue', 'end_datetime', 'start_datetime'], name='events_venue_window_idx'),
+        ),
+    ]
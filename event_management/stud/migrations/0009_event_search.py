@@ -0,0 +1,69 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:21
+
+import importlib
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+
+# SQLite rebuilds a table to add a NOT NULL column, which fails while views reference it.
+views = importlib.import_module('stud.migrations.0004_event_registration_count')
+
+# Must stay identical to stud.search.PG_DOCUMENT (without the table prefix).
+PG_CREATE_INDEX = """
+    CREATE INDEX events_search_idx ON events USING GIN ((
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(search_tags, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ))
+"""
+MYSQL_CREATE_INDEX = 'CREATE FULLTEXT INDEX events_search_ft ON events (title, description, search_tags)'
+
+
+def populate_search_tags(apps, schema_editor):
+    Event = apps.get_model('stud', 'Event')
+    Category = apps.get_model('stud', 'Category')
+    Venue = apps.get_model('stud', 'Venue')
+    db = schema_editor.connection.alias
+    category = Category.objects.filter(category_id=OuterRef('category_id')).values('name')[:1]
+    venue = Venue.objects.filter(venue_id=OuterRef('venue_id')).values('name')[:1]
+    Event.objects.using(db).update(search_tags=Concat(
+        Coalesce(Subquery(category), Value('')), Value(' '), Coalesce(Subquery(venue), Value('')),
+        output_field=models.CharField(),
+    ))
+
+
+def create_search_index(apps, schema_editor):
+    # Neither index can be expressed in Meta.indexes; other backends search with LIKE.
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(PG_CREATE_INDEX)
+    elif vendor == 'mysql':
+        schema_editor.execute(MYSQL_CREATE_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS events_search_idx')
+    elif vendor == 'mysql':
+        schema_editor.execute('DROP INDEX events_search_ft ON events')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0008_event_venue_window_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(views.DROP_VIEWS, views.CREATE_DETAIL_VIEWS + views.CREATE_SUMMARY_VIEW),
+        migrations.AddField(
+            model_name='event',
+            name='search_tags',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_search_tags, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunSQL(views.CREATE_DETAIL_VIEWS + views.CREATE_SUMMARY_VIEW, views.DROP_VIEWS),
+    ]
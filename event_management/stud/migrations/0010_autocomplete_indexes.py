@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:30
+
+from django.db import migrations, models
+
+# istartswith compiles to UPPER("col"::text) LIKE UPPER(...) on PostgreSQL,
+# which a plain B-tree cannot serve; trigram indexes on that expression can.
+PG_TRIGRAM_INDEXES = {
+    'users_name_trgm_idx': ('users', 'name'),
+    'users_roll_no_trgm_idx': ('users', 'roll_no'),
+    'users_email_trgm_idx': ('users', 'email'),
+    'events_title_trgm_idx': ('events', 'title'),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, (table, column) in PG_TRIGRAM_INDEXES.items():
+        schema_editor.execute(f'CREATE INDEX {name} ON {table} USING GIN ((UPPER({column}::text)) gin_trgm_ops)')
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in PG_TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0009_event_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['name'], name='users_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['title'], name='events_title_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
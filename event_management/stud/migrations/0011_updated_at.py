@@ -0,0 +1,100 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:38
+
+import importlib
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+# SQLite rebuilds a table to add a NOT NULL column, which fails while views reference it.
+views = importlib.import_module('stud.migrations.0004_event_registration_count')
+
+# Best existing guess at when each row last changed; the rest keep the migration time.
+BACKFILL_FROM = {
+    'Role': 'created_at',
+    'Department': 'created_at',
+    'User': 'created_at',
+    'Event': 'created_at',
+    'Registration': 'registered_at',
+    'Attendance': 'checked_at',
+}
+
+
+def backfill_updated_at(apps, schema_editor):
+    db = schema_editor.connection.alias
+    for model_name, source in BACKFILL_FROM.items():
+        model = apps.get_model('stud', model_name)
+        model.objects.using(db).filter(**{f'{source}__isnull': False}).update(updated_at=F(source))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0010_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(views.DROP_VIEWS, views.CREATE_DETAIL_VIEWS + views.CREATE_SUMMARY_VIEW),
+        migrations.AddField(
+            model_name='role',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='registration',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='eventresource',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.RunSQL(views.CREATE_DETAIL_VIEWS + views.CREATE_SUMMARY_VIEW, views.DROP_VIEWS),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:10
+
+import importlib
+
+from django.db import migrations, models
+from django.db.models import Max
+
+# SQLite rebuilds a table to add a NOT NULL column, which fails while views reference it.
+views = importlib.import_module('stud.migrations.0004_event_registration_count')
+
+
+def backfill_versions(apps, schema_editor):
+    """Existing changes keep their change_id as version, so kiosks' cursors stay valid."""
+    Event = apps.get_model('stud', 'Event')
+    RosterChange = apps.get_model('stud', 'RosterChange')
+    db = schema_editor.connection.alias
+    RosterChange.objects.using(db).update(version=models.F('change_id'))
+    latest = RosterChange.objects.using(db).values('event_id').annotate(v=Max('change_id')).values_list('event_id', 'v')
+    for event_id, version in latest:
+        Event.objects.using(db).filter(event_id=event_id).update(roster_version=version)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0011_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunSQL(views.DROP_VIEWS, views.CREATE_DETAIL_VIEWS + views.CREATE_SUMMARY_VIEW),
+        migrations.AddField(
+            model_name='event',
+            name='roster_version',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rosterchange',
+            name='version',
+            field=models.BigIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_versions, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='rosterchange',
+            name='roster_changes_event_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='rosterchange',
+            constraint=models.UniqueConstraint(fields=['event_id', 'version'], name='roster_changes_event_version_uniq'),
+        ),
+        migrations.RunSQL(views.CREATE_DETAIL_VIEWS + views.CREATE_SUMMARY_VIEW, views.DROP_VIEWS),
+    ]
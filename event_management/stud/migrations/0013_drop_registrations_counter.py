@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:20
+
+from django.db import migrations
+
+
+def drop_counter(apps, schema_editor):
+    # The dashboard now sums events.registration_count instead (stud/counters.py).
+    Counter = apps.get_model('stud', 'Counter')
+    Counter.objects.using(schema_editor.connection.alias).filter(name='registrations').delete()
+
+
+def restore_counter(apps, schema_editor):
+    db = schema_editor.connection.alias
+    Counter = apps.get_model('stud', 'Counter')
+    Registration = apps.get_model('stud', 'Registration')
+    Counter.objects.using(db).update_or_create(
+        name='registrations', defaults={'value': Registration.objects.using(db).count()}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stud', '0012_roster_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_counter, restore_counter),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:15
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Stop tracking events_upcoming_idx in Event.Meta, where its condition made
+    models.W037 fire on MySQL. The index 0006 created stays as it is: partial
+    where supported, plain on MySQL (see UPCOMING_EVENTS_INDEX in models.py).
+    """
+
+    dependencies = [
+        ('stud', '0013_drop_registrations_counter'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(model_name='event', name='events_upcoming_idx'),
+            ],
+        ),
+    ]
@@ -1,10 +1,13 @@
-from django.db import models, connection
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 
 class Role(models.Model):
     role_id = models.AutoField(primary_key=True)
     role_name = models.CharField(unique=True, max_length=30)
     description = models.CharField(max_length=200, blank=True, null=True)
     created_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.role_name
@@ -20,6 +23,7 @@ class Department(models.Model):
     dept_code = models.CharField(unique=True, max_length=20)
     hod_name = models.CharField(max_length=150, blank=True, null=True)
     created_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.dept_name
@@ -39,6 +43,7 @@ class User(models.Model):
     role = models.ForeignKey(Role, on_delete=models.SET_NULL, blank=True, null=True, db_column='role_id', related_name='users')
     dept = models.ForeignKey(Department, on_delete=models.SET_NULL, blank=True, null=True, db_column='dept_id', related_name='users')
     created_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -46,6 +51,12 @@ class User(models.Model):
     class Meta:
         managed = True
         db_table = 'users'
+        indexes = [
+            models.Index(fields=['roll_no'], name='users_roll_no_idx'),
+            models.Index(fields=['email'], name='users_email_idx'),
+            # autocomplete prefix lookups (stud/autocomplete.py)
+            models.Index(fields=['name'], name='users_name_idx'),
+        ]
 
 
 class Venue(models.Model):
@@ -53,6 +64,7 @@ class Venue(models.Model):
     name = models.CharField(max_length=150)
     location = models.CharField(max_length=255, blank=True, null=True)
     capacity = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -68,6 +80,7 @@ class Category(models.Model):
     description = models.CharField(max_length=200, blank=True, null=True)
     icon = models.CharField(max_length=50, blank=True, null=True)
     active_status = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -77,7 +90,25 @@ class Category(models.Model):
         db_table = 'categories'
 
 
+class EventStatus(models.TextChoices):
+    SCHEDULED = 'scheduled', 'Scheduled'
+    ONGOING = 'ongoing', 'Ongoing'
+    COMPLETED = 'completed', 'Completed'
+    CANCELLED = 'cancelled', 'Cancelled'
+
+
+# Dashboard "upcoming" lookups. Partial where supported; MySQL has no partial
+# indexes and builds it as a plain index on start_datetime. It is created by
+# migration 0006 and kept out of Event.Meta.indexes so that models.W037 does
+# not fire for it on MySQL (stud/migrations/0014_upcoming_index_out_of_meta.py).
+UPCOMING_EVENTS_INDEX = models.Index(
+    fields=['start_datetime'], condition=Q(status=EventStatus.SCHEDULED), name='events_upcoming_idx',
+)
+
+
 class Event(models.Model):
+    Status = EventStatus
+
     event_id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
@@ -87,23 +118,62 @@ class Event(models.Model):
     start_datetime = models.DateTimeField(blank=True, null=True)
     end_datetime = models.DateTimeField(blank=True, null=True)
     capacity = models.IntegerField(blank=True, null=True)
-    status = models.CharField(max_length=20, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.SCHEDULED)
     created_at = models.DateTimeField(blank=True, null=True)
+    # Denormalized COUNT of registrations, kept in sync by stud/signals.py
+    registration_count = models.IntegerField(default=0)
+    # Category and venue names for full-text search (stud/search.py), kept in sync by stud/signals.py
+    search_tags = models.CharField(max_length=255, blank=True, default='', editable=False)
+    # Roster version for check-in kiosks, bumped under this row's lock by stud/kiosk.py
+    roster_version = models.BigIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
 
+    @property
+    def remaining_seats(self):
+        # Same semantics as vw_event_registration_summary.remaining_seats
+        if self.capacity is None:
+            return 0
+        return self.capacity - self.registration_count
+
     class Meta:
         managed = True
         db_table = 'events'
+        indexes = [
+            # event_list keyset order and date-range scans
+            models.Index(fields=['start_datetime', 'event_id'], name='events_start_idx'),
+            # time-window overlap lookups (stud/availability.py): end > :start is the selective bound
+            models.Index(fields=['end_datetime', 'start_datetime'], name='events_window_idx'),
+            # venue conflict checks and free-slot search (stud/venues.py)
+            models.Index(fields=['venue', 'end_datetime', 'start_datetime'], name='events_venue_window_idx'),
+            # admin status filter
+            models.Index(fields=['status', 'start_datetime'], name='events_status_start_idx'),
+            # dashboard "upcoming": UPCOMING_EVENTS_INDEX, created by migrations only
+            # autocomplete title prefix lookups (stud/autocomplete.py)
+            models.Index(fields=['title'], name='events_title_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=Q(status__in=EventStatus.values), name='events_status_valid'),
+        ]
+
+
+class RegistrationStatus(models.TextChoices):
+    CONFIRMED = 'confirmed', 'Confirmed'
+    WAITLISTED = 'waitlisted', 'Waitlisted'
+    CANCELLED = 'cancelled', 'Cancelled'
 
 
 class Registration(models.Model):
+    Status = RegistrationStatus
+
     reg_id = models.AutoField(primary_key=True)
     event = models.ForeignKey(Event, on_delete=models.CASCADE, db_column='event_id', related_name='registrations')
     user = models.ForeignKey(User, on_delete=models.CASCADE, db_column='user_id', related_name='registrations')
     registered_at = models.DateTimeField(blank=True, null=True)
-    status = models.CharField(max_length=20, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.CONFIRMED)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user} -> {self.event}"
@@ -112,6 +182,15 @@ class Registration(models.Model):
         managed = True
         db_table = 'registrations'
         unique_together = (('event', 'user'),)
+        indexes = [
+            # registration_list keyset order and "recent registrations"
+            models.Index(fields=['registered_at', 'reg_id'], name='registrations_recent_idx'),
+            # admin status filter
+            models.Index(fields=['status', 'event'], name='registrations_status_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=Q(status__in=RegistrationStatus.values), name='registrations_status_valid'),
+        ]
 
 
 class Attendance(models.Model):
@@ -120,6 +199,7 @@ class Attendance(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, db_column='user_id')
     present = models.BooleanField(default=False)
     checked_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user} @ {self.event}: {self.present}"
@@ -128,12 +208,19 @@ class Attendance(models.Model):
         managed = True
         db_table = 'attendance'
         unique_together = (('event', 'user'),)
+        indexes = [
+            # present/absent conditional aggregate per event, index-only
+            models.Index(fields=['event', 'present'], name='attendance_event_present_idx'),
+            # exports by date range
+            models.Index(fields=['checked_at'], name='attendance_checked_at_idx'),
+        ]
 
 
 class Resource(models.Model):
     resource_id = models.AutoField(primary_key=True)
     resource_name = models.CharField(unique=True, max_length=100)
     total_quantity = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.resource_name
@@ -148,6 +235,7 @@ class EventResource(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, db_column='event_id', related_name='event_resources')
     resource = models.ForeignKey(Resource, on_delete=models.CASCADE, db_column='resource_id')
     quantity_required = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.event} uses {self.resource} x{self.quantity_required}"
@@ -157,6 +245,47 @@ class EventResource(models.Model):
         db_table = 'event_resources'
 
 
+class Counter(models.Model):
+    """Running totals kept up to date by signals (see stud/counters.py)"""
+    name = models.CharField(primary_key=True, max_length=50)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
+
+    class Meta:
+        managed = True
+        db_table = 'counters'
+
+
+class RosterChange(models.Model):
+    """
+    Append-only log of registration adds/removes per event. ``version`` is
+    the roster version that check-in kiosks sync from (see stud/kiosk.py).
+    Plain integer columns so the log can outlive the rows it describes.
+    """
+    ADD = 'add'
+    REMOVE = 'remove'
+
+    change_id = models.BigAutoField(primary_key=True)
+    event_id = models.IntegerField()
+    user_id = models.IntegerField()
+    # Event.roster_version after this change; increases in commit order per event.
+    version = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=[(ADD, 'Add'), (REMOVE, 'Remove')])
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"v{self.version} {self.action} user {self.user_id} @ event {self.event_id}"
+
+    class Meta:
+        managed = True
+        db_table = 'roster_changes'
+        constraints = [
+            models.UniqueConstraint(fields=['event_id', 'version'], name='roster_changes_event_version_uniq'),
+        ]
+
+
 # ============================================================
 # VIEWS - Read-only models for database views
 # ============================================================
@@ -218,20 +347,49 @@ class EventRegistrationSummaryView(models.Model):
 # ============================================================
 
 def call_register_user_for_event(event_id, user_id):
-    """Call stored procedure: sp_register_user_for_event"""
-    with connection.cursor() as cursor:
-        try:
-            cursor.callproc('sp_register_user_for_event', [event_id, user_id])
-            return {'success': True, 'message': 'User registered successfully'}
-        except Exception as e:
-            return {'success': False, 'message': str(e)}
+    """
+    Register a user through the ORM seat reservation engine (replaces the
+    sp_register_user_for_event procedure, which the migrations never create).
+    """
+    from .metrics import count_procedure_call
+    from .registrations import RegistrationError, register_user
+    from .routers import use_primary
+
+    try:
+        with use_primary():
+            register_user(int(event_id), int(user_id))
+    except (TypeError, ValueError):
+        count_procedure_call('register_user_for_event', 'invalid')
+        return {'success': False, 'message': 'Select an event and a user'}
+    except RegistrationError as e:
+        count_procedure_call('register_user_for_event', e.outcome)
+        return {'success': False, 'message': str(e)}
+    count_procedure_call('register_user_for_event', 'success')
+    return {'success': True, 'message': 'User registered successfully'}
 
 
 def call_mark_attendance(event_id, user_id, present):
-    """Call stored procedure: sp_mark_attendance"""
-    with connection.cursor() as cursor:
-        try:
-            cursor.callproc('sp_mark_attendance', [event_id, user_id, present])
-            return {'success': True, 'message': 'Attendance marked successfully'}
-        except Exception as e:
-            return {'success': False, 'message': str(e)}
\ No newline at end of file
+    """
+    Insert or update one attendance row with an upsert on (event, user)
+    (replaces the sp_mark_attendance procedure, which the migrations never create).
+    """
+    from .attendance import upsert_attendance
+    from .metrics import count_procedure_call
+    from .routers import use_primary
+
+    try:
+        event_id, user_id = int(event_id), int(user_id)
+    except (TypeError, ValueError):
+        count_procedure_call('mark_attendance', 'invalid')
+        return {'success': False, 'message': 'Select an event and a user'}
+    # The existence checks must not miss rows a replica has not caught up with.
+    with use_primary():
+        if not Event.objects.filter(event_id=event_id).exists():
+            count_procedure_call('mark_attendance', 'not_found')
+            return {'success': False, 'message': f'Event {event_id} does not exist'}
+        if not User.objects.filter(user_id=user_id).exists():
+            count_procedure_call('mark_attendance', 'not_found')
+            return {'success': False, 'message': f'User {user_id} does not exist'}
+        upsert_attendance([Attendance(event_id=event_id, user_id=user_id, present=present, checked_at=timezone.now())])
+    count_procedure_call('mark_attendance', 'success')
+    return {'success': True, 'message': 'Attendance marked successfully'}
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Generation-versioned page cache and HTTP validators for the list pages.
+
+Every model has a generation in the ``page_generations`` cache: a random
+token plus the time it was set. It is replaced whenever a row of that model
+is saved or deleted (stud/signals.py) or written in bulk (``bump`` in the
+bulk paths), once the transaction commits. A cached page's key includes the
+tokens of every model it shows, so a write makes the old entries
+unreachable instead of deleting them; they age out of the size-bounded
+``pages`` cache. The default LocMem backend evicts the least recently used
+pages; with ``PAGE_CACHE_BACKEND=file`` eviction is not LRU, as Django's
+file cache culls an arbitrary fraction of its entries when full.
+
+The same generations give every list page and API endpoint an ETag (hash
+of the path, Accept header and tokens) and a Last-Modified (latest bump),
+so ``conditional_page`` and ``not_modified`` answer If-None-Match /
+If-Modified-Since with 304 before any query or rendering.
+
+A hit costs one ``get_many`` for the tokens and one ``get`` for the page:
+no database query and no template rendering. Tokens are replaced rather
+than incremented, so concurrent bumps in different processes can never
+land on a value a page was already cached under.
+
+Both decorators accept sync and async views; for async views the cache
+and session lookups run in a worker thread.
+
+Requests carrying flash messages bypass both so the messages are shown and
+consumed as usual. While a request reads from a replica (stud/routers.py)
+and a generation is younger than ``REPLICA_STICKY_SECONDS``, the replica
+may not have the write yet: such responses are neither cached nor given
+validators, so a stale page is never stored under the new generation.
+"""
+
+import hashlib
+import time
+import uuid
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .routers import reading_from_replica
+
+PAGES = 'pages'
+GENERATIONS = 'page_generations'
+
+
+def _generation_key(model):
+    return f'page-generation:{model._meta.label_lower}'
+
+
+def _new_generation():
+    return uuid.uuid4().hex[:16], int(time.time())
+
+
+def generations(models):
+    """Current ``(token, modified)`` of ``models``, creating any that are missing."""
+    store = caches[GENERATIONS]
+    keys = [_generation_key(model) for model in models]
+    found = store.get_many(keys)
+    for key in keys:
+        if key not in found:
+            store.add(key, _new_generation())
+            found[key] = store.get(key)
+    return [found[key] for key in keys]
+
+
+def bump(*models):
+    """Invalidate every cached page and validator of ``models`` once the transaction commits."""
+    def replace_generations():
+        caches[GENERATIONS].set_many({_generation_key(model): _new_generation() for model in models})
+    transaction.on_commit(replace_generations)
+
+
+def _bypass(request):
+    return request.method not in ('GET', 'HEAD') or len(messages.get_messages(request))
+
+
+def replica_may_lag(current):
+    # ``modified`` is truncated to whole seconds, hence the extra one.
+    newest = max(modified for _, modified in current)
+    return reading_from_replica() and time.time() - newest < settings.REPLICA_STICKY_SECONDS + 1
+
+
+def validators(request, models):
+    """``(etag, last_modified)`` for the response to ``request`` showing ``models``."""
+    current = generations(models)
+    tokens = '-'.join(token for token, _ in current)
+    digest = hashlib.md5(
+        f'{request.get_full_path()}|{request.headers.get("Accept", "")}|{tokens}'.encode()
+    ).hexdigest()
+    return quote_etag(digest), max(modified for _, modified in current)
+
+
+def set_validators(response, etag, last_modified):
+    if etag is None:
+        return response
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Revalidate every time rather than trusting heuristic freshness.
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def not_modified(request, models):
+    """
+    ``(response, etag, last_modified)``: ``response`` is a 304 when the
+    client's copy is current, else None and the caller should render and
+    ``set_validators``. All three are None while a replica may lag.
+    """
+    if replica_may_lag(generations(models)):
+        return None, None, None
+    etag, last_modified = validators(request, models)
+    return get_conditional_response(request, etag=etag, last_modified=last_modified), etag, last_modified
+
+
+def _precondition(request, models):
+    """``(bypass, response, etag, last_modified)`` for ``conditional_page``."""
+    if _bypass(request):
+        return True, None, None, None
+    return (False, *not_modified(request, models))
+
+
+def conditional_page(*models):
+    """Answer conditional GET/HEAD for the decorated view from the generations of ``models``."""
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                bypass, response, etag, last_modified = await sync_to_async(_precondition)(request, models)
+                if bypass:
+                    return await view(request, *args, **kwargs)
+                if response is not None:
+                    return response
+                response = await view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    set_validators(response, etag, last_modified)
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            bypass, response, etag, last_modified = _precondition(request, models)
+            if bypass:
+                return view(request, *args, **kwargs)
+            if response is not None:
+                return response
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                set_validators(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
+
+
+def _lookup(request, view, models):
+    """``(key, cached_response, generations)``; key is None when the request bypasses the cache."""
+    if _bypass(request):
+        return None, None, None
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    current = generations(models)
+    tokens = '-'.join(token for token, _ in current)
+    key = f'page:{view.__module__}.{view.__name__}:{path}:{tokens}'
+    cached = caches[PAGES].get(key)
+    if cached is None:
+        return key, None, current
+    content, content_type = cached
+    return key, HttpResponse(content, content_type=content_type), current
+
+
+def _store(key, response, current):
+    if (response.status_code == 200 and not response.streaming and not response.cookies
+            and not replica_may_lag(current)):
+        caches[PAGES].set(key, (response.content, response['Content-Type']))
+
+
+def cache_page(*models):
+    """
+    Serve GET/HEAD responses of the decorated view from the page cache,
+    keyed on the full path and the generations of ``models``.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                key, cached, current = await sync_to_async(_lookup)(request, view, models)
+                if cached is not None:
+                    return cached
+                response = await view(request, *args, **kwargs)
+                if key is not None:
+                    await sync_to_async(_store)(key, response, current)
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key, cached, current = _lookup(request, view, models)
+            if cached is not None:
+                return cached
+            response = view(request, *args, **kwargs)
+            if key is not None:
+                _store(key, response, current)
+            return response
+        return wrapper
+    return decorator
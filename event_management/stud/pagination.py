@@ -0,0 +1,231 @@
+"""
+Keyset (cursor) pagination for the list pages.
+
+Pages are fetched with ``WHERE (sort_key, pk) > cursor ORDER BY sort_key, pk
+LIMIT n + 1`` instead of OFFSET, so every page is an index seek that costs the
+same no matter how deep it is, and no ``COUNT(*)`` is ever issued. The extra row tells us whether
+there is another page in the direction we are walking.
+"""
+
+import base64
+import binascii
+import datetime
+import decimal
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.pagination import CursorPagination
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class KeysetPage:
+    """One page of results plus the cursors needed to move around it."""
+
+    def __init__(self, object_list, page_size, next_cursor=None, prev_cursor=None, base_query=None):
+        self.object_list = object_list
+        self.page_size = page_size
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self._base_query = base_query
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+    def _url_for(self, cursor):
+        query = self._base_query.copy()
+        query['cursor'] = cursor
+        return '?' + query.urlencode()
+
+    @property
+    def next_url(self):
+        return self._url_for(self.next_cursor) if self.next_cursor else None
+
+    @property
+    def previous_url(self):
+        return self._url_for(self.prev_cursor) if self.prev_cursor else None
+
+
+def _parse_ordering(model, ordering):
+    """Split ``('-registered_at', '-reg_id')`` into (field, descending) pairs."""
+    if not 1 <= len(ordering) <= 2:
+        raise ValueError('Keyset ordering takes a sort field and/or a unique tie-breaker')
+    parsed = []
+    for name in ordering:
+        descending = name.startswith('-')
+        field = model._meta.get_field(name.lstrip('-'))
+        parsed.append((field, descending))
+    return parsed
+
+
+def _json_default(value):
+    # Keep full microsecond precision; DjangoJSONEncoder truncates datetimes
+    # to milliseconds, which would make the cursor skip rows.
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+
+
+def encode_cursor(values, direction):
+    payload = json.dumps({'v': values, 'd': direction}, default=_json_default)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, fields):
+    """Return (values, direction) or None if the cursor is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload['v']
+        direction = payload['d']
+        if direction not in ('n', 'p') or len(values) != len(fields):
+            return None
+        values = [
+            None if value is None else field.to_python(value)
+            for (field, _), value in zip(fields, values)
+        ]
+    except (ValueError, KeyError, TypeError, binascii.Error, ValidationError):
+        return None
+    return values, direction
+
+
+def _segments(fields, values, reverse):
+    """
+    Filters that together select the rows after ``values`` in page order (or
+    before it, when ``reverse``), listed in the order their rows appear.
+
+    NULL sort keys are ordered after all non-NULL ones. Rather than an
+    ``OR ... IS NULL`` predicate (which no index can serve), the NULL block is
+    its own segment, queried only if the non-NULL block runs out. Each
+    non-NULL segment leads with a plain range bound (``key <= cursor``) so the
+    database can seek straight to the cursor in a (sort_key, pk) index.
+    """
+    *sort_fields, (pk_field, pk_desc) = fields
+
+    def pk_beyond(pk_value):
+        lookup = 'lt' if pk_desc != reverse else 'gt'
+        return Q(**{f'{pk_field.name}__{lookup}': pk_value})
+
+    if not sort_fields:
+        return [Q() if values is None else pk_beyond(values[-1])]
+
+    (field, desc), = sort_fields
+    name = field.name
+    not_null, is_null = Q(**{f'{name}__isnull': False}), Q(**{f'{name}__isnull': True})
+    if values is None:
+        return [not_null, is_null] if field.null else [Q()]
+
+    value, pk_value = values
+    if value is None:
+        # Cursor sits in the NULL block at the end of the ordering.
+        return [is_null & pk_beyond(pk_value)] + ([not_null] if reverse else [])
+
+    strict = 'lt' if desc != reverse else 'gt'
+    segments = [
+        Q(**{f'{name}__{strict}e': value})
+        & (Q(**{f'{name}__{strict}': value}) | (Q(**{name: value}) & pk_beyond(pk_value)))
+    ]
+    if field.null and not reverse:
+        segments.append(is_null)
+    return segments
+
+
+def _order_by(fields, reverse):
+    return [
+        F(field.name).desc() if desc != reverse else F(field.name).asc()
+        for field, desc in fields
+    ]
+
+
+def get_page_size(request, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    try:
+        size = int(request.GET.get('page_size', default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+class _KeysetQuery:
+    """The queries for one keyset page and how to turn their rows into a KeysetPage."""
+
+    def __init__(self, request, queryset, ordering, page_size=None):
+        self.fields = _parse_ordering(queryset.model, ordering)
+        self.size = page_size or get_page_size(request)
+        self.base_query = request.GET.copy()
+        self.base_query.pop('cursor', None)
+        cursor = request.GET.get('cursor')
+        self.decoded = decode_cursor(cursor, self.fields) if cursor else None
+        self.reverse = self.decoded is not None and self.decoded[1] == 'p'
+        order = _order_by(self.fields, self.reverse)
+        self.segments = [
+            queryset.filter(condition).order_by(*order)
+            for condition in _segments(self.fields, self.decoded[0] if self.decoded else None, self.reverse)
+        ]
+
+    def page(self, rows):
+        fields, size, decoded, reverse = self.fields, self.size, self.decoded, self.reverse
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+
+        def cursor_for(row, direction):
+            return encode_cursor([getattr(row, field.attname) for field, _ in fields], direction)
+
+        next_cursor = prev_cursor = None
+        if rows:
+            if has_more or reverse:
+                next_cursor = cursor_for(rows[-1], 'n')
+            if decoded is not None and (has_more or not reverse):
+                prev_cursor = cursor_for(rows[0], 'p')
+
+        return KeysetPage(rows, size, next_cursor, prev_cursor, self.base_query)
+
+
+def keyset_paginate(request, queryset, ordering, page_size=None):
+    """
+    Paginate ``queryset`` by ``ordering`` (a sort field plus a unique
+    tie-breaker, e.g. ``('-registered_at', '-reg_id')``) using the ``cursor``
+    and ``page_size`` query parameters of ``request``.
+    """
+    query = _KeysetQuery(request, queryset, ordering, page_size)
+    rows = []
+    for segment in query.segments:
+        rows.extend(segment[:query.size + 1 - len(rows)])
+        if len(rows) > query.size:
+            break
+    return query.page(rows)
+
+
+async def akeyset_paginate(request, queryset, ordering, page_size=None):
+    """``keyset_paginate`` for async views, using the async ORM."""
+    query = _KeysetQuery(request, queryset, ordering, page_size)
+    rows = []
+    for segment in query.segments:
+        rows.extend([row async for row in segment[:query.size + 1 - len(rows)]])
+        if len(rows) > query.size:
+            break
+    return query.page(rows)
+
+
+class APICursorPagination(CursorPagination):
+    """Cursor pagination for the REST API; same limits as the HTML pages."""
+    page_size = DEFAULT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    ordering = 'pk'
@@ -0,0 +1,168 @@
+"""
+Database connection pooling.
+
+With ``DB_POOL`` on (the default), settings.py switches PostgreSQL and MySQL
+databases to the backends in ``stud/backends``:
+
+* PostgreSQL uses Django's built-in psycopg 3 pool (``OPTIONS['pool']``,
+  needs the psycopg_pool package) with a health check on every checkout.
+* MySQL has no pool in Django or mysqlclient, so ``ConnectionPool`` below
+  provides one: idle connections are pinged before reuse and recycled after
+  ``max_idle`` / ``max_lifetime`` seconds.
+
+Either way a request checks a connection out when it first touches the
+database and returns it when Django closes the connection at the end of the
+request, instead of opening a new connection per request
+(``CONN_MAX_AGE=0``) or keeping one per thread (``CONN_MAX_AGE>0``), which
+during registration bursts meant a connection storm on the server.
+
+Pools are per process, so every gunicorn worker has its own; see
+settings.py for how the size follows the worker's thread count. Checkout
+wait times and outcomes, and the number of idle and in-use connections, are
+exported through stud.metrics.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import suppress
+
+from .metrics import observe_pool_checkout, set_pool_connections
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the pool's ``timeout``."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections created by a ``connect()``
+    callable. ``check(conn)`` must raise when a connection is unusable and
+    ``reset(conn)`` undoes any session state before a connection is reused.
+    """
+
+    def __init__(self, name, connect, *, min_size=0, max_size=4, timeout=10.0,
+                 max_idle=600.0, max_lifetime=1800.0, check=None, reset=None):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError('Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1')
+        self.name = name
+        self.min_size, self.max_size = min_size, max_size
+        self.timeout, self.max_idle, self.max_lifetime = timeout, max_idle, max_lifetime
+        self._connect, self._check, self._reset = connect, check, reset
+        self._idle = deque()  # (connection, returned_at); most recently returned on the right
+        self._created = {}    # id(connection) -> created_at, for every open connection
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def _publish(self):
+        set_pool_connections(self.name, len(self._created), len(self._idle))
+
+    def _expired(self, conn, now, returned_at=None):
+        if now - self._created[id(conn)] > self.max_lifetime:
+            return True
+        # Surplus idle connections above min_size are closed after max_idle.
+        return (returned_at is not None and now - returned_at > self.max_idle
+                and len(self._created) > self.min_size)
+
+    def _discard(self, conn):
+        # Caller holds the lock.
+        self._created.pop(id(conn), None)
+        with suppress(Exception):
+            conn.close()
+        self._cond.notify()
+
+    def getconn(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        try:
+            while True:
+                conn = None
+                with self._cond:
+                    while True:
+                        if self._closed:
+                            raise PoolTimeout(f'Pool {self.name!r} is closed')
+                        now = time.monotonic()
+                        while self._idle:
+                            candidate, returned_at = self._idle.pop()
+                            if self._expired(candidate, now, returned_at):
+                                self._discard(candidate)
+                            else:
+                                conn = candidate
+                                break
+                        if conn is not None or len(self._created) < self.max_size:
+                            break
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            raise PoolTimeout(
+                                f'No connection in pool {self.name!r} within {self.timeout:g}s '
+                                f'({self.max_size} in use)'
+                            )
+                        self._cond.wait(remaining)
+                    if conn is None:
+                        # Reserve the slot; connect outside the lock.
+                        placeholder = object()
+                        self._created[id(placeholder)] = now
+                if conn is None:
+                    try:
+                        conn = self._connect()
+                    except BaseException:
+                        with self._cond:
+                            self._created.pop(id(placeholder), None)
+                            self._cond.notify()
+                        raise
+                    with self._cond:
+                        self._created.pop(id(placeholder), None)
+                        self._created[id(conn)] = time.monotonic()
+                        self._publish()
+                    break
+                if self._check is None:
+                    break
+                try:
+                    self._check(conn)
+                    break
+                except Exception:
+                    # Dropped by the server while idle: replace it and try again.
+                    with self._cond:
+                        self._discard(conn)
+                        self._publish()
+        except PoolTimeout:
+            observe_pool_checkout(self.name, time.monotonic() - started, 'timeout')
+            raise
+        except Exception:
+            observe_pool_checkout(self.name, time.monotonic() - started, 'error')
+            raise
+        with self._cond:
+            self._publish()
+        observe_pool_checkout(self.name, time.monotonic() - started, 'ok')
+        return conn
+
+    def putconn(self, conn):
+        """Return a connection from ``getconn``; unusable or expired ones are closed."""
+        usable = True
+        if self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception:
+                usable = False
+        with self._cond:
+            if id(conn) not in self._created:
+                return
+            if usable and not self._closed and not self._expired(conn, time.monotonic()):
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+            else:
+                self._discard(conn)
+            self._publish()
+
+    def close(self):
+        """Close idle connections now and checked-out ones as they are returned."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+            self._cond.notify_all()
+            self._publish()
+
+    def stats(self):
+        with self._cond:
+            return {'size': len(self._created), 'idle': len(self._idle), 'max_size': self.max_size}
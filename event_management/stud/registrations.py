@@ -0,0 +1,188 @@
+"""
+Registration services.
+
+``register_user`` is the seat reservation engine behind single registrations.
+It claims a seat with one conditional ``UPDATE events SET registration_count =
+registration_count + 1 WHERE registration_count < capacity``. The database
+evaluates that atomically against the latest committed row on every backend,
+so concurrent writers can never overbook, and the event row is locked only
+for the short insert that follows rather than across a read-check-write.
+
+``bulk_register`` enrolls a batch (explicit user ids, roll numbers and/or a
+whole department) into one event inside a single transaction: users are
+resolved, duplicates and capacity are checked set-wise, and the new rows are
+inserted with chunked ``bulk_create``. The number of round-trips depends on
+the number of chunks, not the number of users.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from .kiosk import log_roster_changes
+from .models import Event, User, Registration, RosterChange
+from .pagecache import bump
+
+BULK_CHUNK_SIZE = 500
+REGISTERED = Registration.Status.CONFIRMED
+
+# Per-user outcomes returned by bulk_register
+OUTCOME_REGISTERED = 'registered'
+OUTCOME_ALREADY_REGISTERED = 'already_registered'
+OUTCOME_EVENT_FULL = 'event_full'
+OUTCOME_NOT_FOUND = 'not_found'
+
+
+class RegistrationError(Exception):
+    """Base class for registration failures that should be shown to the user."""
+    outcome = 'error'
+
+
+class EventNotFound(RegistrationError):
+    outcome = OUTCOME_NOT_FOUND
+
+
+class UserNotFound(RegistrationError):
+    outcome = OUTCOME_NOT_FOUND
+
+
+class EventFull(RegistrationError):
+    outcome = OUTCOME_EVENT_FULL
+
+
+class AlreadyRegistered(RegistrationError):
+    outcome = OUTCOME_ALREADY_REGISTERED
+
+
+def register_user(event_id, user_id):
+    """
+    Register ``user_id`` for ``event_id`` and return the new Registration.
+
+    Raises EventNotFound, UserNotFound, EventFull or AlreadyRegistered.
+    """
+    # FKs may be deferred (PostgreSQL), so check the user up front instead of
+    # relying on an IntegrityError that would only surface at commit.
+    if not User.objects.filter(user_id=user_id).exists():
+        raise UserNotFound(f'User {user_id} does not exist')
+
+    with transaction.atomic():
+        claimed = (
+            Event.objects.filter(event_id=event_id)
+            .filter(Q(capacity__isnull=True) | Q(registration_count__lt=F('capacity')))
+            .update(registration_count=F('registration_count') + 1, updated_at=Now())
+        )
+        if not claimed:
+            if not Event.objects.filter(event_id=event_id).exists():
+                raise EventNotFound(f'Event {event_id} does not exist')
+            raise EventFull('Event is full')
+
+        registration = Registration(
+            event_id=event_id, user_id=user_id, registered_at=timezone.now(), status=REGISTERED
+        )
+        # The seat is already counted; tell the post_save handler not to add it again.
+        registration._seat_claimed = True
+        try:
+            with transaction.atomic():
+                registration.save(force_insert=True)
+        except IntegrityError:
+            # Leaving the outer block with an exception also releases the seat.
+            raise AlreadyRegistered('User is already registered for this event')
+    return registration
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _resolve_users(user_ids, roll_nos, dept_id, chunk_size):
+    """
+    Return (ordered list of (user_id, roll_no), outcomes for identifiers that
+    matched no user). Order follows the request: ids, then roll numbers, then
+    the department roster.
+    """
+    found = {}
+    not_found = []
+
+    by_id = {}
+    for chunk in _chunks(list(dict.fromkeys(user_ids)), chunk_size):
+        by_id.update(User.objects.filter(user_id__in=chunk).values_list('user_id', 'roll_no'))
+    for user_id in dict.fromkeys(user_ids):
+        if user_id in by_id:
+            found.setdefault(user_id, by_id[user_id])
+        else:
+            not_found.append({'user_id': user_id, 'roll_no': None, 'status': OUTCOME_NOT_FOUND})
+
+    by_roll = {}
+    for chunk in _chunks(list(dict.fromkeys(roll_nos)), chunk_size):
+        by_roll.update(
+            (roll_no, user_id)
+            for user_id, roll_no in User.objects.filter(roll_no__in=chunk).values_list('user_id', 'roll_no')
+        )
+    for roll_no in dict.fromkeys(roll_nos):
+        if roll_no in by_roll:
+            found.setdefault(by_roll[roll_no], roll_no)
+        else:
+            not_found.append({'user_id': None, 'roll_no': roll_no, 'status': OUTCOME_NOT_FOUND})
+
+    if dept_id is not None:
+        members = User.objects.filter(dept_id=dept_id).order_by('user_id').values_list('user_id', 'roll_no')
+        for user_id, roll_no in members.iterator(chunk_size=chunk_size):
+            found.setdefault(user_id, roll_no)
+
+    return list(found.items()), not_found
+
+
+def bulk_register(event_id, user_ids=(), roll_nos=(), dept_id=None, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Register a batch of users for ``event_id`` in one transaction.
+
+    Users already registered are reported, not re-inserted. When the batch
+    exceeds the remaining seats, users are admitted in request order until the
+    event is full and the rest are reported as ``event_full``. Returns
+    ``{'event_id', 'registered', 'results': [{'user_id', 'roll_no', 'status'}]}``.
+    Raises ``Event.DoesNotExist`` for an unknown event.
+    """
+    candidates, results = _resolve_users(list(user_ids), list(roll_nos), dept_id, chunk_size)
+
+    with transaction.atomic():
+        # Lock the event row so concurrent enrollments see a consistent count.
+        event = Event.objects.select_for_update().only('event_id', 'capacity', 'registration_count').get(event_id=event_id)
+
+        existing = set()
+        for chunk in _chunks([user_id for user_id, _ in candidates], chunk_size):
+            existing.update(
+                Registration.objects.filter(event_id=event.event_id, user_id__in=chunk)
+                .values_list('user_id', flat=True)
+            )
+
+        seats = None if event.capacity is None else max(event.capacity - event.registration_count, 0)
+        to_create = []
+        for user_id, roll_no in candidates:
+            if user_id in existing:
+                status = OUTCOME_ALREADY_REGISTERED
+            elif seats is not None and len(to_create) >= seats:
+                status = OUTCOME_EVENT_FULL
+            else:
+                status = OUTCOME_REGISTERED
+                to_create.append(user_id)
+            results.append({'user_id': user_id, 'roll_no': roll_no, 'status': status})
+
+        now = timezone.now()
+        for chunk in _chunks(to_create, chunk_size):
+            Registration.objects.bulk_create([
+                Registration(event_id=event.event_id, user_id=user_id, registered_at=now, status=REGISTERED)
+                for user_id in chunk
+            ])
+
+        # bulk_create skips post_save, so keep the stored count and the
+        # kiosk roster log in step here.
+        if to_create:
+            Event.objects.filter(event_id=event.event_id).update(
+                registration_count=F('registration_count') + len(to_create), updated_at=Now()
+            )
+            log_roster_changes(event.event_id, to_create, RosterChange.ADD)
+            bump(Registration, Event)
+
+    return {'event_id': event.event_id, 'registered': len(to_create), 'results': results}
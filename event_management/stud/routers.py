@@ -0,0 +1,157 @@
+"""
+Primary/replica database routing.
+
+``settings.REPLICA_DATABASES`` lists aliases of read-only copies of
+'default'. Reads go to a replica when
+
+* the code runs inside a GET/HEAD/OPTIONS request (one replica is picked
+  per request, so all its queries see the same snapshot), or
+* the model is unmanaged (the ``vw_*`` reporting views), even outside a
+  request.
+
+Everything else uses the primary: writes, reads inside a transaction on
+the primary, requests with unsafe methods, views marked ``@writes`` (the
+GET delete links), and code wrapped in ``use_primary()`` such as the
+stored-procedure wrappers in models.py.
+
+Read-your-writes: an unsafe request or a ``@writes`` view sets a
+short-lived cookie, and while it is present that client's reads stay on the
+primary, so a redirect after a POST never shows data the replica has not
+caught up with yet. ``REPLICA_STICKY_SECONDS`` should exceed the usual
+replication lag.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+PRIMARY = 'default'
+STICKY_COOKIE = 'stud_read_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# Alias every read in the current request/context should use, or None.
+_read_db = ContextVar('stud_read_db', default=None)
+
+
+def replicas():
+    return list(getattr(settings, 'REPLICA_DATABASES', []))
+
+
+def reading_from_replica():
+    return _read_db.get() in replicas()
+
+
+@contextmanager
+def use_primary():
+    """Send every read in the block to the primary."""
+    token = _read_db.set(PRIMARY)
+    try:
+        yield
+    finally:
+        _read_db.reset(token)
+
+
+@contextmanager
+def use_replica(alias=None):
+    """Send reads in the block to ``alias`` (or a random replica) as a GET request would."""
+    aliases = replicas()
+    token = _read_db.set(alias or (random.choice(aliases) if aliases else PRIMARY))
+    try:
+        yield
+    finally:
+        _read_db.reset(token)
+
+
+def writes(view):
+    """Mark a view that writes although it answers GET, so it reads and sticks to the primary."""
+    view.writes_primary = True
+    return view
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if not aliases or connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        # Related objects load from wherever their parent came from.
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db in (PRIMARY, *aliases):
+            return instance._state.db
+        chosen = _read_db.get()
+        if chosen is not None:
+            return chosen
+        return PRIMARY if model._meta.managed else random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {PRIMARY, *replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas receive the schema through replication.
+        return False if db in replicas() else None
+
+
+class ReplicaRoutingMiddleware:
+    """Choose the read database per request and pin writers to the primary for a while."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _choose(self, request):
+        aliases = replicas()
+        if not aliases:
+            return None
+        if request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES:
+            return _read_db.set(PRIMARY)
+        return _read_db.set(random.choice(aliases))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(view_func, 'writes_primary', False) and replicas():
+            request.writes_primary = True
+            # Restored to the request's choice by the reset in __call__.
+            _read_db.set(PRIMARY)
+        return None
+
+    def _finish(self, request, response):
+        if request.method not in SAFE_METHODS or getattr(request, 'writes_primary', False):
+            response.set_cookie(
+                STICKY_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = self._choose(request)
+        if token is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_db.reset(token)
+        return self._finish(request, response)
+
+    async def __acall__(self, request):
+        token = self._choose(request)
+        if token is None:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_db.reset(token)
+        return self._finish(request, response)
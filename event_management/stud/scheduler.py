@@ -0,0 +1,240 @@
+"""
+Batch venue auto-scheduler.
+
+Organizers submit events without a venue. An event's ``start_datetime`` and
+``end_datetime`` are read as its preferred window (or the batch defaults when
+blank), and ``capacity`` as the seats it needs. ``schedule`` gives each event
+a venue and start time inside its window such that:
+
+* the venue seats at least the event's capacity;
+* the venue is not booked by any other event at that time (existing
+  bookings and events placed earlier in the same run);
+* every resource allocated to the event (EventResource) still has enough
+  units free once overlapping events are counted, as in availability.py.
+
+Placement is greedy and deterministic. The least flexible events go first
+(smallest slack between window and duration, then the most seats). Each
+tries venues from the smallest that fits upward, and within a venue the
+earliest start on a ``step`` grid. Venue calendars are sorted interval
+lists probed with bisect, so a candidate costs O(log n).
+
+The whole run happens in one transaction with the venue rows and the needed
+resource rows locked, and placed events are written with one bulk_update.
+``dry_run`` rolls it back.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_time
+
+from .availability import overlapping_allocations, parse_window, peak_usage
+from .models import Event, EventResource, Resource, Venue
+from .pagecache import bump
+from .search import refresh_search_tags
+from .venues import bookings
+
+DEFAULT_STEP = timedelta(minutes=30)
+
+NO_WINDOW = 'no preferred window'
+NO_DURATION = 'no duration'
+WINDOW_TOO_SHORT = 'window shorter than duration'
+OUTSIDE_DAY_HOURS = 'no start inside day hours'
+NO_VENUE_BIG_ENOUGH = 'no venue big enough'
+NO_FREE_VENUE = 'no venue free in window'
+RESOURCES_UNAVAILABLE = 'resources unavailable in window'
+
+
+class _Calendar:
+    """Disjoint busy intervals of one venue, sorted by start."""
+
+    def __init__(self, intervals):
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start < merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [s for s, _ in merged]
+        self.ends = [e for _, e in merged]
+
+    def is_free(self, start, end):
+        i = bisect_right(self.starts, start)
+        if i and self.ends[i - 1] > start:
+            return False
+        return i == len(self.starts) or self.starts[i] >= end
+
+    def add(self, start, end):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+
+
+def parse_options(data):
+    """
+    Scheduler kwargs from a flat mapping (API payload or command options):
+    event_ids, window_start/window_end (ISO), duration_minutes, step_minutes,
+    day_start/day_end ('HH:MM'), dry_run. Raises ValueError.
+    """
+    kwargs = {'dry_run': bool(data.get('dry_run'))}
+    if data.get('event_ids') is not None:
+        ids = data['event_ids']
+        ids = ids.split(',') if isinstance(ids, str) else ids
+        kwargs['event_ids'] = [int(i) for i in ids]
+    if data.get('window_start') or data.get('window_end'):
+        kwargs['window'] = parse_window(data.get('window_start'), data.get('window_end'))
+    for name, key in (('duration_minutes', 'duration'), ('step_minutes', 'step')):
+        if data.get(name):
+            minutes = int(data[name])
+            if minutes < 1:
+                raise ValueError(f'{name} must be positive')
+            kwargs[key] = timedelta(minutes=minutes)
+    if data.get('day_start') or data.get('day_end'):
+        hours = parse_time(data.get('day_start') or ''), parse_time(data.get('day_end') or '')
+        if None in hours or not hours[0] < hours[1]:
+            raise ValueError('day_start and day_end must be HH:MM with start before end')
+        kwargs['day_hours'] = hours
+    return kwargs
+
+
+def _candidate_starts(window_start, window_end, duration, step, day_start, day_end):
+    start = window_start
+    while start + duration <= window_end:
+        if day_start is None:
+            yield start
+        else:
+            local_start, local_end = timezone.localtime(start), timezone.localtime(start + duration)
+            if (local_start.time() >= day_start and local_end.time() <= day_end
+                    and local_start.date() == local_end.date()):
+                yield start
+        start += step
+
+
+def schedule(event_ids=None, window=None, duration=None, step=DEFAULT_STEP,
+             day_hours=None, dry_run=False):
+    """
+    Place unvenued, non-cancelled events (optionally only ``event_ids``).
+
+    ``window`` is the default (start, end) for events without times;
+    ``duration`` (timedelta) is how long each event runs, defaulting to the
+    length of the event's own window. ``day_hours`` is an optional (time,
+    time) range every placed event must fall inside. Returns ``{'placed':
+    [...], 'unplaced': [...], 'dry_run'}``.
+    """
+    day_start, day_end = day_hours or (None, None)
+    with transaction.atomic():
+        events = Event.objects.filter(venue__isnull=True).exclude(status=Event.Status.CANCELLED)
+        if event_ids is not None:
+            events = events.filter(event_id__in=event_ids)
+        events = list(events.order_by('event_id'))
+        batch_ids = [e.event_id for e in events]
+
+        jobs, unplaced = [], []
+        for event in events:
+            ws = event.start_datetime or (window[0] if window else None)
+            we = event.end_datetime or (window[1] if window else None)
+            length = duration or (event.end_datetime - event.start_datetime
+                                  if event.start_datetime and event.end_datetime else None)
+            if ws is None or we is None:
+                unplaced.append((event, NO_WINDOW))
+            elif length is None:
+                unplaced.append((event, NO_DURATION))
+            elif length > we - ws:
+                unplaced.append((event, WINDOW_TOO_SHORT))
+            else:
+                jobs.append((event, ws, we, length))
+        if not jobs:
+            return _report([], unplaced, dry_run)
+
+        horizon = (min(j[1] for j in jobs), max(j[2] for j in jobs))
+        venues = list(Venue.objects.select_for_update().order_by('capacity', 'venue_id'))
+        calendars = defaultdict(list)
+        for venue_id, s, e in (
+            bookings(*horizon).exclude(event_id__in=batch_ids).values_list('venue_id', 'start_datetime', 'end_datetime')
+        ):
+            calendars[venue_id].append((s, e))
+        calendars = {v.venue_id: _Calendar(calendars[v.venue_id]) for v in venues}
+
+        needs = defaultdict(list)
+        for event_id, resource_id, quantity in EventResource.objects.filter(event_id__in=batch_ids).values_list(
+            'event_id', 'resource_id', 'quantity_required'
+        ):
+            needs[event_id].append((resource_id, quantity))
+        # Lock the needed resources as allocate() does, so an allocation
+        # committed while we plan cannot push a placement over the total.
+        totals = dict(
+            Resource.objects.select_for_update()
+            .filter(resource_id__in={r for reqs in needs.values() for r, _ in reqs})
+            .order_by('resource_id')
+            .values_list('resource_id', 'total_quantity')
+        )
+        # The batch's own allocations move with it, so only other events count.
+        usage = defaultdict(list, overlapping_allocations(*horizon, exclude_event_ids=batch_ids))
+
+        def resources_free(event_id, start, end):
+            for resource_id, quantity in needs[event_id]:
+                overlapping = [(max(s, start), min(e, end), q) for s, e, q in usage[resource_id] if s < end and e > start]
+                if peak_usage(overlapping) + quantity > totals.get(resource_id, 0):
+                    return False
+            return True
+
+        jobs.sort(key=lambda j: ((j[2] - j[1]) - j[3], -(j[0].capacity or 0), j[0].event_id))
+        placed = []
+        for event, ws, we, length in jobs:
+            fitting = [v for v in venues if event.capacity is None or v.capacity >= event.capacity]
+            if not fitting:
+                unplaced.append((event, NO_VENUE_BIG_ENOUGH))
+                continue
+            starts = list(_candidate_starts(ws, we, length, step, day_start, day_end))
+            if not starts:
+                unplaced.append((event, OUTSIDE_DAY_HOURS))
+                continue
+            choice, blocked_by_resources = None, False
+            for venue in fitting:
+                calendar = calendars[venue.venue_id]
+                for start in starts:
+                    end = start + length
+                    if not calendar.is_free(start, end):
+                        continue
+                    if not resources_free(event.event_id, start, end):
+                        blocked_by_resources = True
+                        continue
+                    choice = (venue, start, end)
+                    break
+                if choice:
+                    break
+            if choice is None:
+                unplaced.append((event, RESOURCES_UNAVAILABLE if blocked_by_resources else NO_FREE_VENUE))
+                continue
+            venue, start, end = choice
+            calendars[venue.venue_id].add(start, end)
+            for resource_id, quantity in needs[event.event_id]:
+                usage[resource_id].append((start, end, quantity))
+            event.venue, event.start_datetime, event.end_datetime = venue, start, end
+            event.updated_at = timezone.now()
+            placed.append(event)
+
+        Event.objects.bulk_update(placed, ['venue', 'start_datetime', 'end_datetime', 'updated_at'], batch_size=500)
+        refresh_search_tags(Event.objects.filter(event_id__in=[e.event_id for e in placed]))
+        bump(Event)
+        if dry_run:
+            transaction.set_rollback(True)
+        return _report(placed, unplaced, dry_run)
+
+
+def _report(placed, unplaced, dry_run):
+    return {
+        'dry_run': dry_run,
+        'placed': [
+            {'event_id': e.event_id, 'title': e.title, 'venue_id': e.venue.venue_id, 'venue': e.venue.name,
+             'start_datetime': e.start_datetime, 'end_datetime': e.end_datetime}
+            for e in sorted(placed, key=lambda e: e.event_id)
+        ],
+        'unplaced': [
+            {'event_id': e.event_id, 'title': e.title, 'reason': reason}
+            for e, reason in sorted(unplaced, key=lambda item: item[0].event_id)
+        ],
+    }
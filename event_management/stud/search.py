@@ -0,0 +1,185 @@
+"""
+Full-text event search.
+
+Events are matched on title, description and ``search_tags`` (the category
+and venue names, denormalized onto the row so one index can cover them):
+
+* PostgreSQL: a weighted ``tsvector`` expression (title A, tags B,
+  description C) with the GIN index ``events_search_idx``; queries use
+  ``websearch_to_tsquery`` and are ranked with ``ts_rank_cd``.
+* MySQL: the FULLTEXT index ``events_search_ft``; every term is required
+  and may be a prefix (BOOLEAN MODE), ranked by natural-language relevance.
+* Anything else (SQLite): every term must appear in one of the columns
+  (``icontains``); a title hit scores 3, a tag hit 2, a description hit 1.
+
+The index DDL lives in migration 0009, which repeats the PostgreSQL
+expression below verbatim; the planner only uses the index for an identical
+expression.
+
+``search_tags`` is kept current by stud/signals.py. Bulk writes skip the
+signals and must call ``refresh_search_tags`` on the rows they touched.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Case, CharField, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, Concat, Now
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Category, Venue
+
+MAX_TERMS = 8
+# MySQL's default innodb_ft_min_token_size; shorter words are not indexed.
+MYSQL_MIN_TOKEN = 3
+SNIPPET_CHARS = 200
+
+PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce({t}title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({t}search_tags, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce({t}description, '')), 'C')"
+)
+MYSQL_COLUMNS = '{t}title, {t}description, {t}search_tags'
+
+# ts_headline does not escape HTML; mark hits with control characters and
+# swap them for <mark> after escaping.
+_START, _STOP = '\x02', '\x03'
+
+
+def search_tags_for(category_name, venue_name):
+    return ' '.join(name for name in (category_name, venue_name) if name)
+
+
+def refresh_search_tags(events):
+    """Recompute ``search_tags`` for an Event queryset with one UPDATE."""
+    category = Category.objects.filter(category_id=OuterRef('category_id')).values('name')[:1]
+    venue = Venue.objects.filter(venue_id=OuterRef('venue_id')).values('name')[:1]
+    return events.update(search_tags=Concat(
+        Coalesce(Subquery(category), Value('')), Value(' '), Coalesce(Subquery(venue), Value('')),
+        output_field=CharField(),
+    ), updated_at=Now())
+
+
+def parse_terms(query):
+    """Words of a free-text query, lowercased and de-duplicated, at most MAX_TERMS."""
+    terms = []
+    for word in re.findall(r'\w+', query.lower()):
+        if word not in terms:
+            terms.append(word)
+    return terms[:MAX_TERMS]
+
+
+def _vendor(queryset):
+    return connections[queryset.db].vendor
+
+
+def search(queryset, query):
+    """
+    Filter an Event queryset to matches for ``query`` and annotate each row
+    with ``search_rank`` (higher is better). Order by ``-search_rank`` to
+    rank. An empty query matches nothing.
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return queryset.none()
+    vendor = _vendor(queryset)
+    table = queryset.model._meta.db_table + '.'
+    if vendor == 'postgresql':
+        document = PG_DOCUMENT.format(t=table)
+        text = ' '.join(query.split())
+        return queryset.filter(
+            RawSQL(f"({document}) @@ websearch_to_tsquery('english', %s)", [text], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f"ts_rank_cd({document}, websearch_to_tsquery('english', %s))", [text],
+                               output_field=FloatField()),
+        )
+    long_terms = [term for term in terms if len(term) >= MYSQL_MIN_TOKEN]
+    if vendor == 'mysql' and long_terms:
+        columns = MYSQL_COLUMNS.format(t=table)
+        boolean = ' '.join(f'+{term}*' for term in long_terms)
+        return queryset.filter(
+            RawSQL(f'MATCH({columns}) AGAINST (%s IN BOOLEAN MODE)', [boolean], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f'MATCH({columns}) AGAINST (%s IN NATURAL LANGUAGE MODE)', [' '.join(long_terms)],
+                               output_field=FloatField()),
+        )
+    return _search_fallback(queryset, terms)
+
+
+def _search_fallback(queryset, terms):
+    rank = Value(0.0)
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(search_tags__icontains=term) | Q(description__icontains=term)
+        )
+        for field, weight in (('title', 3.0), ('search_tags', 2.0), ('description', 1.0)):
+            rank = rank + _score(field, term, weight)
+    return queryset.annotate(search_rank=rank)
+
+
+def _score(field, term, weight):
+    return Case(When(**{f'{field}__icontains': term}, then=Value(weight)), default=Value(0.0),
+                output_field=FloatField())
+
+
+def _mark_terms(text, terms):
+    """Escape ``text`` and wrap words starting with any term in <mark>."""
+    if not terms:
+        return escape(text)
+    pattern = re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in terms) + r')\w*', re.IGNORECASE)
+    out, pos = [], 0
+    for match in pattern.finditer(text):
+        out.append(escape(text[pos:match.start()]))
+        out.append(f'<mark>{escape(match.group())}</mark>')
+        pos = match.end()
+    out.append(escape(text[pos:]))
+    return ''.join(out)
+
+
+def _snippet(text, terms):
+    """Up to SNIPPET_CHARS of ``text`` around the first hit."""
+    text = ' '.join((text or '').split())
+    if len(text) <= SNIPPET_CHARS:
+        return text
+    lowered = text.lower()
+    hits = [i for i in (lowered.find(term) for term in terms) if i >= 0]
+    start = max(0, min(hits) - SNIPPET_CHARS // 4) if hits else 0
+    if start:
+        # Begin on a word boundary
+        start = text.find(' ', start) + 1 or start
+    snippet = text[start:start + SNIPPET_CHARS]
+    return ('…' if start else '') + snippet + ('…' if start + SNIPPET_CHARS < len(text) else '')
+
+
+def highlights(queryset, event_ids, query):
+    """
+    ``{event_id: (title_html, snippet_html)}`` with the query terms marked.
+    Only call this for the page being shown: PostgreSQL runs ts_headline
+    (which reparses each description) so stemmed forms are marked too.
+    """
+    terms = parse_terms(query)
+    rows = queryset.model.objects.using(queryset.db).filter(pk__in=event_ids)
+    if _vendor(queryset) == 'postgresql' and terms:
+        options = f'StartSel={_START}, StopSel={_STOP}, MaxFragments=2, MaxWords=30, MinWords=10'
+        text = ' '.join(query.split())
+        rows = rows.annotate(
+            title_hl=RawSQL(
+                "ts_headline('english', title, websearch_to_tsquery('english', %s), %s)",
+                [text, f'StartSel={_START}, StopSel={_STOP}, HighlightAll=true'], output_field=CharField(),
+            ),
+            description_hl=RawSQL(
+                "ts_headline('english', coalesce(description, ''), websearch_to_tsquery('english', %s), %s)",
+                [text, options], output_field=CharField(),
+            ),
+        ).values_list('pk', 'title_hl', 'description_hl')
+        return {
+            pk: tuple(mark_safe(escape(value).replace(_START, '<mark>').replace(_STOP, '</mark>'))
+                      for value in (title, description))
+            for pk, title, description in rows
+        }
+    return {
+        pk: (mark_safe(_mark_terms(title, terms)), mark_safe(_mark_terms(_snippet(description, terms), terms)))
+        for pk, title, description in rows.values_list('pk', 'title', 'description')
+    }
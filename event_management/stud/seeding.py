@@ -0,0 +1,246 @@
+"""
+Deterministic synthetic data at production scale.
+
+``seed_scale(seed, scale)`` creates lookup rows (roles, departments,
+categories, resources, venues) and then ``USERS_PER_SCALE * scale`` users and
+``EVENTS_PER_SCALE * scale`` events, each event with event resources,
+registrations (about 100 per event, so scale 10 is roughly a million) and,
+for past events, attendance.
+
+Users and events get explicit primary keys allocated up front, so work can
+be split into independent chunks. Each chunk draws from its own
+``random.Random`` keyed on the seed and the chunk number, which makes the
+output identical whatever the number of workers. Registrations sample
+distinct users per event, so (event, user) is unique by construction.
+
+Chunks are inserted by a process pool with COPY on PostgreSQL and
+``bulk_create`` elsewhere. SQLite allows only one writer, so it always runs
+in-process. Counters and ``registration_count`` are written directly. The
+roster log is not; kiosks start from a snapshot anyway.
+"""
+
+import datetime
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+
+from .counters import rebuild
+from .imports import copy_or_bulk_create
+from .pagecache import bump
+from .search import refresh_search_tags
+from .models import (
+    Role, Department, User, Venue, Category, Event, Registration, Attendance, Resource, EventResource,
+)
+
+USERS_PER_SCALE = 10_000
+EVENTS_PER_SCALE = 1_000
+USER_CHUNK_SIZE = 10_000
+EVENT_CHUNK_SIZE = 200
+
+ROLES = [('Student', 90), ('Faculty', 6), ('Organizer', 2), ('Volunteer', 1), ('Admin', 1)]
+DEPARTMENTS = [
+    ('CSE', 'Computer Science and Engineering'), ('ECE', 'Electronics and Communication Engineering'),
+    ('EEE', 'Electrical and Electronics Engineering'), ('ME', 'Mechanical Engineering'),
+    ('CE', 'Civil Engineering'), ('IT', 'Information Technology'), ('CHE', 'Chemical Engineering'),
+    ('BT', 'Biotechnology'), ('AIDS', 'Artificial Intelligence and Data Science'), ('MBA', 'Management Studies'),
+]
+CATEGORIES = ['Technical', 'Cultural', 'Sports', 'Workshop', 'Seminar', 'Hackathon', 'Quiz', 'Social']
+RESOURCES = [
+    ('Projector', 20), ('Microphone', 40), ('Speaker System', 10), ('Laptop', 60), ('Whiteboard', 30),
+    ('Extension Board', 80), ('Camera', 8), ('Stage Lights', 12), ('Chairs (set of 50)', 40), ('Banner Stand', 25),
+]
+VENUE_KINDS = [('Seminar Hall', 150, 300), ('Auditorium', 400, 1200), ('Classroom', 40, 90),
+               ('Lab', 30, 70), ('Open Air Theatre', 500, 2000), ('Conference Room', 20, 50)]
+FIRST_NAMES = ['Aarav', 'Aditi', 'Arjun', 'Divya', 'Farhan', 'Gayathri', 'Harish', 'Ishita', 'Karthik', 'Lakshmi',
+               'Manoj', 'Meera', 'Nikhil', 'Pooja', 'Rahul', 'Sneha', 'Tarun', 'Varsha', 'Vikram', 'Zoya']
+LAST_NAMES = ['Sharma', 'Reddy', 'Nair', 'Iyer', 'Khan', 'Patel', 'Gupta', 'Rao', 'Menon', 'Das',
+              'Singh', 'Kumar', 'Joshi', 'Bose', 'Pillai']
+EVENT_WORDS = ['Annual', 'Inter-College', 'National', 'Open', 'Intro to', 'Advanced', 'Winter', 'Summer']
+EVENT_KINDS = ['Meetup', 'Challenge', 'Symposium', 'Bootcamp', 'Championship', 'Fest', 'Talk', 'Contest']
+START_HOURS = [9, 10, 11, 14, 15, 16, 18]
+
+
+def _seed_lookups(n_venues):
+    """Create the small reference tables (idempotent) and return their ids."""
+    for name, _ in ROLES:
+        Role.objects.get_or_create(role_name=name)
+    for code, name in DEPARTMENTS:
+        Department.objects.get_or_create(dept_code=code, defaults={'dept_name': name})
+    for name in CATEGORIES:
+        Category.objects.get_or_create(name=name)
+    for name, quantity in RESOURCES:
+        Resource.objects.get_or_create(resource_name=name, defaults={'total_quantity': quantity})
+
+    existing = set(Venue.objects.filter(name__startswith='Seed ').values_list('name', flat=True))
+    rng = random.Random('venues')
+    new_venues = []
+    for i in range(n_venues):
+        kind, low, high = VENUE_KINDS[i % len(VENUE_KINDS)]
+        name = f'Seed {kind} {i // len(VENUE_KINDS) + 1}'
+        capacity = rng.randint(low, high)
+        if name not in existing:
+            new_venues.append(Venue(name=name, location=f'Block {chr(65 + i % 8)}', capacity=capacity))
+    Venue.objects.bulk_create(new_venues)
+
+    return {
+        'roles': dict(Role.objects.filter(role_name__in=[n for n, _ in ROLES]).values_list('role_name', 'role_id')),
+        'depts': list(Department.objects.filter(dept_code__in=[c for c, _ in DEPARTMENTS])
+                      .values_list('dept_id', 'dept_code').order_by('dept_code')),
+        'categories': list(Category.objects.filter(name__in=CATEGORIES).values_list('category_id', 'name')
+                           .order_by('name')),
+        'resources': list(Resource.objects.filter(resource_name__in=[n for n, _ in RESOURCES])
+                          .values_list('resource_id', 'total_quantity').order_by('resource_name')),
+        'venues': list(Venue.objects.filter(name__startswith='Seed ').values_list('venue_id', 'capacity')
+                       .order_by('name')[:n_venues]),
+    }
+
+
+def _seed_users(task):
+    seed, chunk, lo, hi, lookups, created_at = task
+    rng = random.Random(f'{seed}:users:{chunk}')
+    role_names = [name for name, _ in ROLES]
+    role_weights = [weight for _, weight in ROLES]
+    users = []
+    for user_id in range(lo, hi):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        dept_id, dept_code = rng.choice(lookups['depts'])
+        users.append(User(
+            user_id=user_id, roll_no=f'{dept_code}{user_id:08d}', name=f'{first} {last}',
+            email=f'{first}.{last}{user_id}@college.edu'.lower(), phone=f'9{rng.randrange(10 ** 9):09d}',
+            role_id=lookups['roles'][rng.choices(role_names, role_weights)[0]], dept_id=dept_id,
+            created_at=created_at - datetime.timedelta(days=rng.randint(0, 1000)),
+        ))
+    with transaction.atomic():
+        copy_or_bulk_create(User, users)
+    return {'users': len(users)}
+
+
+def _seed_events(task):
+    """Events [lo, hi) with their resources, registrations and attendance."""
+    seed, chunk, lo, hi, user_range, lookups, anchor = task
+    rng = random.Random(f'{seed}:events:{chunk}')
+    reg_statuses = [Registration.Status.CONFIRMED, Registration.Status.CANCELLED, Registration.Status.WAITLISTED]
+    events, event_resources, registrations, attendance = [], [], [], []
+
+    for event_id in range(lo, hi):
+        category_id, category = rng.choice(lookups['categories'])
+        capacity = rng.randint(50, 250)
+        venue_id, venue_capacity = rng.choice(
+            [v for v in lookups['venues'] if v[1] >= capacity] or [max(lookups['venues'], key=lambda v: v[1])]
+        )
+        capacity = min(capacity, venue_capacity)
+        start = anchor + datetime.timedelta(days=rng.randint(-365, 365), hours=rng.choice(START_HOURS))
+        past = start < anchor
+        cancelled = rng.random() < 0.03
+        if cancelled:
+            status = Event.Status.CANCELLED
+        else:
+            status = Event.Status.COMPLETED if past else Event.Status.SCHEDULED
+        taken = min(len(user_range), int(capacity * rng.uniform(0.4, 0.95)))
+        events.append(Event(
+            event_id=event_id, title=f'{rng.choice(EVENT_WORDS)} {category} {rng.choice(EVENT_KINDS)} #{event_id}',
+            description=f'{category} event generated by seed_scale (seed {seed}).',
+            category_id=category_id, venue_id=venue_id, organizer_id=rng.choice(user_range),
+            start_datetime=start, end_datetime=start + datetime.timedelta(hours=rng.randint(1, 4)),
+            capacity=capacity, status=status, registration_count=taken,
+            created_at=start - datetime.timedelta(days=rng.randint(30, 90)),
+        ))
+        if rng.random() < 0.4:
+            for resource_id, total in rng.sample(lookups['resources'], rng.randint(1, 3)):
+                event_resources.append(EventResource(
+                    event_id=event_id, resource_id=resource_id, quantity_required=rng.randint(1, min(total, 3)),
+                ))
+        for user_id in rng.sample(user_range, taken):
+            reg_status = rng.choices(reg_statuses, (95, 3, 2))[0]
+            registrations.append(Registration(
+                event_id=event_id, user_id=user_id, status=reg_status,
+                registered_at=start - datetime.timedelta(minutes=rng.randint(60, 60 * 24 * 30)),
+            ))
+            if past and not cancelled and reg_status == Registration.Status.CONFIRMED:
+                attendance.append(Attendance(
+                    event_id=event_id, user_id=user_id, present=rng.random() < 0.85,
+                    checked_at=start + datetime.timedelta(minutes=rng.randint(0, 30)),
+                ))
+
+    with transaction.atomic():
+        copy_or_bulk_create(Event, events)
+        copy_or_bulk_create(EventResource, event_resources)
+        copy_or_bulk_create(Registration, registrations)
+        copy_or_bulk_create(Attendance, attendance)
+    return {
+        'events': len(events), 'event_resources': len(event_resources),
+        'registrations': len(registrations), 'attendance': len(attendance),
+    }
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _run(tasks, func, workers, progress):
+    totals = {}
+
+    def add(result):
+        for name, count in result.items():
+            totals[name] = totals.get(name, 0) + count
+        progress(func.__name__.removeprefix('_seed_'), totals)
+
+    if workers <= 1:
+        for task in tasks:
+            add(func(task))
+        return totals
+    # Children must open their own connections, not share the parent's socket.
+    connections.close_all()
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method),
+                             initializer=_init_worker) as pool:
+        for result in pool.map(func, tasks):
+            add(result)
+    return totals
+
+
+def seed_scale(seed=42, scale=1.0, workers=1, anchor=None, progress=lambda phase, totals: None):
+    """
+    Generate a dataset; returns a dict of rows created per table. ``anchor``
+    (aware datetime) is the "now" that splits past from upcoming events.
+    """
+    if connection.vendor == 'sqlite':
+        workers = 1
+    anchor = anchor or datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    n_users = max(1, int(USERS_PER_SCALE * scale))
+    n_events = max(1, int(EVENTS_PER_SCALE * scale))
+    lookups = _seed_lookups(max(len(VENUE_KINDS), int(20 * scale)))
+
+    first_user = (User.objects.aggregate(m=Max('user_id'))['m'] or 0) + 1
+    first_event = (Event.objects.aggregate(m=Max('event_id'))['m'] or 0) + 1
+    user_range = range(first_user, first_user + n_users)
+
+    user_tasks = [
+        (seed, chunk, lo, min(lo + USER_CHUNK_SIZE, user_range.stop), lookups, anchor)
+        for chunk, lo in enumerate(range(user_range.start, user_range.stop, USER_CHUNK_SIZE))
+    ]
+    totals = _run(user_tasks, _seed_users, workers, progress)
+
+    event_stop = first_event + n_events
+    event_tasks = [
+        (seed, chunk, lo, min(lo + EVENT_CHUNK_SIZE, event_stop), user_range, lookups, anchor)
+        for chunk, lo in enumerate(range(first_event, event_stop, EVENT_CHUNK_SIZE))
+    ]
+    totals.update(_run(event_tasks, _seed_events, workers, progress))
+
+    # Explicit ids bypass the sequences (PostgreSQL); move them past the new rows.
+    sequence_sql = connection.ops.sequence_reset_sql(no_style(), [User, Event])
+    if sequence_sql:
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
+    rebuild()
+    refresh_search_tags(Event.objects.filter(event_id__gte=first_event, event_id__lt=event_stop))
+    bump(Role, Department, User, Venue, Category, Resource, Event, EventResource, Registration, Attendance)
+    return totals
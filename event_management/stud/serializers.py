@@ -4,17 +4,31 @@ from .models import (
     Event, Registration, Attendance, Resource, EventResource
 )
 
-class RoleSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Honour ``?fields=a,b,c`` on GET requests by dropping the other fields."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        requested = request.query_params.get('fields')
+        if requested:
+            keep = {name.strip() for name in requested.split(',') if name.strip()}
+            for name in set(self.fields) - keep:
+                self.fields.pop(name)
+
+class RoleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = '__all__'
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Department
         fields = '__all__'
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     role_name = serializers.CharField(source='role.role_name', read_only=True)
     dept_name = serializers.CharField(source='dept.dept_name', read_only=True)
     
@@ -23,17 +37,17 @@ class UserSerializer(serializers.ModelSerializer):
         fields = '__all__'
         extra_kwargs = {'password_hash': {'write_only': True}}
 
-class VenueSerializer(serializers.ModelSerializer):
+class VenueSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Venue
         fields = '__all__'
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
     organizer_name = serializers.CharField(source='organizer.name', read_only=True)
     venue_name = serializers.CharField(source='venue.name', read_only=True)
@@ -41,8 +55,9 @@ class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = '__all__'
+        read_only_fields = ['registration_count']
 
-class RegistrationSerializer(serializers.ModelSerializer):
+class RegistrationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     event_title = serializers.CharField(source='event.title', read_only=True)
     user_name = serializers.CharField(source='user.name', read_only=True)
     
@@ -50,7 +65,16 @@ class RegistrationSerializer(serializers.ModelSerializer):
         model = Registration
         fields = '__all__'
 
-class AttendanceSerializer(serializers.ModelSerializer):
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.instance is not None:
+            # Moving a registration would skip the seat engine (capacity,
+            # registration_count, roster log); delete and register instead.
+            for name in ('event', 'user'):
+                fields[name].read_only = True
+        return fields
+
+class AttendanceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     event_title = serializers.CharField(source='event.title', read_only=True)
     user_name = serializers.CharField(source='user.name', read_only=True)
     
@@ -58,12 +82,12 @@ class AttendanceSerializer(serializers.ModelSerializer):
         model = Attendance
         fields = '__all__'
 
-class ResourceSerializer(serializers.ModelSerializer):
+class ResourceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Resource
         fields = '__all__'
 
-class EventResourceSerializer(serializers.ModelSerializer):
+class EventResourceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     event_title = serializers.CharField(source='event.title', read_only=True)
     resource_name = serializers.CharField(source='resource.resource_name', read_only=True)
     
@@ -0,0 +1,107 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+
+from .counters import COUNTED_MODELS, increment, adjust_registration_count
+from .kiosk import log_roster_changes
+from .models import (
+    Attendance, Category, Department, Event, EventResource, Registration, Resource, Role, RosterChange, User, Venue,
+)
+from .pagecache import bump
+from .search import refresh_search_tags, search_tags_for
+
+
+def _connect_counter(name, model):
+    def count_created(sender, instance, created, raw=False, **kwargs):
+        if created and not raw:
+            increment(name, 1)
+
+    def count_deleted(sender, instance, **kwargs):
+        increment(name, -1)
+
+    post_save.connect(count_created, sender=model, weak=False, dispatch_uid=f'counter_created_{name}')
+    post_delete.connect(count_deleted, sender=model, weak=False, dispatch_uid=f'counter_deleted_{name}')
+
+
+for _name, _model in COUNTED_MODELS.items():
+    _connect_counter(_name, _model)
+
+
+def registration_created(sender, instance, created, raw=False, **kwargs):
+    # register_user() claims the seat itself before inserting.
+    if created and not raw and not getattr(instance, '_seat_claimed', False):
+        adjust_registration_count(instance.event_id, 1)
+
+
+def registration_deleted(sender, instance, **kwargs):
+    adjust_registration_count(instance.event_id, -1)
+
+
+post_save.connect(registration_created, sender=Registration, dispatch_uid='event_registration_count_created')
+post_delete.connect(registration_deleted, sender=Registration, dispatch_uid='event_registration_count_deleted')
+
+
+def log_registration_added(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        log_roster_changes(instance.event_id, [instance.user_id], RosterChange.ADD)
+
+
+def log_registration_removed(sender, instance, **kwargs):
+    log_roster_changes(instance.event_id, [instance.user_id], RosterChange.REMOVE)
+
+
+def purge_roster_log(sender, instance, **kwargs):
+    RosterChange.objects.filter(event_id=instance.event_id).delete()
+
+
+post_save.connect(log_registration_added, sender=Registration, dispatch_uid='roster_change_added')
+post_delete.connect(log_registration_removed, sender=Registration, dispatch_uid='roster_change_removed')
+post_delete.connect(purge_roster_log, sender=Event, dispatch_uid='roster_change_purge')
+
+
+def set_search_tags(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'search_tags' not in update_fields):
+        return
+    instance.search_tags = search_tags_for(
+        instance.category.name if instance.category_id else None,
+        instance.venue.name if instance.venue_id else None,
+    )
+
+
+def remember_name(sender, instance, raw=False, **kwargs):
+    # Only a rename needs the events' search_tags rewritten.
+    instance._previous_name = None
+    if not raw and instance.pk is not None:
+        instance._previous_name = sender.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+
+
+def rename_search_tags(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw and getattr(instance, '_previous_name', None) not in (None, instance.name):
+        field = 'category' if sender is Category else 'venue'
+        refresh_search_tags(Event.objects.filter(**{field: instance}))
+
+
+pre_save.connect(set_search_tags, sender=Event, dispatch_uid='event_search_tags')
+for _model in (Category, Venue):
+    pre_save.connect(remember_name, sender=_model, dispatch_uid=f'search_tags_name_{_model.__name__}')
+    post_save.connect(rename_search_tags, sender=_model, dispatch_uid=f'search_tags_rename_{_model.__name__}')
+
+
+# Page cache and ETag generations (stud/pagecache.py). A registration also
+# changes its event's registration_count.
+GENERATION_SOURCES = {
+    Role: (Role,), Department: (Department,), User: (User,), Venue: (Venue,), Category: (Category,),
+    Resource: (Resource,), Event: (Event,), EventResource: (EventResource,), Attendance: (Attendance,),
+    Registration: (Registration, Event),
+}
+
+
+def _connect_page_cache(model, generations):
+    def invalidate(sender, raw=False, **kwargs):
+        if not raw:
+            bump(*generations)
+
+    post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=f'page_cache_saved_{model.__name__}')
+    post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=f'page_cache_deleted_{model.__name__}')
+
+
+for _model, _generations in GENERATION_SOURCES.items():
+    _connect_page_cache(_model, _generations)
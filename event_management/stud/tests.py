@@ -1,3 +1,556 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.test import AsyncClient, Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .availability import OverAllocated, allocate, availability, peak_usage, usage_timeline
+from .counters import get_totals, registration_total
+from .imports import copy_columns
+from .kiosk import roster_delta, roster_snapshot
+from .pagination import encode_cursor, keyset_paginate
+from .models import (
+    Role, Department, User, Venue, Category,
+    Event, Registration, Attendance, Resource, EventResource, RosterChange,
+    EventDetailsView, EventRegistrationSummaryView, call_register_user_for_event,
+)
+from .registrations import bulk_register, register_user
+from .routers import PRIMARY, STICKY_COOKIE, use_replica
+from . import scheduler
+from .venues import VenueConflict, VenueTooSmall, book_venue, check_booking, free_slots
+
+# A second, independent test database standing in for a read replica. It has
+# to exist before the runner sets up test databases, hence module level.
+REPLICA = 'replica_test'
+if REPLICA not in connections.settings:
+    connections.settings[REPLICA] = connections.configure_settings(
+        {PRIMARY: connections.settings[PRIMARY], REPLICA: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}
+    )[REPLICA]
+
+
+class APIQueryCountTests(TestCase):
+    """Every list endpoint must render a page in one query, however many rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(role_name='Student')
+        dept = Department.objects.create(dept_name='Computer Science', dept_code='CS')
+        venue = Venue.objects.create(name='Main Hall', capacity=500)
+        category = Category.objects.create(name='Technical')
+        resource = Resource.objects.create(resource_name='Projector', total_quantity=4)
+        cls.users = [
+            User.objects.create(name=f'Student {i}', roll_no=f'CS{i:03}', role=role, dept=dept)
+            for i in range(6)
+        ]
+        cls.events = [
+            Event.objects.create(
+                title=f'Event {i}', category=category, venue=venue,
+                organizer=cls.users[0], capacity=100, status='scheduled',
+            )
+            for i in range(3)
+        ]
+        for event in cls.events:
+            EventResource.objects.create(event=event, resource=resource, quantity_required=1)
+            for user in cls.users:
+                Registration.objects.create(event=event, user=user, registered_at=timezone.now())
+                Attendance.objects.create(event=event, user=user, present=True)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def assertListQueries(self, url, expected_rows):
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), expected_rows)
+        return response.json()['results']
+
+    def test_list_endpoints_use_one_query(self):
+        cases = {
+            '/api/roles/': 1,
+            '/api/departments/': 1,
+            '/api/users/': 6,
+            '/api/venues/': 1,
+            '/api/categories/': 1,
+            '/api/events/': 3,
+            '/api/registrations/': 18,
+            '/api/attendance/': 18,
+            '/api/resources/': 1,
+            '/api/event-resources/': 3,
+        }
+        for url, rows in cases.items():
+            with self.subTest(url=url):
+                self.assertListQueries(url, rows)
+
+    def test_related_names_are_rendered(self):
+        results = self.assertListQueries('/api/registrations/', 18)
+        self.assertEqual(results[0]['event_title'], 'Event 0')
+        self.assertEqual(results[0]['user_name'], 'Student 0')
+        user = self.assertListQueries('/api/users/', 6)[0]
+        self.assertEqual((user['role_name'], user['dept_name']), ('Student', 'Computer Science'))
+        self.assertNotIn('password_hash', user)
+
+    def test_sparse_fieldsets(self):
+        results = self.assertListQueries('/api/events/?fields=event_id,title,venue_name', 3)
+        self.assertEqual(set(results[0]), {'event_id', 'title', 'venue_name'})
+
+    def test_cursor_pagination(self):
+        response = self.client.get('/api/registrations/?page_size=5')
+        first = response.json()
+        self.assertEqual(len(first['results']), 5)
+        self.assertIsNone(first['previous'])
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 5)
+        self.assertFalse(
+            {r['reg_id'] for r in first['results']} & {r['reg_id'] for r in second['results']}
+        )
+
+    def test_registration_create_respects_capacity(self):
+        event = Event.objects.create(title='Tiny', capacity=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            ok = self.client.post('/api/registrations/', {'event': event.event_id, 'user': self.users[0].user_id})
+        self.assertEqual(ok.status_code, 201)
+        full = self.client.post('/api/registrations/', {'event': event.event_id, 'user': self.users[1].user_id})
+        self.assertEqual(full.status_code, 400)
+        event.refresh_from_db()
+        self.assertEqual(event.registration_count, 1)
+        self.assertEqual(get_totals()['registrations'], Registration.objects.count())
+
+    def test_registration_total_is_cached_until_a_registration_changes(self):
+        late = User.objects.create(name='Late Student', roll_no='CS999')
+        with self.captureOnCommitCallbacks(execute=True):
+            registration = Registration.objects.create(event=self.events[0], user=late)
+        self.assertEqual(registration_total(), 19)
+        with self.assertNumQueries(1):  # the counter rows; the sum comes from the cache
+            self.assertEqual(get_totals()['registrations'], 19)
+        with self.captureOnCommitCallbacks(execute=True):
+            registration.delete()
+        self.assertEqual(registration_total(), 18)
+
+    def test_registration_update_cannot_move_seats(self):
+        event = Event.objects.create(title='Tiny', capacity=1)
+        registration = Registration.objects.get(event=self.events[0], user=self.users[0])
+        response = self.client.patch(
+            f'/api/registrations/{registration.reg_id}/',
+            {'event': event.event_id, 'user': self.users[1].user_id, 'status': 'waitlisted'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        registration.refresh_from_db()
+        self.assertEqual((registration.event_id, registration.user_id), (self.events[0].event_id, self.users[0].user_id))
+        self.assertEqual(registration.status, 'waitlisted')
+        event.refresh_from_db()
+        self.assertEqual(event.registration_count, 0)
+
+
+class KeysetPaginationTests(TestCase):
+    """Paging both ways over a nullable sort key with ties, across page boundaries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        noon = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        starts = [noon, None, noon, noon + timedelta(days=1), None, noon, None, noon - timedelta(days=1)]
+        cls.events = [Event.objects.create(title=f'Page {i}', start_datetime=start) for i, start in enumerate(starts)]
+
+    def expected(self, descending):
+        dated = sorted((e for e in self.events if e.start_datetime), key=lambda e: (e.start_datetime, e.event_id),
+                       reverse=descending)
+        undated = sorted((e.event_id for e in self.events if not e.start_datetime), reverse=descending)
+        # NULL sort keys come after all others in either direction.
+        return [e.event_id for e in dated] + undated
+
+    def page(self, ordering, cursor=None, page_size=3):
+        params = {'page_size': page_size, **({'cursor': cursor} if cursor else {})}
+        return keyset_paginate(RequestFactory().get('/events/', params), Event.objects.all(), ordering)
+
+    def walk(self, ordering, page_size):
+        pages = [self.page(ordering, page_size=page_size)]
+        while pages[-1].has_next:
+            pages.append(self.page(ordering, pages[-1].next_cursor, page_size))
+        return pages
+
+    def test_forward_and_back(self):
+        for ordering in (('start_datetime', 'event_id'), ('-start_datetime', '-event_id')):
+            for page_size in (1, 2, 3):
+                with self.subTest(ordering=ordering, page_size=page_size):
+                    pages = self.walk(ordering, page_size)
+                    ids = [[e.event_id for e in page] for page in pages]
+                    self.assertEqual(sum(ids, []), self.expected(ordering[0].startswith('-')))
+                    self.assertFalse(pages[0].has_previous)
+                    self.assertTrue(all(len(page) == page_size for page in pages[:-1]))
+
+                    # Walk back from the last page, through the NULL block, to the first.
+                    back, page = [ids[-1]], pages[-1]
+                    while page.has_previous:
+                        page = self.page(ordering, page.prev_cursor, page_size)
+                        back.append([e.event_id for e in page])
+                    self.assertEqual(back[::-1], ids)
+
+    def test_malformed_cursors_start_over(self):
+        first = [e.event_id for e in self.page(('start_datetime', 'event_id'))]
+        for cursor in ('garbage', encode_cursor([1], 'n'), encode_cursor([None, 1], 'x'),
+                       encode_cursor(['not a date', 1], 'n'), 'eyJ2IjpbXX0'):
+            with self.subTest(cursor=cursor):
+                page = self.page(('start_datetime', 'event_id'), cursor)
+                self.assertEqual([e.event_id for e in page], first)
+                self.assertFalse(page.has_previous)
+
+
+class CopyColumnsTests(TestCase):
+    """COPY (PostgreSQL imports and seeding) must write every NOT NULL column."""
+
+    def test_not_null_columns_are_written(self):
+        samples = {
+            User: User(name='Copy'), Event: Event(title='Copy'),
+            Registration: Registration(event_id=1, user_id=1), Attendance: Attendance(event_id=1, user_id=1),
+            EventResource: EventResource(event_id=1, resource_id=1, quantity_required=1),
+        }
+        for model, obj in samples.items():
+            with self.subTest(model=model.__name__):
+                fields = copy_columns(model, [obj])
+                self.assertNotIn(model._meta.pk, fields)
+                for f in model._meta.concrete_fields:
+                    if f.null or f.primary_key:
+                        continue
+                    self.assertIn(f, fields)
+                    self.assertIsNotNone(f.pre_save(obj, True), f.name)
+
+    def test_seeded_primary_keys_are_written(self):
+        # seed_scale assigns user and event ids itself.
+        self.assertIn(User._meta.pk, copy_columns(User, [User(user_id=7, name='Copy')]))
+        self.assertIn(Event._meta.pk, copy_columns(Event, [Event(event_id=7, title='Copy')]))
+
+
+class KioskSyncTests(TestCase):
+    """Roster versions count up per event, so a kiosk can resume from any version it saw."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create(name=f'Kiosk {i}', roll_no=f'KS{i:03}') for i in range(4)]
+        cls.event = Event.objects.create(title='Kiosk Event', capacity=10)
+        cls.other = Event.objects.create(title='Other Event', capacity=10)
+
+    def test_versions_are_per_event_and_contiguous(self):
+        register_user(self.event.event_id, self.users[0].user_id)
+        register_user(self.other.event_id, self.users[0].user_id)
+        bulk_register(self.event.event_id, user_ids=[u.user_id for u in self.users[1:3]])
+        Registration.objects.get(event=self.event, user=self.users[1]).delete()
+
+        self.assertEqual(
+            list(RosterChange.objects.filter(event_id=self.event.event_id).order_by('version')
+                 .values_list('version', 'action')),
+            [(1, 'add'), (2, 'add'), (3, 'add'), (4, 'remove')],
+        )
+        self.assertEqual(roster_snapshot(self.event.event_id)['version'], 4)
+        self.assertEqual(roster_snapshot(self.other.event_id)['version'], 1)
+
+        delta = roster_delta(self.event.event_id, since=2)
+        self.assertEqual(delta['version'], 4)
+        self.assertEqual([change[:3] for change in delta['changes']],
+                         [[3, 'add', self.users[2].user_id], [4, 'remove', self.users[1].user_id]])
+
+
+    def test_checkin_present_must_be_boolean(self):
+        register_user(self.event.event_id, self.users[0].user_id)
+        url = f'/kiosk/events/{self.event.event_id}/checkins/'
+
+        def upload(present):
+            checkin = {'user_id': self.users[0].user_id, 'checked_at': timezone.now().isoformat(), 'present': present}
+            return self.client.post(url, {'checkins': [checkin]}, content_type='application/json')
+
+        self.assertEqual(upload('false').json()['accepted'], 1)
+        self.assertFalse(Attendance.objects.get(event=self.event).present)
+        self.assertEqual(upload('yes').status_code, 400)
+        self.assertFalse(Attendance.objects.get(event=self.event).present)
+        self.assertEqual(upload(True).json()['accepted'], 1)
+        self.assertTrue(Attendance.objects.get(event=self.event).present)
+
+    def test_checkin_upload_needs_csrf_token(self):
+        register_user(self.event.event_id, self.users[0].user_id)
+        kiosk = Client(enforce_csrf_checks=True)
+        url = f'/kiosk/events/{self.event.event_id}/checkins/'
+        body = {'checkins': [{'user_id': self.users[0].user_id, 'checked_at': timezone.now().isoformat()}]}
+        self.assertEqual(kiosk.post(url, body, content_type='application/json').status_code, 403)
+        self.assertFalse(Attendance.objects.exists())
+
+        kiosk.get(f'/kiosk/events/{self.event.event_id}/roster/')
+        token = kiosk.cookies['csrftoken'].value
+        response = kiosk.post(url, body, content_type='application/json', headers={'X-CSRFToken': token})
+        self.assertEqual(response.json()['accepted'], 1)
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Routing against two real databases: the test 'default' and a separate
+    SQLite replica that deliberately holds different rows, so every
+    assertion shows which database answered.
+    """
+
+    databases = {PRIMARY, REPLICA}
+
+    def setUp(self):
+        # Per test, not per class: the router refuses to migrate (and so to
+        # flush) configured replicas, and the flush runs after cleanups.
+        self.enterContext(override_settings(REPLICA_DATABASES=[REPLICA]))
+        self.client = APIClient()
+        self.user = User.objects.create(name='Primary Student', roll_no='P001')
+        self.event = Event.objects.create(title='Primary Event', capacity=10, status='scheduled')
+        Event.objects.using(REPLICA).create(title='Replica Event', capacity=10, status='scheduled')
+
+    def titles(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()['results']]
+
+    def test_view_models_read_from_replica_outside_requests(self):
+        self.assertEqual(list(EventDetailsView.objects.values_list('title', flat=True)), ['Replica Event'])
+        self.assertEqual(list(EventRegistrationSummaryView.objects.values_list('title', flat=True)), ['Replica Event'])
+        self.assertEqual(list(Event.objects.values_list('title', flat=True)), ['Primary Event'])
+
+    def test_get_requests_read_from_replica(self):
+        self.assertEqual(self.titles(self.client.get('/api/events/')), ['Replica Event'])
+
+    def test_writes_go_to_primary_and_stick(self):
+        response = self.client.post('/api/registrations/', {'event': self.event.event_id, 'user': self.user.user_id})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Registration.objects.using(PRIMARY).filter(event=self.event, user=self.user).exists())
+        self.assertFalse(Registration.objects.using(REPLICA).exists())
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+        # The writer reads its own write from the primary...
+        self.assertEqual(len(self.client.get('/api/registrations/').json()['results']), 1)
+        self.assertEqual(self.titles(self.client.get('/api/events/')), ['Primary Event'])
+        # ...and everyone else, or the writer once the cookie expires, reads the replica.
+        self.client.cookies.pop(STICKY_COOKIE)
+        self.assertEqual(self.titles(self.client.get('/api/events/')), ['Replica Event'])
+
+    def test_get_delete_links_use_primary_and_stick(self):
+        # The replica has not seen this registration yet; its delete link must still find it.
+        registration = Registration.objects.create(event=self.event, user=self.user, registered_at=timezone.now())
+        response = self.client.get(f'/registrations/delete/{registration.reg_id}/', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Registration.objects.using(PRIMARY).exists())
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+    def test_streamed_exports_read_from_replica(self):
+        replica_user = User.objects.using(REPLICA).create(name='Replica Student', roll_no='R001')
+        # bulk_create: the registration signals would write to the primary.
+        Registration.objects.using(REPLICA).bulk_create([Registration(
+            event=Event.objects.using(REPLICA).get(), user=replica_user, registered_at=timezone.now(),
+        )])
+        response = self.client.get('/exports/registrations/', HTTP_HOST='localhost')
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('Replica Student', body)
+
+    def test_transactions_and_procedures_read_primary(self):
+        with use_replica(REPLICA):
+            self.assertEqual(Event.objects.get().title, 'Replica Event')
+            with transaction.atomic():
+                self.assertEqual(Event.objects.get().title, 'Primary Event')
+            result = call_register_user_for_event(self.event.event_id, self.user.user_id)
+        self.assertTrue(result['success'], result['message'])
+        self.assertEqual(Registration.objects.using(PRIMARY).count(), 1)
+
+
+class AsyncViewTests(TestCase):
+    """The async pages render under ASGI and see rows of the surrounding transaction."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(name='Async Student', roll_no='AS001')
+        cls.event = Event.objects.create(
+            title='Async Event', capacity=10, status='scheduled', start_datetime=timezone.now() + timedelta(days=1),
+        )
+        Registration.objects.create(event=cls.event, user=user, registered_at=timezone.now())
+
+    async def test_pages_render(self):
+        client = AsyncClient()
+        for url, text in (('/', 'Async Event'), ('/events/', 'Async Event'), ('/events/?q=async', 'Async'),
+                          ('/events/summary/', 'Async Event'), ('/registrations/', 'Async Student')):
+            with self.subTest(url=url):
+                response = await client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, text)
+
+    async def test_export_streams_asynchronously(self):
+        response = await AsyncClient().get('/exports/registrations/?format=csv')
+        self.assertTrue(response.is_async)
+        body = b''.join([part async for part in response.streaming_content]).decode()
+        self.assertEqual(body.splitlines()[1].split(',')[2:4], ['AS001', 'Async Student'])
+
+
+class ResourceAvailabilityTests(TestCase):
+    """Units in use are the peak of overlapping allocations, not their sum."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.t0 = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        cls.projector = Resource.objects.create(resource_name='Projector', total_quantity=5)
+
+    def hours(self, start, end):
+        return self.t0 + timedelta(hours=start), self.t0 + timedelta(hours=end)
+
+    def event(self, start, end, quantity=0, **kwargs):
+        s, e = self.hours(start, end)
+        event = Event.objects.create(title=f'{start}-{end}', start_datetime=s, end_datetime=e, **kwargs)
+        if quantity:
+            EventResource.objects.create(event=event, resource=self.projector, quantity_required=quantity)
+        return event
+
+    def test_sweep_peak(self):
+        def h(n):
+            return self.t0 + timedelta(hours=n)
+
+        intervals = [(h(0), h(4), 2), (h(1), h(2), 1), (h(3), h(5), 3), (h(4), h(6), 1)]
+        self.assertEqual(usage_timeline(intervals),
+                         [(h(0), 2), (h(1), 3), (h(2), 2), (h(3), 5), (h(4), 4), (h(5), 1), (h(6), 0)])
+        self.assertEqual(peak_usage(intervals), 5)
+        # Clipped to a window that only sees the first two windows.
+        self.assertEqual(peak_usage(intervals, h(0), h(3)), 3)
+        # Back to back: the end applies before the start at the same instant.
+        self.assertEqual(peak_usage([(h(0), h(1), 4), (h(1), h(2), 4)]), 4)
+        self.assertEqual(peak_usage([]), 0)
+
+    def test_availability_counts_overlapping_events_only(self):
+        self.event(0, 2, quantity=2)
+        self.event(1, 3, quantity=2)
+        self.event(3, 4, quantity=5)  # back to back with the window below
+        self.event(1, 2, quantity=5, status=Event.Status.CANCELLED)
+        [row] = availability(*self.hours(0, 3))
+        self.assertEqual((row['peak_in_use'], row['available']), (4, 1))
+        [row] = availability(*self.hours(2, 3))
+        self.assertEqual((row['peak_in_use'], row['available']), (2, 3))
+
+    def test_allocate_checks_free_units(self):
+        self.event(0, 2, quantity=3)
+        overlapping = self.event(1, 3)
+        with self.assertRaises(OverAllocated):
+            allocate(overlapping.event_id, self.projector.resource_id, 3)
+        allocate(overlapping.event_id, self.projector.resource_id, 2)
+        # Starts when the first ends, so only the second event counts.
+        self.assertEqual(allocate(self.event(2, 4).event_id, self.projector.resource_id, 3).quantity_required, 3)
+        self.assertEqual(EventResource.objects.count(), 3)
+
+
+class VenueBookingTests(TestCase):
+    """Bookings conflict only when their half-open windows overlap."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.t0 = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        cls.hall = Venue.objects.create(name='Hall', capacity=100)
+        cls.room = Venue.objects.create(name='Room', capacity=20)
+
+    def hours(self, start, end):
+        return self.t0 + timedelta(hours=start), self.t0 + timedelta(hours=end)
+
+    def book(self, venue, start, end, **kwargs):
+        s, e = self.hours(start, end)
+        return Event.objects.create(title=f'{venue.name} {start}-{end}', venue=venue, start_datetime=s,
+                                    end_datetime=e, **kwargs)
+
+    def test_conflicts(self):
+        self.book(self.hall, 2, 4)
+        self.book(self.hall, 0, 8, status=Event.Status.CANCELLED)
+        for start, end in ((1, 3), (3, 5), (2, 4), (3, 3.5), (1, 5)):
+            with self.subTest(window=(start, end)), self.assertRaises(VenueConflict):
+                check_booking(self.hall, *self.hours(start, end))
+        # Back to back on either side, another venue, or the cancelled event's slot.
+        check_booking(self.hall, *self.hours(0, 2))
+        check_booking(self.hall, *self.hours(4, 6))
+        check_booking(self.room, *self.hours(2, 4))
+        with self.assertRaises(VenueTooSmall):
+            check_booking(self.room, *self.hours(0, 1), capacity=21)
+
+    def test_book_venue_saves_only_when_free(self):
+        existing = self.book(self.hall, 2, 4)
+        saved = []
+        with self.assertRaises(VenueConflict):
+            book_venue(lambda: saved.append(1), self.hall.venue_id, *self.hours(3, 5))
+        self.assertEqual(saved, [])
+        # Moving an event within its own slot does not conflict with itself.
+        book_venue(lambda: saved.append(1), self.hall.venue_id, *self.hours(3, 4), exclude_event_id=existing.event_id)
+        self.assertEqual(saved, [1])
+
+    def test_free_slots_merge_overlapping_bookings(self):
+        self.book(self.hall, 1, 3)
+        self.book(self.hall, 2, 4)  # overlaps the first; data imported around the checks
+        self.book(self.hall, 4, 5)  # back to back: no gap
+        self.book(self.hall, 6, 7)
+        self.book(self.hall, 9, 11)  # runs past the search window
+        [hall, room] = free_slots(*self.hours(0, 10))
+        self.assertEqual(hall['slots'], [self.hours(0, 1), self.hours(5, 6), self.hours(7, 9)])
+        self.assertEqual(room['slots'], [self.hours(0, 10)])
+
+        [hall] = free_slots(*self.hours(0, 10), min_seats=50, min_duration=timedelta(hours=2))
+        self.assertEqual((hall['name'], hall['slots']), ('Hall', [self.hours(7, 9)]))
+
+
+class SchedulerTests(TestCase):
+    """Greedy placement, least flexible first, with a reason for every event left out."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.t0 = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        cls.room = Venue.objects.create(name='Room', capacity=20)
+        cls.hall = Venue.objects.create(name='Hall', capacity=100)
+        cls.projector = Resource.objects.create(resource_name='Projector', total_quantity=2)
+        lecture = cls.event('Lecture', 10, 0, 2, venue=cls.room)
+        EventResource.objects.create(event=lecture, resource=cls.projector, quantity_required=1)
+
+        cls.roomy = cls.event('Roomy', 10, 0, 4)        # room is busy until 2
+        cls.tight = cls.event('Tight', 60, 0, 2)        # no slack: placed first, in the hall
+        cls.crowded = cls.event('Crowded', 60, 0, 3)    # only the hall seats it, and Tight has it
+        cls.huge = cls.event('Huge', 500, 0, 4)
+        cls.short = cls.event('Short', 5, 0, 1)
+        cls.needy = cls.event('Needy', 5, 0, 4)         # free venue at 2-4, but Roomy holds a projector
+        cls.undated = Event.objects.create(title='Undated', capacity=5)
+        for event, quantity in ((cls.roomy, 1), (cls.needy, 2)):
+            EventResource.objects.create(event=event, resource=cls.projector, quantity_required=quantity)
+
+    @classmethod
+    def event(cls, title, capacity, start, end, **kwargs):
+        s, e = cls.hours(start, end)
+        return Event.objects.create(title=title, capacity=capacity, start_datetime=s, end_datetime=e, **kwargs)
+
+    @classmethod
+    def hours(cls, start, end):
+        return cls.t0 + timedelta(hours=start), cls.t0 + timedelta(hours=end)
+
+    def test_calendar_is_free(self):
+        calendar = scheduler._Calendar([self.hours(2, 4), self.hours(1, 3), self.hours(6, 7)])
+        self.assertEqual(len(calendar.starts), 2)  # 1-3 and 2-4 merged
+        for (start, end), free in (((0, 1), True), ((4, 6), True), ((7, 9), True), ((0, 1.5), False),
+                                   ((3, 5), False), ((5, 6.5), False), ((6.5, 8), False), ((0, 10), False)):
+            with self.subTest(window=(start, end)):
+                self.assertEqual(calendar.is_free(*self.hours(start, end)), free)
+        calendar.add(*self.hours(4, 6))
+        self.assertFalse(calendar.is_free(*self.hours(4.5, 5)))
+
+    def test_greedy_placement_and_unplaced_reasons(self):
+        report = scheduler.schedule(duration=timedelta(hours=2))
+        self.assertEqual(
+            [(row['title'], row['venue'], (row['start_datetime'], row['end_datetime'])) for row in report['placed']],
+            [('Roomy', 'Room', self.hours(2, 4)), ('Tight', 'Hall', self.hours(0, 2))],
+        )
+        self.assertEqual([(row['title'], row['reason']) for row in report['unplaced']], [
+            ('Crowded', scheduler.NO_FREE_VENUE),
+            ('Huge', scheduler.NO_VENUE_BIG_ENOUGH),
+            ('Short', scheduler.WINDOW_TOO_SHORT),
+            ('Needy', scheduler.RESOURCES_UNAVAILABLE),
+            ('Undated', scheduler.NO_WINDOW),
+        ])
+        self.roomy.refresh_from_db()
+        self.assertEqual((self.roomy.venue, self.roomy.start_datetime), (self.room, self.hours(2, 4)[0]))
+        self.assertEqual(Event.objects.filter(venue__isnull=True).count(), 5)
+
+    def test_dry_run_rolls_back(self):
+        out = StringIO()
+        call_command('schedule_events', duration_minutes=120, dry_run=True, stdout=out)
+        output = out.getvalue()
+        self.assertIn(f'not placed #{self.huge.event_id} Huge: {scheduler.NO_VENUE_BIG_ENOUGH}', output)
+        self.assertIn('Dry run: 2 placed, 5 not placed', output)
+        self.assertEqual(Event.objects.filter(venue__isnull=True).count(), 7)
+        self.roomy.refresh_from_db()
+        self.assertEqual(self.roomy.start_datetime, self.hours(0, 4)[0])
@@ -0,0 +1,169 @@
+"""
+Per-request timing: SQL query count/time and template render time.
+
+Every database connection gets an ``execute_wrapper`` when it is created
+(``connection_created``). It charges each query to the request in the
+current context, so queries run on other threads on the request's behalf
+(stud.concurrency, async views) are counted too. ``ServerTimingMiddleware``
+reports the totals as a ``Server-Timing`` header (visible in the browser's
+network panel) and as one log line on the ``stud.timing`` logger, tagged
+with the resolved URL name. The same figures feed the Prometheus
+histograms in stud/metrics.py. The middleware works under WSGI and ASGI.
+
+Template time is measured by ``TimedDjangoTemplates``, a drop-in for the
+DjangoTemplates backend. Queries issued while a template renders (lazy
+querysets) are counted as SQL, not template time.
+
+The bookkeeping is two ``perf_counter`` calls per query and per render, so
+it is cheap enough to leave enabled. Streaming responses are timed up to the
+point the response is returned; queries run while the body streams are not
+included.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates, Template
+
+from .metrics import REQUESTS_IN_PROGRESS, observe_request
+
+logger = logging.getLogger('stud.timing')
+
+_current = contextvars.ContextVar('stud_request_timings', default=None)
+
+
+class RequestTimings:
+    __slots__ = ('queries', 'sql', 'template', 'render_depth', 'lock')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = 0.0
+        self.template = 0.0
+        self.render_depth = 0
+        self.lock = threading.Lock()
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            # Concurrent queries of one request add up, so sql may exceed total.
+            with self.lock:
+                self.sql += time.perf_counter() - started
+                self.queries += 1
+
+    def header(self, total):
+        return (
+            f'db;dur={self.sql * 1000:.1f};desc="{self.queries} queries", '
+            f'tpl;dur={self.template * 1000:.1f}, '
+            f'total;dur={total * 1000:.1f}'
+        )
+
+
+def _time_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.record_query(execute, sql, params, many, context)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+connection_created.connect(instrument_connection, dispatch_uid='stud.timing.instrument_connection')
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        # Only the outermost render is timed; nested render_to_string calls
+        # are already inside it.
+        timings.render_depth += 1
+        started, sql_before = time.perf_counter(), timings.sql
+        try:
+            return super().render(context, request)
+        finally:
+            timings.render_depth -= 1
+            if timings.render_depth == 0:
+                timings.template += time.perf_counter() - started - (timings.sql - sql_before)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend whose templates report render time."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings, token, started = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._stop(request, token)
+        return self._finish(request, response, timings, started)
+
+    async def __acall__(self, request):
+        timings, token, started = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._stop(request, token)
+        return self._finish(request, response, timings, started)
+
+    def _start(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        REQUESTS_IN_PROGRESS.labels(request.method).inc()
+        return timings, token, time.perf_counter()
+
+    def _stop(self, request, token):
+        _current.reset(token)
+        REQUESTS_IN_PROGRESS.labels(request.method).dec()
+
+    def _finish(self, request, response, timings, started):
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = timings.header(total)
+        match = request.resolver_match
+        view = match.url_name if match else None
+        size = None if response.streaming else len(response.content)
+        observe_request(view, request.method, response.status_code, total, timings.sql, size)
+        logger.info(
+            'view=%s method=%s status=%s total_ms=%.1f db_ms=%.1f queries=%d tpl_ms=%.1f',
+            view, request.method, response.status_code,
+            total * 1000, timings.sql * 1000, timings.queries, timings.template * 1000,
+            extra={
+                'view': view,
+                'method': request.method,
+                'status': response.status_code,
+                'total_ms': round(total * 1000, 1),
+                'db_ms': round(timings.sql * 1000, 1),
+                'queries': timings.queries,
+                'tpl_ms': round(timings.template * 1000, 1),
+            },
+        )
+        return response
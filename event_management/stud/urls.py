@@ -23,6 +23,7 @@ urlpatterns = [
     # Venues
     path('venues/', views.venue_list, name='venue_list'),
     path('venues/create/', views.venue_create, name='venue_create'),
+    path('venues/free-slots/', views.venue_free_slots, name='venue_free_slots'),
     path('venues/delete/<int:pk>/', views.venue_delete, name='venue_delete'),
     
     # Categories
@@ -39,6 +40,7 @@ urlpatterns = [
     # Registrations
     path('registrations/', views.registration_list, name='registration_list'),
     path('registrations/create/', views.registration_create, name='registration_create'),
+    path('registrations/bulk/', views.registration_bulk_create, name='registration_bulk_create'),
     path('registrations/delete/<int:pk>/', views.registration_delete, name='registration_delete'),
     
     # Attendance
@@ -46,6 +48,25 @@ urlpatterns = [
     path('attendance/create/', views.attendance_create, name='attendance_create'),
     path('attendance/delete/<int:pk>/', views.attendance_delete, name='attendance_delete'),
     path('attendance/event/<int:event_id>/', views.attendance_by_event, name='attendance_by_event'),
+    path('attendance/event/<int:event_id>/roster/', views.attendance_roster, name='attendance_roster'),
+    
+    # Kiosk Sync
+    path('kiosk/events/<int:event_id>/roster/', views.kiosk_roster, name='kiosk_roster'),
+    path('kiosk/events/<int:event_id>/checkins/', views.kiosk_checkins, name='kiosk_checkins'),
+    
+    # Exports
+    path('exports/registrations/', views.data_export, {'kind': 'registrations'}, name='export_registrations'),
+    path('exports/attendance/', views.data_export, {'kind': 'attendance'}, name='export_attendance'),
+    
+    # Imports
+    path('imports/', views.data_import, name='data_import'),
+    
+    # Autocomplete
+    path('autocomplete/users/', views.autocomplete_users, name='autocomplete_users'),
+    path('autocomplete/events/', views.autocomplete_events, name='autocomplete_events'),
+    
+    # Metrics
+    path('metrics', views.metrics, name='metrics'),
     
     # Resources
     path('resources/', views.resource_list, name='resource_list'),
@@ -0,0 +1,121 @@
+"""
+Venue booking: conflict detection and free-slot search.
+
+A venue is booked for the ``[start_datetime, end_datetime)`` window of every
+non-cancelled event held there. Two bookings conflict when their windows
+overlap; back-to-back events do not. An event also may not plan for more
+attendees than the venue seats.
+
+``book_venue`` locks the Venue row, checks, and only then saves, so two
+concurrent bookings of the same venue cannot both succeed.
+
+Both the conflict lookup and ``free_slots`` are answered from
+``events_venue_window_idx`` (venue, end_datetime, start_datetime): the venue
+is an equality match and ``end_datetime > :start`` skips every past event.
+Free windows are the gaps left after merging the sorted bookings of each
+venue in one pass.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+
+from .models import Event, Venue
+
+
+class BookingError(Exception):
+    """Base class for booking failures that should be shown to the user."""
+
+
+class VenueConflict(BookingError):
+    pass
+
+
+class VenueTooSmall(BookingError):
+    pass
+
+
+def bookings(start, end, venue_ids=None, exclude_event_id=None):
+    """Non-cancelled events with a venue overlapping ``[start, end)``."""
+    qs = Event.objects.filter(
+        venue__isnull=False, end_datetime__gt=start, start_datetime__lt=end,
+    ).exclude(status=Event.Status.CANCELLED)
+    if venue_ids is not None:
+        qs = qs.filter(venue_id__in=venue_ids)
+    if exclude_event_id is not None:
+        qs = qs.exclude(event_id=exclude_event_id)
+    return qs
+
+
+def check_booking(venue, start, end, capacity=None, exclude_event_id=None):
+    """Raise VenueTooSmall or VenueConflict if ``venue`` cannot host the event."""
+    if capacity is not None and int(capacity) > venue.capacity:
+        raise VenueTooSmall(f'{venue.name} seats {venue.capacity}; the event plans for {capacity}')
+    if start is None or end is None:
+        return
+    if not start < end:
+        raise BookingError('End time must be after the start time')
+    clash = (
+        bookings(start, end, [venue.venue_id], exclude_event_id)
+        .order_by('start_datetime').only('title', 'start_datetime', 'end_datetime').first()
+    )
+    if clash is not None:
+        raise VenueConflict(
+            f'{venue.name} is booked for "{clash.title}" '
+            f'from {clash.start_datetime:%Y-%m-%d %H:%M} to {clash.end_datetime:%Y-%m-%d %H:%M}'
+        )
+
+
+def book_venue(save, venue_id, start, end, capacity=None, status=None, exclude_event_id=None):
+    """
+    Check the booking with the venue row locked, then call ``save()`` and
+    return its result. Events without a venue or that are cancelled are
+    saved without checks.
+    """
+    with transaction.atomic():
+        if venue_id and status != Event.Status.CANCELLED:
+            venue = Venue.objects.select_for_update().filter(venue_id=venue_id).first()
+            if venue is None:
+                raise BookingError(f'Venue {venue_id} does not exist')
+            check_booking(venue, start, end, capacity, exclude_event_id)
+        return save()
+
+
+def free_slots(start, end, venue_id=None, min_seats=None, min_duration=None):
+    """
+    Open windows within ``[start, end)`` per venue: ``[{venue_id, name,
+    capacity, slots: [(from, to), ...]}, ...]``. Restrict to one venue or to
+    venues seating at least ``min_seats``; drop gaps shorter than
+    ``min_duration`` (a timedelta).
+    """
+    if not start < end:
+        raise ValueError('start must be before end')
+    venues = Venue.objects.order_by('venue_id')
+    if venue_id is not None:
+        venues = venues.filter(venue_id=venue_id)
+    if min_seats is not None:
+        venues = venues.filter(capacity__gte=min_seats)
+    venues = list(venues.values('venue_id', 'name', 'capacity'))
+
+    booked = defaultdict(list)
+    rows = (
+        bookings(start, end, [v['venue_id'] for v in venues])
+        .order_by('venue_id', 'start_datetime')
+        .values_list('venue_id', 'start_datetime', 'end_datetime')
+    )
+    for vid, s, e in rows:
+        booked[vid].append((s, e))
+
+    min_duration = min_duration or timedelta(0)
+    result = []
+    for venue in venues:
+        slots, cursor = [], start
+        for s, e in booked[venue['venue_id']]:
+            if s > cursor and s - cursor >= max(min_duration, timedelta.resolution):
+                slots.append((cursor, s))
+            cursor = max(cursor, e)
+        if end > cursor and end - cursor >= max(min_duration, timedelta.resolution):
+            slots.append((cursor, end))
+        result.append(dict(venue, slots=slots))
+    return result
@@ -1,39 +1,89 @@
+import csv
+import io
+import json
+import re
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Count, Q
-from datetime import datetime
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse, Http404
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import require_GET, require_POST
+from django.core.exceptions import FieldDoesNotExist
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from datetime import datetime, timedelta
 from .models import (
     Role, Department, User, Venue, Category,
     Event, Registration, Attendance, Resource, EventResource,
-    EventDetailsView, UserRegistrationsView, EventRegistrationSummaryView,
+    EventDetailsView, UserRegistrationsView,
     call_register_user_for_event, call_mark_attendance
 )
+from .pagination import KeysetPage, akeyset_paginate, keyset_paginate
+from .pagecache import cache_page, conditional_page, not_modified, set_validators
+from .concurrency import aiterate, alist, gather_queries
+from .counters import get_totals
+from .routers import writes
+from .registrations import RegistrationError, bulk_register, register_user
+from .serializers import (
+    RoleSerializer, DepartmentSerializer, UserSerializer,
+    VenueSerializer, CategorySerializer, EventSerializer,
+    RegistrationSerializer, AttendanceSerializer,
+    ResourceSerializer, EventResourceSerializer
+)
+from .attendance import attendance_counts, mark_attendance, roster_queryset
+from .kiosk import apply_checkins, roster_delta, roster_snapshot
+from .exports import EXPORT_CHUNK_SIZE, EXPORTS, FORMATS, export_queryset, iterate_rows
+from .imports import IMPORTERS, import_csv
+from .availability import AllocationError, allocate, availability, parse_window
+from .venues import BookingError, book_venue, free_slots
+from .scheduler import parse_options as parse_schedule_options, schedule as schedule_events
+from .autocomplete import parse_limit as parse_autocomplete_limit, suggest_events, suggest_users
+from .search import highlights as search_highlights, search as search_events
+from . import metrics as prometheus_metrics
 
 # Dashboard View - Using Views
-def dashboard(request):
-    # Using database views for better performance
-    event_summaries = EventRegistrationSummaryView.objects.all()
-    event_details = EventDetailsView.objects.filter(
-        start_datetime__gte=datetime.now()
-    ).order_by('start_datetime')[:5]
-    
-    recent_registrations = UserRegistrationsView.objects.order_by('-registered_at')[:5]
-    
+def dashboard_queries():
+    """The dashboard's independent reads, as zero-argument callables."""
+    return (
+        get_totals,
+        # Cancelled and completed events are not "upcoming"; served by events_upcoming_idx.
+        lambda: list(EventDetailsView.objects.filter(
+            status=Event.Status.SCHEDULED, start_datetime__gte=timezone.now()
+        ).order_by('start_datetime')[:5]),
+        lambda: list(UserRegistrationsView.objects.order_by('-registered_at')[:5]),
+        lambda: list(Event.objects.only(
+            'event_id', 'title', 'capacity', 'registration_count'
+        ).order_by('event_id')[:5]),
+    )
+
+async def dashboard(request):
+    # The reads are independent, so they run concurrently (stud/concurrency.py)
+    totals, event_details, recent_registrations, event_summaries = await gather_queries(*dashboard_queries())
+
     context = {
-        'total_events': Event.objects.count(),
-        'total_users': User.objects.count(),
-        'total_venues': Venue.objects.count(),
-        'total_registrations': Registration.objects.count(),
+        'total_events': totals['events'],
+        'total_users': totals['users'],
+        'total_venues': totals['venues'],
+        'total_registrations': totals['registrations'],
         'upcoming_events': event_details,
         'recent_registrations': recent_registrations,
-        'event_summaries': event_summaries[:5],
+        'event_summaries': event_summaries,
     }
-    return render(request, 'dashboard.html', context)
+    return await sync_to_async(render)(request, 'dashboard.html', context)
 
 # Role Views
+@conditional_page(Role)
+@cache_page(Role)
 def role_list(request):
-    roles = Role.objects.all()
-    return render(request, 'roles/list.html', {'roles': roles})
+    page = keyset_paginate(request, Role.objects.all(), ('role_id',))
+    return render(request, 'roles/list.html', {'roles': page.object_list, 'page': page})
 
 def role_create(request):
     if request.method == 'POST':
@@ -46,6 +96,7 @@ def role_create(request):
         return redirect('role_list')
     return render(request, 'roles/form.html')
 
+@writes
 def role_delete(request, pk):
     role = get_object_or_404(Role, role_id=pk)
     role.delete()
@@ -53,9 +104,11 @@ def role_delete(request, pk):
     return redirect('role_list')
 
 # Department Views
+@conditional_page(Department)
+@cache_page(Department)
 def department_list(request):
-    departments = Department.objects.all()
-    return render(request, 'departments/list.html', {'departments': departments})
+    page = keyset_paginate(request, Department.objects.all(), ('dept_id',))
+    return render(request, 'departments/list.html', {'departments': page.object_list, 'page': page})
 
 def department_create(request):
     if request.method == 'POST':
@@ -69,6 +122,7 @@ def department_create(request):
         return redirect('department_list')
     return render(request, 'departments/form.html')
 
+@writes
 def department_delete(request, pk):
     department = get_object_or_404(Department, dept_id=pk)
     department.delete()
@@ -76,9 +130,11 @@ def department_delete(request, pk):
     return redirect('department_list')
 
 # User Views
+@conditional_page(User, Role, Department)
 def user_list(request):
     users = User.objects.all().select_related('role', 'dept')
-    return render(request, 'users/list.html', {'users': users})
+    page = keyset_paginate(request, users, ('user_id',))
+    return render(request, 'users/list.html', {'users': page.object_list, 'page': page})
 
 def user_create(request):
     if request.method == 'POST':
@@ -101,6 +157,7 @@ def user_create(request):
         'departments': departments
     })
 
+@writes
 def user_delete(request, pk):
     user = get_object_or_404(User, user_id=pk)
     user.delete()
@@ -108,9 +165,38 @@ def user_delete(request, pk):
     return redirect('user_list')
 
 # Venue Views
+def _parse_free_slot_query(params):
+    """start/end plus optional venue, min_seats, min_minutes; raises ValueError."""
+    start, end = parse_window(params.get('start'), params.get('end'))
+    kwargs = {}
+    if params.get('venue'):
+        kwargs['venue_id'] = int(params['venue'])
+    if params.get('min_seats'):
+        kwargs['min_seats'] = int(params['min_seats'])
+    if params.get('min_minutes'):
+        kwargs['min_duration'] = timedelta(minutes=int(params['min_minutes']))
+    return start, end, kwargs
+
+def venue_free_slots(request):
+    """Find open windows for one venue or every venue with enough seats"""
+    results = None
+    if request.GET.get('start') or request.GET.get('end'):
+        try:
+            start, end, kwargs = _parse_free_slot_query(request.GET)
+            results = free_slots(start, end, **kwargs)
+        except ValueError as e:
+            messages.error(request, f'Search failed: {e}')
+    return render(request, 'venues/free_slots.html', {
+        'venues': Venue.objects.order_by('name'),
+        'results': results,
+        'query': request.GET,
+    })
+
+@conditional_page(Venue)
+@cache_page(Venue)
 def venue_list(request):
-    venues = Venue.objects.all()
-    return render(request, 'venues/list.html', {'venues': venues})
+    page = keyset_paginate(request, Venue.objects.all(), ('venue_id',))
+    return render(request, 'venues/list.html', {'venues': page.object_list, 'page': page})
 
 def venue_create(request):
     if request.method == 'POST':
@@ -123,6 +209,7 @@ def venue_create(request):
         return redirect('venue_list')
     return render(request, 'venues/form.html')
 
+@writes
 def venue_delete(request, pk):
     venue = get_object_or_404(Venue, venue_id=pk)
     venue.delete()
@@ -130,9 +217,11 @@ def venue_delete(request, pk):
     return redirect('venue_list')
 
 # Category Views
+@conditional_page(Category)
+@cache_page(Category)
 def category_list(request):
-    categories = Category.objects.all()
-    return render(request, 'categories/list.html', {'categories': categories})
+    page = keyset_paginate(request, Category.objects.all(), ('category_id',))
+    return render(request, 'categories/list.html', {'categories': page.object_list, 'page': page})
 
 def category_create(request):
     if request.method == 'POST':
@@ -146,6 +235,7 @@ def category_create(request):
         return redirect('category_list')
     return render(request, 'categories/form.html')
 
+@writes
 def category_delete(request, pk):
     category = get_object_or_404(Category, category_id=pk)
     category.delete()
@@ -153,53 +243,115 @@ def category_delete(request, pk):
     return redirect('category_list')
 
 # Event Views - Using EventDetailsView
-def event_list(request):
-    # Use the view for better display
-    events = EventDetailsView.objects.all()
-    return render(request, 'events/list.html', {'events': events})
+SEARCH_PAGE_SIZE = 25
+
+@conditional_page(Event, Category, Venue, User, Department)
+async def event_list(request):
+    query = request.GET.get('q', '').strip()
+    if query:
+        page = await _event_search_page(request, query)
+    else:
+        # Use the view for better display, newest events first
+        page = await akeyset_paginate(request, EventDetailsView.objects.all(), ('-start_datetime', '-event_id'))
+    return await sync_to_async(render)(
+        request, 'events/list.html', {'events': page.object_list, 'page': page, 'query': query}
+    )
+
+async def _event_search_page(request, query):
+    # Results are in rank order, so the cursor is a plain offset here.
+    try:
+        offset = max(0, int(request.GET.get('cursor') or 0))
+    except ValueError:
+        offset = 0
+    matches = search_events(Event.objects.all(), query).order_by('-search_rank', '-start_datetime', '-event_id')
+    ids = await alist(matches.values_list('event_id', flat=True)[offset:offset + SEARCH_PAGE_SIZE + 1])
+    has_next = len(ids) > SEARCH_PAGE_SIZE
+    ids = ids[:SEARCH_PAGE_SIZE]
+    rows, marks = await gather_queries(
+        lambda: EventDetailsView.objects.in_bulk(ids),
+        lambda: search_highlights(Event.objects.all(), ids, query),
+    )
+    events = []
+    for event_id in ids:
+        if event_id in rows:
+            event = rows[event_id]
+            event.title_highlight, event.snippet_highlight = marks.get(event_id, (None, None))
+            events.append(event)
+    return KeysetPage(
+        events, SEARCH_PAGE_SIZE,
+        next_cursor=str(offset + SEARCH_PAGE_SIZE) if has_next else None,
+        prev_cursor=str(max(0, offset - SEARCH_PAGE_SIZE)) if offset else None,
+        base_query=request.GET.copy(),
+    )
+
+def _form_datetime(value):
+    """datetime-local input -> aware datetime (None when blank); raises ValueError."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f'Invalid date/time: {value}')
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
 
 def event_create(request):
     if request.method == 'POST':
-        event = Event.objects.create(
-            title=request.POST['title'],
-            description=request.POST.get('description', ''),
-            category_id=request.POST.get('category') or None,
-            organizer_id=request.POST.get('organizer') or None,
-            venue_id=request.POST.get('venue') or None,
-            start_datetime=request.POST.get('start_datetime') or None,
-            end_datetime=request.POST.get('end_datetime') or None,
-            capacity=request.POST.get('capacity') or None,
-            status=request.POST.get('status', 'scheduled'),
-            created_at=datetime.now()
-        )
-        messages.success(request, 'Event created successfully!')
-        return redirect('event_list')
+        status = request.POST.get('status')
+        if status not in Event.Status.values:
+            status = Event.Status.SCHEDULED
+        venue_id = request.POST.get('venue') or None
+        try:
+            start = _form_datetime(request.POST.get('start_datetime'))
+            end = _form_datetime(request.POST.get('end_datetime'))
+            capacity = int(request.POST['capacity']) if request.POST.get('capacity') else None
+            # Venue must be free for the whole window and large enough
+            book_venue(lambda: Event.objects.create(
+                title=request.POST['title'],
+                description=request.POST.get('description', ''),
+                category_id=request.POST.get('category') or None,
+                organizer_id=request.POST.get('organizer') or None,
+                venue_id=venue_id,
+                start_datetime=start,
+                end_datetime=end,
+                capacity=capacity,
+                status=status,
+                created_at=datetime.now()
+            ), venue_id, start, end, capacity, status)
+        except (ValueError, BookingError) as e:
+            messages.error(request, f'Event not created: {e}')
+        else:
+            messages.success(request, 'Event created successfully!')
+            return redirect('event_list')
     
     categories = Category.objects.all()
-    users = User.objects.all()
     venues = Venue.objects.all()
     return render(request, 'events/form.html', {
         'categories': categories,
-        'users': users,
         'venues': venues
     })
 
+@writes
 def event_delete(request, pk):
     event = get_object_or_404(Event, event_id=pk)
     event.delete()
     messages.success(request, 'Event deleted successfully!')
     return redirect('event_list')
 
-def event_summary(request):
+@conditional_page(Event)
+@cache_page(Event)
+async def event_summary(request):
     """View event registration summary"""
-    summaries = EventRegistrationSummaryView.objects.all()
-    return render(request, 'events/summary.html', {'summaries': summaries})
+    events = Event.objects.only('event_id', 'title', 'capacity', 'registration_count')
+    page = await akeyset_paginate(request, events, ('event_id',))
+    return await sync_to_async(render)(request, 'events/summary.html', {'summaries': page.object_list, 'page': page})
 
 # Registration Views - Using Stored Procedure
-def registration_list(request):
-    # Use the view for better display
-    registrations = UserRegistrationsView.objects.all()
-    return render(request, 'registrations/list.html', {'registrations': registrations})
+@conditional_page(Registration, User, Event)
+async def registration_list(request):
+    # Use the view for better display, most recent registrations first
+    page = await akeyset_paginate(request, UserRegistrationsView.objects.all(), ('-registered_at', '-reg_id'))
+    return await sync_to_async(render)(
+        request, 'registrations/list.html', {'registrations': page.object_list, 'page': page}
+    )
 
 def registration_create(request):
     if request.method == 'POST':
@@ -215,13 +367,75 @@ def registration_create(request):
         else:
             messages.error(request, f"Registration failed: {result['message']}")
     
-    events = Event.objects.all()
-    users = User.objects.all()
-    return render(request, 'registrations/form.html', {
-        'events': events,
-        'users': users
+    # Event and user pickers load from the autocomplete endpoints
+    return render(request, 'registrations/form.html')
+
+def _parse_bulk_payload(data):
+    """Normalise a bulk registration request (JSON body or form) into kwargs."""
+    if not isinstance(data, dict):
+        raise ValueError('Expected a JSON object')
+    def listed(label):
+        # A bare string would otherwise be split into characters.
+        values = data.get(label) or []
+        if not isinstance(values, list):
+            raise ValueError(f'{label} must be a list')
+        return values
+
+    def ints(values, label):
+        try:
+            return [int(v) for v in values]
+        except (TypeError, ValueError):
+            raise ValueError(f'{label} must be integers')
+
+    try:
+        event_id = int(data.get('event'))
+    except (TypeError, ValueError):
+        raise ValueError('A valid event is required')
+    dept = data.get('dept') or None
+    kwargs = {
+        'user_ids': ints(listed('user_ids'), 'user_ids'),
+        'roll_nos': [str(r).strip() for r in listed('roll_nos') if str(r).strip()],
+        'dept_id': ints([dept], 'dept')[0] if dept is not None else None,
+    }
+    if not (kwargs['user_ids'] or kwargs['roll_nos'] or kwargs['dept_id'] is not None):
+        raise ValueError('Provide user_ids, roll_nos or a department')
+    return event_id, kwargs
+
+def registration_bulk_create(request):
+    """Enroll many users (ids, roll numbers or a department) into one event"""
+    if request.method == 'POST' and request.content_type == 'application/json':
+        try:
+            event_id, kwargs = _parse_bulk_payload(json.loads(request.body))
+            return JsonResponse(bulk_register(event_id, **kwargs))
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except Event.DoesNotExist:
+            return JsonResponse({'error': 'Event not found'}, status=404)
+
+    result = None
+    if request.method == 'POST':
+        identifiers = [i for i in re.split(r'[\s,;]+', request.POST.get('identifiers', '')) if i]
+        field = 'user_ids' if request.POST.get('id_type') == 'user_id' else 'roll_nos'
+        try:
+            event_id, kwargs = _parse_bulk_payload({
+                'event': request.POST.get('event'),
+                field: identifiers,
+                'dept': request.POST.get('dept') or None,
+            })
+            result = bulk_register(event_id, **kwargs)
+            messages.success(request, f"{result['registered']} user(s) registered.")
+        except ValueError as e:
+            messages.error(request, f"Bulk registration failed: {e}")
+        except Event.DoesNotExist:
+            messages.error(request, 'Bulk registration failed: event not found')
+
+    departments = Department.objects.all()
+    return render(request, 'registrations/bulk.html', {
+        'departments': departments,
+        'result': result,
     })
 
+@writes
 def registration_delete(request, pk):
     registration = get_object_or_404(Registration, reg_id=pk)
     registration.delete()
@@ -229,9 +443,11 @@ def registration_delete(request, pk):
     return redirect('registration_list')
 
 # Attendance Views - Using Stored Procedure
+@conditional_page(Attendance, Event, User)
 def attendance_list(request):
     attendances = Attendance.objects.all().select_related('event', 'user')
-    return render(request, 'attendance/list.html', {'attendances': attendances})
+    page = keyset_paginate(request, attendances, ('-attendance_id',))
+    return render(request, 'attendance/list.html', {'attendances': page.object_list, 'page': page})
 
 def attendance_create(request):
     if request.method == 'POST':
@@ -248,13 +464,10 @@ def attendance_create(request):
         else:
             messages.error(request, f"Attendance marking failed: {result['message']}")
     
-    events = Event.objects.all()
-    users = User.objects.all()
-    return render(request, 'attendance/form.html', {
-        'events': events,
-        'users': users
-    })
+    # Event and user pickers load from the autocomplete endpoints
+    return render(request, 'attendance/form.html')
 
+@writes
 def attendance_delete(request, pk):
     attendance = get_object_or_404(Attendance, attendance_id=pk)
     attendance.delete()
@@ -266,21 +479,185 @@ def attendance_by_event(request, event_id):
     event = get_object_or_404(Event, event_id=event_id)
     attendances = Attendance.objects.filter(event=event).select_related('user')
     
-    present_count = attendances.filter(present=True).count()
-    absent_count = attendances.filter(present=False).count()
+    counts = attendance_counts(event.event_id)
+    present_count, absent_count = counts['present_count'], counts['absent_count']
+    page = keyset_paginate(request, attendances, ('attendance_id',))
     
     context = {
         'event': event,
-        'attendances': attendances,
+        'attendances': page.object_list,
+        'page': page,
         'present_count': present_count,
         'absent_count': absent_count,
+        'total_count': present_count + absent_count,
     }
     return render(request, 'attendance/by_event.html', context)
 
+def _parse_roster_changes(data):
+    """Turn ``{user_id: present}`` (bools or 'present'/'absent') into ints -> bools."""
+    changes = {}
+    for user_id, state in data.items():
+        if state in (True, 'present', 'true', '1', 1):
+            present = True
+        elif state in (False, 'absent', 'false', '0', 0):
+            present = False
+        else:
+            continue  # left unmarked
+        changes[int(user_id)] = present
+    return changes
+
+def attendance_roster(request, event_id):
+    """Mark attendance for every registrant of an event in one submit"""
+    event = get_object_or_404(Event, event_id=event_id)
+
+    if request.method == 'POST' and request.content_type == 'application/json':
+        try:
+            payload = json.loads(request.body)
+            changes = _parse_roster_changes(payload.get('changes') or {})
+        except (ValueError, TypeError, AttributeError):
+            return JsonResponse({'error': 'Expected {"changes": {"<user_id>": true|false}}'}, status=400)
+        written = mark_attendance(event.event_id, changes)
+        return JsonResponse({'event_id': event.event_id, 'updated': written, **attendance_counts(event.event_id)})
+
+    if request.method == 'POST':
+        prefix = 'status_'
+        changes = _parse_roster_changes({
+            key[len(prefix):]: value for key, value in request.POST.items()
+            if key.startswith(prefix) and key[len(prefix):].isdigit()
+        })
+        written = mark_attendance(event.event_id, changes)
+        messages.success(request, f'Attendance saved for {written} participant(s).')
+        return redirect(request.get_full_path())
+
+    counts = attendance_counts(event.event_id)
+    page = keyset_paginate(request, roster_queryset(event.event_id), ('reg_id',))
+    return render(request, 'attendance/roster.html', {
+        'event': event,
+        'roster': page.object_list,
+        'page': page,
+        'unmarked_count': max(event.registration_count - counts['present_count'] - counts['absent_count'], 0),
+        **counts,
+    })
+
+# Kiosk Sync Views - JSON endpoints for offline check-in devices
+@require_GET
+@ensure_csrf_cookie
+def kiosk_roster(request, event_id):
+    """Full roster snapshot, or only the changes after ?since=<version>; also sets the CSRF cookie"""
+    event = get_object_or_404(Event.objects.only('event_id'), event_id=event_id)
+    since = request.GET.get('since')
+    if since is None:
+        return JsonResponse(roster_snapshot(event.event_id))
+    try:
+        since = int(since)
+    except ValueError:
+        return JsonResponse({'error': 'since must be an integer version'}, status=400)
+    return JsonResponse(roster_delta(event.event_id, since))
+
+@require_POST
+def kiosk_checkins(request, event_id):
+    """
+    Upload a batch of offline check-ins: {"checkins": [{"user_id", "checked_at", "present"}]}.
+    Like every form, it needs the csrftoken cookie (from the roster) echoed in X-CSRFToken.
+    """
+    event = get_object_or_404(Event.objects.only('event_id'), event_id=event_id)
+    try:
+        checkins = json.loads(request.body)['checkins']
+        if not isinstance(checkins, list):
+            raise TypeError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Expected {"checkins": [...]}'}, status=400)
+    try:
+        return JsonResponse(apply_checkins(event.event_id, checkins))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+# Autocomplete Views - bounded typeahead lookups for the create forms
+@require_GET
+def autocomplete_users(request):
+    try:
+        limit = parse_autocomplete_limit(request.GET.get('limit'))
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number'}, status=400)
+    return JsonResponse({'results': suggest_users(request.GET.get('q', ''), limit)})
+
+@require_GET
+def autocomplete_events(request):
+    try:
+        limit = parse_autocomplete_limit(request.GET.get('limit'))
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number'}, status=400)
+    return JsonResponse({'results': suggest_events(request.GET.get('q', ''), limit)})
+
+# Export Views - streamed so memory stays flat for any export size
+@require_GET
+def data_export(request, kind):
+    """Stream registrations/attendance as CSV or NDJSON (?format=, event, from, to, dept)"""
+    if kind not in EXPORTS:
+        raise Http404('Unknown export')
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in FORMATS:
+        return JsonResponse({'error': f"format must be one of: {', '.join(FORMATS)}"}, status=400)
+    model, columns, date_field = EXPORTS[kind]
+    try:
+        queryset = export_queryset(
+            model, columns, date_field,
+            event_id=request.GET.get('event'),
+            date_from=request.GET.get('from'),
+            date_to=request.GET.get('to'),
+            dept_id=request.GET.get('dept'),
+        )
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    writer, content_type = FORMATS[fmt]
+    content = writer(columns, iterate_rows(queryset))
+    if isinstance(request, ASGIRequest):
+        # Under ASGI a sync iterator would be read into memory before sending.
+        content = aiterate(content, EXPORT_CHUNK_SIZE)
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
+# Import Views
+def data_import(request):
+    """Upload a CSV of users, events or registrations for bulk import"""
+    report = None
+    if request.method == 'POST':
+        upload = request.FILES.get('file')
+        if upload is None:
+            messages.error(request, 'Please choose a CSV file.')
+        else:
+            stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+            try:
+                report = import_csv(request.POST.get('kind'), stream, dry_run=request.POST.get('dry_run') == 'on')
+            except (ValueError, UnicodeDecodeError, csv.Error) as e:
+                messages.error(request, f'Import failed: {e}')
+            else:
+                prefix = 'Dry run: ' if report.dry_run else ''
+                messages.success(request, f'{prefix}{report.created} created, {len(report.errors)} rejected.')
+    return render(request, 'imports/form.html', {
+        'kinds': list(IMPORTERS),
+        'report': report,
+        'errors': report.errors[:500] if report else [],
+    })
+
+# Metrics View - Prometheus scrape endpoint
+@require_GET
+def metrics(request):
+    """Prometheus text exposition, aggregated across gunicorn workers"""
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse('Unauthorized', status=401)
+    body, content_type = prometheus_metrics.render()
+    return HttpResponse(body, content_type=content_type)
+
 # Resource Views
+@conditional_page(Resource)
+@cache_page(Resource)
 def resource_list(request):
-    resources = Resource.objects.all()
-    return render(request, 'resources/list.html', {'resources': resources})
+    page = keyset_paginate(request, Resource.objects.all(), ('resource_id',))
+    return render(request, 'resources/list.html', {'resources': page.object_list, 'page': page})
 
 def resource_create(request):
     if request.method == 'POST':
@@ -292,6 +669,7 @@ def resource_create(request):
         return redirect('resource_list')
     return render(request, 'resources/form.html')
 
+@writes
 def resource_delete(request, pk):
     resource = get_object_or_404(Resource, resource_id=pk)
     resource.delete()
@@ -299,29 +677,250 @@ def resource_delete(request, pk):
     return redirect('resource_list')
 
 # Event Resource Views
+@conditional_page(EventResource, Event, Resource)
 def event_resource_list(request):
     event_resources = EventResource.objects.all().select_related('event', 'resource')
-    return render(request, 'event_resources/list.html', {'event_resources': event_resources})
+    page = keyset_paginate(request, event_resources, ('er_id',))
+    return render(request, 'event_resources/list.html', {'event_resources': page.object_list, 'page': page})
 
 def event_resource_create(request):
     if request.method == 'POST':
-        event_resource = EventResource.objects.create(
-            event_id=request.POST['event'],
-            resource_id=request.POST['resource'],
-            quantity_required=request.POST['quantity_required']
-        )
-        messages.success(request, 'Event Resource allocated successfully!')
-        return redirect('event_resource_list')
+        # Checked against other events' allocations in the same time window
+        try:
+            allocate(request.POST.get('event'), request.POST.get('resource'), request.POST.get('quantity_required'))
+        except AllocationError as e:
+            messages.error(request, f'Allocation failed: {e}')
+        else:
+            messages.success(request, 'Event Resource allocated successfully!')
+            return redirect('event_resource_list')
     
-    events = Event.objects.all()
     resources = Resource.objects.all()
     return render(request, 'event_resources/form.html', {
-        'events': events,
         'resources': resources
     })
 
+@writes
 def event_resource_delete(request, pk):
     event_resource = get_object_or_404(EventResource, er_id=pk)
     event_resource.delete()
     messages.success(request, 'Event Resource deleted successfully!')
-    return redirect('event_resource_list')
\ No newline at end of file
+    return redirect('event_resource_list')
+
+
+# ============================================================
+# REST API ViewSets (mounted under /api/ by api_urls.py)
+# ============================================================
+
+class OptimizedModelViewSet(viewsets.ModelViewSet):
+    """
+    ModelViewSet whose read queryset is derived from the serializer fields
+    actually being rendered (after ``?fields=``): dotted sources such as
+    ``event.title`` become ``select_related('event')``, and only the columns
+    those fields need are loaded, so a list page is a single query.
+
+    list and retrieve carry an ETag / Last-Modified derived from the page
+    cache generations of every model rendered, and answer a matching
+    conditional request with 304 before querying.
+    """
+
+    def _rendered_models(self):
+        model = self.queryset.model
+        models = {model}
+        for field in self.get_serializer().fields.values():
+            current = model
+            for part in field.source.split('.')[:-1]:
+                try:
+                    current = current._meta.get_field(part).related_model
+                except FieldDoesNotExist:
+                    break
+                if current is None:
+                    break
+                models.add(current)
+        return sorted(models, key=lambda m: m._meta.label)
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        response, etag, last_modified = not_modified(request, self._rendered_models())
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_validators(response, etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method != 'GET':
+            return queryset
+        model = queryset.model
+        related, columns = set(), {model._meta.pk.name}
+        for field in self.get_serializer().fields.values():
+            if field.write_only or field.source == '*':
+                continue
+            parts = field.source.split('.')
+            try:
+                model._meta.get_field(parts[0])
+            except FieldDoesNotExist:
+                continue
+            columns.add(parts[0])
+            if len(parts) > 1:
+                related.add('__'.join(parts[:-1]))
+                columns.add('__'.join(parts))
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
+
+
+class RoleViewSet(OptimizedModelViewSet):
+    queryset = Role.objects.all()
+    serializer_class = RoleSerializer
+
+
+class DepartmentViewSet(OptimizedModelViewSet):
+    queryset = Department.objects.all()
+    serializer_class = DepartmentSerializer
+
+
+class UserViewSet(OptimizedModelViewSet):
+    queryset = User.objects.all()
+    serializer_class = UserSerializer
+
+
+class VenueViewSet(OptimizedModelViewSet):
+    queryset = Venue.objects.all()
+    serializer_class = VenueSerializer
+
+    @action(detail=False, methods=['get'], url_path='free-slots')
+    def free_slots(self, request):
+        """Open windows over ?start=&end=, optionally ?venue=, ?min_seats=, ?min_minutes="""
+        try:
+            start, end, kwargs = _parse_free_slot_query(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'start': start, 'end': end, 'venues': free_slots(start, end, **kwargs)})
+
+
+class CategoryViewSet(OptimizedModelViewSet):
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+
+
+class EventViewSet(OptimizedModelViewSet):
+    queryset = Event.objects.all()
+    serializer_class = EventSerializer
+
+    def _book(self, serializer):
+        # Venue conflict / capacity check, falling back to stored values on PATCH.
+        data, instance = serializer.validated_data, serializer.instance
+
+        def value(name):
+            return data[name] if name in data else getattr(instance, name, None)
+
+        venue = value('venue')
+        try:
+            book_venue(
+                serializer.save, venue.venue_id if venue else None,
+                value('start_datetime'), value('end_datetime'), value('capacity'), value('status'),
+                exclude_event_id=instance.event_id if instance else None,
+            )
+        except BookingError as e:
+            raise ValidationError({'non_field_errors': [str(e)]})
+
+    def perform_create(self, serializer):
+        self._book(serializer)
+
+    def perform_update(self, serializer):
+        self._book(serializer)
+
+    @action(detail=False, methods=['post'])
+    def schedule(self, request):
+        """Auto-assign venues and start times to unvenued events (see stud/scheduler.py)"""
+        try:
+            kwargs = parse_schedule_options(request.data)
+        except (ValueError, TypeError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(schedule_events(**kwargs))
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Ranked full-text search: ?q=...&limit=20 (see stud/search.py)"""
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = self.get_queryset()
+        matches = list(search_events(queryset, query).order_by('-search_rank', '-start_datetime', '-event_id')[:limit])
+        marks = search_highlights(queryset, [e.event_id for e in matches], query)
+        results = []
+        for event, row in zip(matches, self.get_serializer(matches, many=True).data):
+            title, snippet = marks.get(event.event_id, ('', ''))
+            results.append(dict(row, search_rank=event.search_rank, title_highlight=title, snippet_highlight=snippet))
+        return Response({'query': query, 'results': results})
+
+
+class RegistrationViewSet(OptimizedModelViewSet):
+    queryset = Registration.objects.all()
+    serializer_class = RegistrationSerializer
+
+    def perform_create(self, serializer):
+        # Go through the seat reservation engine so the API cannot overbook.
+        try:
+            serializer.instance = register_user(
+                serializer.validated_data['event'].event_id,
+                serializer.validated_data['user'].user_id,
+            )
+        except RegistrationError as e:
+            raise ValidationError({'non_field_errors': [str(e)]})
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Enroll many users at once; same payload as /registrations/bulk/."""
+        try:
+            event_id, kwargs = _parse_bulk_payload(request.data)
+            return Response(bulk_register(event_id, **kwargs))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Event.DoesNotExist:
+            return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class AttendanceViewSet(OptimizedModelViewSet):
+    queryset = Attendance.objects.all()
+    serializer_class = AttendanceSerializer
+
+
+class ResourceViewSet(OptimizedModelViewSet):
+    queryset = Resource.objects.all()
+    serializer_class = ResourceSerializer
+
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """Free units per resource over ?start=&end= (ISO datetimes), optionally ?resource=1,2"""
+        try:
+            start, end = parse_window(request.query_params.get('start'), request.query_params.get('end'))
+            ids = request.query_params.get('resource')
+            ids = [int(i) for i in ids.split(',')] if ids else None
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'start': start, 'end': end, 'resources': availability(start, end, ids)})
+
+
+class EventResourceViewSet(OptimizedModelViewSet):
+    queryset = EventResource.objects.all()
+    serializer_class = EventResourceSerializer
+
+    def perform_create(self, serializer):
+        # Same overlap check as the HTML form, so the API cannot double-allocate.
+        data = serializer.validated_data
+        try:
+            serializer.instance = allocate(
+                data['event'].event_id, data['resource'].resource_id, data['quantity_required'],
+            )
+        except AllocationError as e:
+            raise ValidationError({'non_field_errors': [str(e)]})